@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latency and wakeups of the DB watcher's polling fallback
+
+Runs DBChangeWatcher in polling mode (no filesystem events) and checks its
+AdaptivePoller against bounds:
+
+- burst: writes 100 ms apart are picked up within a couple of fast intervals
+- idle: wakeups over the idle period stay within the backoff schedule
+  (compared with the old fixed 0.5 s poll)
+- first write after idling: picked up within the idle ceiling
+- hidden: fewer wakeups again, up to the hidden ceiling
+
+Usage:
+    python benchmarks/bench_adaptive_poller.py [idle_seconds]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Point the db module at a scratch directory before importing it
+os.environ['NOTI_APP_DB_DIR'] = tempfile.mkdtemp(prefix="noti_bench_")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import db
+from src.adaptive_poller import AdaptivePoller
+from src.db_watcher import DBChangeWatcher
+
+BURST_WRITES = 20
+BURST_SPACING = 0.1
+FIXED_INTERVAL = 0.5  # The poll interval before the adaptive poller
+
+
+def expected_polls(poller, seconds, ceiling):
+    """Polls the backoff schedule makes in `seconds` of idling from the fast cadence"""
+    interval, elapsed, polls = poller.min_interval, 0.0, 0
+    while elapsed < seconds:
+        interval = min(interval * poller.backoff, ceiling)
+        elapsed += interval
+        polls += 1
+    return polls
+
+
+def main():
+    idle = float(sys.argv[1]) if len(sys.argv) > 1 else 20
+    changed = threading.Event()
+    seen_at = []
+
+    def on_change(version):
+        seen_at.append(time.perf_counter())
+        changed.set()
+
+    poller = AdaptivePoller()
+    watcher = DBChangeWatcher(on_change, use_events=False, poller=poller)
+    watcher.start()
+    changed.wait(5)
+
+    def write(i):
+        changed.clear()
+        db.update_window_status("bench", f"step {i}")
+        committed = time.perf_counter()
+        changed.wait(poller.hidden_max_interval + 1)
+        return seen_at[-1] - committed
+
+    results = []
+
+    # Burst
+    latencies = []
+    for i in range(BURST_WRITES):
+        latencies.append(write(i))
+        time.sleep(BURST_SPACING)
+    bound = poller.min_interval * poller.backoff ** 3
+    results.append(("burst latency max", max(latencies), bound,
+                    f"median {statistics.median(latencies) * 1e3:.0f} ms"))
+
+    # Idle, window shown
+    start_polls = poller.polls
+    time.sleep(idle)
+    polls = poller.polls - start_polls
+    bound = expected_polls(poller, idle, poller.max_interval) + 2
+    results.append(("idle wakeups", polls, bound, f"fixed {FIXED_INTERVAL}s poll: {idle / FIXED_INTERVAL:.0f}"))
+    latency = write("after idle")
+    results.append(("latency after idle", latency, poller.max_interval + 0.05, ""))
+
+    # Idle, window hidden
+    watcher.set_hidden(True)
+    write("hidden")  # Start the backoff from the fast cadence again
+    start_polls = poller.polls
+    time.sleep(idle)
+    polls = poller.polls - start_polls
+    bound = expected_polls(poller, idle, poller.hidden_max_interval) + 2
+    results.append(("hidden idle wakeups", polls, bound, ""))
+    print(f"poller: {poller.diagnostics()}")
+    watcher.stop()
+
+    failed = False
+    for name, value, bound, note in results:
+        ok = value <= bound
+        failed = failed or not ok
+        shown = f"{value * 1e3:.0f} ms (bound {bound * 1e3:.0f} ms)" if isinstance(value, float) else f"{value} (bound {bound})"
+        print(f"  {'PASS' if ok else 'FAIL'}  {name:<20} {shown}" + (f"  [{note}]" if note else ""))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory and CPU per idle subscription in the asyncio listener
+
+Starts a stand-in ntfy server in a subprocess that accepts any number of
+SSE streams and only sends keepalives, then subscribes to N topics on one
+event loop and reports the resident memory, Python heap and CPU time used
+per idle subscription.
+
+Usage:
+    python benchmarks/bench_async_idle.py [max_topics]
+"""
+
+import asyncio
+import contextlib
+import io
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Point the db module at a scratch directory before importing it
+os.environ['NOTI_APP_DB_DIR'] = tempfile.mkdtemp(prefix="noti_bench_")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from async_listener import AsyncListener
+from ntfy_listener import StatusWriter
+
+IDLE_SECONDS = 5
+KEEPALIVE_INTERVAL = 1.0  # Much more often than ntfy's 45 s, to include its cost
+
+
+async def serve(port_file):
+    """Stand-in ntfy: every GET becomes an endless chunked stream of keepalives"""
+    async def handle(reader, writer):
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Transfer-Encoding: chunked\r\n\r\n")
+        try:
+            while True:
+                event = b'event: keepalive\ndata: {"event":"keepalive"}\n\n'
+                writer.write(b"%x\r\n%s\r\n" % (len(event), event))
+                await writer.drain()
+                await asyncio.sleep(KEEPALIVE_INTERVAL)
+        except (ConnectionError, OSError):
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0, backlog=1024)
+    Path(port_file).write_text(str(server.sockets[0].getsockname()[1]))
+    await server.serve_forever()
+
+
+def rss_bytes():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+async def measure(server_url, count):
+    topics = {f"topic-{i}": f"team-{i}" for i in range(count)}
+    listener = AsyncListener(topics, StatusWriter(), server=server_url)
+
+    rss_before = rss_bytes()
+    heap_before = tracemalloc.get_traced_memory()[0]
+    task = asyncio.create_task(listener.run())
+    while sum(s.connects for s in listener.subscriptions) < count:
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(0.5)
+    rss = rss_bytes() - rss_before
+    heap = tracemalloc.get_traced_memory()[0] - heap_before
+
+    cpu_start = time.process_time()
+    await asyncio.sleep(IDLE_SECONDS)
+    cpu = time.process_time() - cpu_start
+
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    return rss, heap, cpu
+
+
+async def run(server_url, sizes):
+    print(f"{'topics':>7} {'RSS KiB/sub':>12} {'heap KiB/sub':>13} {'CPU ms/sub/min':>15}")
+    for count in sizes:
+        with contextlib.redirect_stdout(io.StringIO()):  # Silence per-stream connect logging
+            rss, heap, cpu = await measure(server_url, count)
+        print(f"{count:>7} {rss / count / 1024:>12.1f} {heap / count / 1024:>13.1f} "
+              f"{cpu / count / IDLE_SECONDS * 60 * 1e3:>15.2f}")
+
+
+def main():
+    if sys.argv[1:2] == ["--serve"]:
+        asyncio.run(serve(sys.argv[2]))
+        return
+
+    max_topics = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    sizes = [n for n in (10, 100, 500, 1000) if n <= max_topics]
+    port_file = Path(tempfile.mkdtemp(prefix="noti_bench_")) / "port"
+    server = subprocess.Popen([sys.executable, __file__, "--serve", str(port_file)])
+    try:
+        while not port_file.exists() or not port_file.read_text():
+            time.sleep(0.05)
+        tracemalloc.start()
+        asyncio.run(run(f"http://127.0.0.1:{port_file.read_text()}", sizes))
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark: change detection cost, get_db_hash() vs get_db_version()
+
+Usage:
+    python benchmarks/bench_change_detection.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Point the db module at a scratch directory before importing it
+os.environ['NOTI_APP_DB_DIR'] = tempfile.mkdtemp(prefix="noti_bench_")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import db
+
+ROW_COUNTS = [10, 1_000, 100_000]
+
+
+def fill(rows):
+    """Reset the windows table to `rows` synthetic entries"""
+    with db.db_transaction() as conn:
+        conn.execute('DELETE FROM windows')
+        conn.executemany(
+            'INSERT INTO windows (window_name, status, timestamp) VALUES (?, ?, ?)',
+            ((f"agent-{i}", "ongoing", f"2024-01-01T00:00:{i % 60:02d}") for i in range(rows))
+        )
+
+
+def time_call(fn, min_seconds=0.5):
+    """Return mean seconds per call, running for at least min_seconds"""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return elapsed / calls
+
+
+def main():
+    print(f"DB: {db.DB_FILE}")
+    print(f"{'rows':>8} {'get_db_hash':>14} {'get_db_version':>16} {'speedup':>9}")
+    for rows in ROW_COUNTS:
+        fill(rows)
+        hash_s = time_call(db.get_db_hash)
+        version_s = time_call(db.get_db_version)
+        print(f"{rows:>8} {hash_s * 1e3:>11.3f} ms {version_s * 1e3:>13.3f} ms {hash_s / version_s:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latency from a committed write to the DBChangeWatcher callback
+
+Runs once with filesystem events (inotify / Windows change notification)
+and once with the polling fallback.
+
+Usage:
+    python benchmarks/bench_change_latency.py [writes]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Point the db module at a scratch directory before importing it
+os.environ['NOTI_APP_DB_DIR'] = tempfile.mkdtemp(prefix="noti_bench_")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import db
+from src.db_watcher import DBChangeWatcher
+
+
+def measure(use_events, writes):
+    changed = threading.Event()
+    callback_at = []
+
+    def on_change(version):
+        callback_at.append(time.perf_counter())
+        changed.set()
+
+    watcher = DBChangeWatcher(on_change, use_events=use_events)
+    watcher.start()
+
+    # Wait for the initial callback, then let the watcher settle into its idle wait
+    changed.wait(5)
+    latencies = []
+    for i in range(writes):
+        time.sleep(0.2)
+        changed.clear()
+        # Write from a separate connection, as the listener process would
+        conn = db.open_connection()
+        conn.execute(
+            "UPDATE windows SET status = ?, timestamp = ? WHERE window_name = 'bench'",
+            (str(i), str(time.time()))
+        )
+        conn.commit()
+        committed = time.perf_counter()
+        if changed.wait(5):
+            # The callback can fire while commit() is still returning
+            latencies.append(max(0.0, callback_at[-1] - committed))
+        conn.close()
+
+    watcher.stop()
+    return watcher.mode, latencies
+
+
+def main():
+    writes = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    db.update_window_status("bench", "start")
+    for use_events in (True, False):
+        mode, latencies = measure(use_events, writes)
+        ms = sorted(latency * 1e3 for latency in latencies)
+        print(f"{mode:>8}: {len(ms)}/{writes} callbacks, "
+              f"median {statistics.median(ms):.2f} ms, "
+              f"p95 {ms[int(len(ms) * 0.95) - 1]:.2f} ms, max {ms[-1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
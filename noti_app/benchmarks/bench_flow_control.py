@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark: chatty agents with and without flow control
+
+Replays agents that publish progress several times a second (half of the
+messages repeat the previous status) and finish with "done", through the
+StatusWriter alone and through a FlowController in front of it. Reports
+rows written, updates suppressed, and checks every window ends up "done".
+
+Usage:
+    python benchmarks/bench_flow_control.py [agents] [seconds] [rate_per_agent]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Point the db module at a scratch directory before importing it
+os.environ['NOTI_APP_DB_DIR'] = tempfile.mkdtemp(prefix="noti_bench_")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from db import get_all_windows
+from flow_control import FlowController
+from ntfy_listener import StatusWriter
+
+
+def replay(sink, prefix, agents, seconds, rate):
+    """Submit the chatty workload in real time; returns the number of messages"""
+    interval = 1 / rate
+    start = time.monotonic()
+    tick = 0
+    while time.monotonic() - start < seconds:
+        for agent in range(agents):
+            step = tick // 2  # Every status is sent twice in a row
+            sink.submit(f"{prefix}-{agent}", f"ongoing step {step}")
+        tick += 1
+        time.sleep(max(0.0, start + tick * interval - time.monotonic()))
+    for agent in range(agents):
+        sink.submit(f"{prefix}-{agent}", "done")
+    return (tick + 1) * agents
+
+
+def run(agents, seconds, rate, flow_control):
+    prefix = "flow" if flow_control else "plain"
+    writer = StatusWriter()
+    writer.start()
+    sink = FlowController(writer).start() if flow_control else writer
+    with contextlib.redirect_stdout(io.StringIO()):  # Silence per-batch DB logging
+        messages = replay(sink, prefix, agents, seconds, rate)
+        sink.stop(timeout=30)
+    finals = {w["window_name"]: w["status"] for w in get_all_windows()}
+    ok = all(finals.get(f"{prefix}-{agent}") == "done" for agent in range(agents))
+    return messages, sink.get_stats(), ok
+
+
+def main():
+    agents = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rate = float(sys.argv[3]) if len(sys.argv) > 3 else 8
+
+    print(f"{agents} agents x {rate:g} msg/s for {seconds:g}s, then 'done'")
+    for flow_control in (False, True):
+        messages, stats, ok = run(agents, seconds, rate, flow_control)
+        label = "flow control" if flow_control else "writer only"
+        line = f"  {label:<13} messages {messages:5d}, rows written {stats['written']:5d}"
+        if flow_control:
+            line += (f", suppressed {stats['flow_suppressed']} ({stats['flow_collapsed']} identical,"
+                     f" {stats['flow_rate_limited']} rate-limited), deferred {stats['flow_deferred']}")
+        print(line + f", final 'done': {'PASS' if ok else 'FAIL'}")
+
+
+if __name__ == "__main__":
+    main()
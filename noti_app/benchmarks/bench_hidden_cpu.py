@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CPU spent on status changes while the window is hidden in the tray
+
+Feeds the same stream of changes through the render scheduler twice: once
+rendering every change (the behaviour before hidden-mode deferral), once
+deferred as while hidden, with a single render when the window is shown.
+Each render rebuilds a bar per window the way reconcile does (labels and
+rounded-rectangle images). CPU time is scaled to one hour at the given
+change rate. Needs a display (Tk).
+
+Usage:
+    python benchmarks/bench_hidden_cpu.py [changes_per_hour] [windows] [shows_per_hour]
+    (On a headless machine, prefix the command with xvfb-run -a)
+"""
+
+import sys
+import time
+import tkinter as tk
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.render_scheduler import RenderScheduler
+from src.ui_utils import get_rounded_rectangle_photo
+
+SAMPLE_CHANGES = 200  # Changes actually replayed; CPU time is scaled from these
+COLORS = ["#2ECC71", "#F39C12", "#95A5A6"]
+
+
+def make_render(root, windows):
+    canvas = tk.Canvas(root, width=300, height=200)
+    canvas.pack()
+    items = [canvas.create_image(0, i * 40, anchor="nw") for i in range(windows)]
+    labels = [tk.Label(canvas, text="") for _ in range(windows)]
+    renders = [0]
+
+    def render(changed_rows):
+        renders[0] += 1
+        for i, (item, label) in enumerate(zip(items, labels)):
+            photo = get_rounded_rectangle_photo(280, 36, 8, COLORS[(i + renders[0]) % len(COLORS)])
+            canvas.itemconfig(item, image=photo)
+            label.configure(text=f"agent-{i}: ongoing {renders[0]}")
+        root.update_idletasks()
+
+    return render, renders
+
+
+def replay(root, windows, deferred):
+    render, renders = make_render(root, windows)
+    scheduler = RenderScheduler(root, render, frame_ms=0)  # Changes arrive seconds apart; never coalesced
+    if deferred:
+        scheduler.defer()
+    start = time.process_time()
+    for i in range(SAMPLE_CHANGES):
+        scheduler.request([{"window_name": f"agent-{i % windows}", "status": f"ongoing {i}"}])
+        root.update()  # Run the scheduled repaint, if any, as the Tk loop would
+    changes_cpu = time.process_time() - start
+
+    start = time.process_time()
+    scheduler.resume()  # The window is shown
+    show_cpu = time.process_time() - start
+    return changes_cpu, show_cpu, renders[0]
+
+
+def main():
+    per_hour = float(sys.argv[1]) if len(sys.argv) > 1 else 720
+    windows = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    shows = float(sys.argv[3]) if len(sys.argv) > 3 else 6
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"Needs a display ({e}); run it under xvfb-run on a headless machine")
+    root.withdraw()
+    scale = per_hour / SAMPLE_CHANGES
+    print(f"{per_hour:g} changes/hour, {windows} windows, shown {shows:g} times/hour")
+    for deferred in (False, True):
+        changes_cpu, show_cpu, renders = replay(root, windows, deferred)
+        per_hour_cpu = changes_cpu * scale + (show_cpu * shows if deferred else 0)
+        label = "deferred while hidden" if deferred else "render every change"
+        print(f"  {label:<22} {renders:4d} renders for {SAMPLE_CHANGES} changes,"
+              f" CPU {per_hour_cpu:7.3f} s/hour")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Soak test: rounded bar images stay bounded across many reloads
+
+Simulates 10k reloads of a 50-bar list, each fetching the normal and
+selected background for every bar, and checks that the number of live Tk
+images and Python heap usage stay flat. Exits non-zero if they grow.
+Needs a display (Tk).
+
+Usage:
+    python benchmarks/bench_image_cache_soak.py [reloads]
+"""
+
+import sys
+import tkinter as tk
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.styles import BG_SECONDARY, BG_SELECTED, CORNER_RADIUS
+from src.ui_utils import get_rounded_rectangle_photo, rounded_photo_cache_size
+
+BARS = 50
+CHECKPOINTS = 10
+GEOMETRIES = 4
+# The second checkpoint must come after every geometry has been rendered once
+MIN_RELOADS = CHECKPOINTS * GEOMETRIES
+
+
+def reload_bars(widths):
+    """One simulated reload: every bar fetches both of its background images"""
+    return [
+        (get_rounded_rectangle_photo(width, 36, CORNER_RADIUS, BG_SECONDARY),
+         get_rounded_rectangle_photo(width, 36, CORNER_RADIUS, BG_SELECTED))
+        for width in widths
+    ]
+
+
+def main():
+    reloads = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    if reloads < MIN_RELOADS:
+        sys.exit(f"Need at least {MIN_RELOADS} reloads to compare checkpoints after warm-up")
+    root = tk.Tk()
+    root.withdraw()
+
+    # A few geometries, as after DPI or window size changes
+    geometries = [[280 + g] * BARS for g in range(GEOMETRIES)]
+
+    tracemalloc.start()
+    samples = []
+    for i in range(reloads):
+        bars = reload_bars(geometries[i % len(geometries)])
+        if i % max(1, reloads // CHECKPOINTS) == 0:
+            current, _ = tracemalloc.get_traced_memory()
+            samples.append((i, len(root.image_names()), rounded_photo_cache_size(), current))
+        del bars
+
+    print(f"{'reload':>8} {'tk images':>10} {'cached':>7} {'heap KiB':>9}")
+    for i, images, cached, heap in samples:
+        print(f"{i:>8} {images:>10} {cached:>7} {heap / 1024:>9.1f}")
+
+    # Everything is allocated by the first sample; later samples must not grow
+    first, last = samples[1], samples[-1]
+    bounded = last[1] <= first[1] and last[3] <= first[3] * 1.1 + 64 * 1024
+    print("PASS: memory bounded" if bounded else "FAIL: memory grew")
+    root.destroy()
+    sys.exit(0 if bounded else 1)
+
+
+if __name__ == "__main__":
+    main()
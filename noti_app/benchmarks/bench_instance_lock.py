@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: detecting and handing off to a running instance
+
+A child process takes the instance lock and answers commands. The parent
+then times what a second launch does: the failed non-blocking acquire,
+reading the holder's record, and a "show" round trip over the control
+port, next to the `pgrep -f` scan the startup code used to run.
+
+Usage:
+    python benchmarks/bench_instance_lock.py [iterations]
+"""
+
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Keep the bench's locks away from a real app's
+os.environ['NOTI_APP_LOCK_DIR'] = tempfile.mkdtemp(prefix="noti_bench_")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from instance_lock import InstanceLock
+
+HOLDER = """
+import sys, threading
+sys.path.insert(0, {src!r})
+from instance_lock import InstanceLock
+lock = InstanceLock("bench")
+assert lock.acquire(lambda command: None)
+print("ready", flush=True)
+threading.Event().wait()
+"""
+
+
+def timed(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    src = str(Path(__file__).resolve().parent.parent / "src")
+    holder = subprocess.Popen([sys.executable, "-c", HOLDER.format(src=src)], stdout=subprocess.PIPE, text=True)
+    try:
+        assert holder.stdout.readline().strip() == "ready"
+        lock = InstanceLock("bench")
+        assert not lock.acquire(), "holder should own the lock"
+        assert lock.holder()["pid"] == holder.pid
+
+        print(f"{iterations} iterations against holder PID {holder.pid}")
+        print(f"  acquire (fails):      {timed(lock.acquire, iterations) * 1e6:8.1f} us")
+        print(f"  read holder record:   {timed(lock.holder, iterations) * 1e6:8.1f} us")
+        print(f"  'show' round trip:    {timed(lambda: lock.send('show'), iterations) * 1e6:8.1f} us")
+        if shutil.which("pgrep"):
+            scan = timed(lambda: subprocess.run(["pgrep", "-f", "notification_app.py"], capture_output=True),
+                         max(iterations // 10, 1))
+            print(f"  pgrep -f scan (old):  {scan * 1e6:8.1f} us")
+
+        # The lock goes with the process, however it exits
+        holder.kill()
+        holder.wait()
+        start = time.perf_counter()
+        taken = lock.acquire()
+        print(f"  acquire after kill:   {(time.perf_counter() - start) * 1e6:8.1f} us ({'ok' if taken else 'FAILED'})")
+        lock.release()
+    finally:
+        holder.kill()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold start and memory of the subprocess vs in-process listener
+
+Starts the listener against a stand-in ntfy server both ways:
+
+- subprocess: a fresh interpreter running ntfy_listener.run_listener(), as
+  start_listener_subprocess() launches it. Cold start is Popen → first
+  request at the server; memory is the whole child's RSS.
+- in-process: ListenerThread inside a process that already has the UI's
+  own modules loaded. Cold start is start() → first request; memory is
+  the RSS the process gained.
+
+Usage:
+    python benchmarks/bench_listener_modes.py [runs]
+"""
+
+import json
+import os
+import queue
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+SETTLE = 1.0  # Seconds after connecting before RSS is read
+
+
+def rss_kb(pid="self"):
+    """Resident set size from /proc (Linux only)"""
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+class StandInServer:
+    """Answers /sse with one keepalive, then holds the stream open"""
+
+    def __init__(self):
+        self.connects = queue.Queue()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.connects.put(time.time())
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                try:
+                    while True:
+                        self.wfile.write(b'data: {"event":"keepalive"}\n\n')
+                        self.wfile.flush()
+                        time.sleep(1)
+                except OSError:
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/bench"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+
+def child(mode, url, report):
+    """Runs in the measured process"""
+    sys.path.insert(0, str(APP_DIR / "src"))
+    if mode == "subprocess":
+        import ntfy_listener
+        ntfy_listener.run_listener(topic_url=url)
+        return
+
+    # Load what the UI process has loaded anyway, so only the listener's
+    # own cost shows up in the RSS delta
+    sys.path.insert(0, str(APP_DIR))
+    import src.db, src.db_watcher, src.push_channel  # noqa: F401
+    for optional in ("tkinter", "PIL.Image"):
+        try:
+            __import__(optional)
+        except ImportError:
+            pass
+    from src.listener_thread import ListenerThread
+
+    baseline = rss_kb()
+    started = time.time()
+    ListenerThread(topic_url=url).start()
+    Path(report).write_text(json.dumps({"started": started, "baseline_kb": baseline}))
+    threading.Event().wait()
+
+
+def measure(mode, server, env):
+    report = tempfile.mktemp(prefix="noti_bench_report_")
+    spawned = time.time()
+    process = subprocess.Popen(
+        [sys.executable, __file__, "--child", mode, server.url, report],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        connected = server.connects.get(timeout=30)
+        time.sleep(SETTLE)
+        total = rss_kb(process.pid)
+    finally:
+        process.kill()
+        process.wait()
+
+    if mode == "subprocess":
+        return connected - spawned, total
+    info = json.loads(Path(report).read_text())
+    os.unlink(report)
+    return connected - info["started"], total - info["baseline_kb"]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    server = StandInServer()
+    scratch = tempfile.mkdtemp(prefix="noti_bench_")
+    env = dict(
+        os.environ,
+        NOTI_APP_DB_DIR=scratch,
+        NOTI_APP_LOCK_DIR=scratch,
+        NOTI_APP_INGEST_PORT="0",
+        NOTI_APP_INGEST_SOCKET=str(Path(scratch) / "ingest.sock"),
+    )
+
+    print(f"{runs} cold starts per mode")
+    for mode in ("subprocess", "in-process"):
+        results = [measure("subprocess" if mode == "subprocess" else "thread", server, env)
+                   for _ in range(runs)]
+        starts = [start for start, _ in results]
+        memory = [kb for _, kb in results]
+        print(f"  {mode:<11} cold start median {statistics.median(starts) * 1e3:7.1f} ms"
+              f" (min {min(starts) * 1e3:.1f}), listener RSS median {statistics.median(memory) / 1024:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        child(*sys.argv[2:5])
+    else:
+        main()
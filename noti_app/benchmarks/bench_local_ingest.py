@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ingest-to-DB latency through the local ingestion endpoint
+
+Sends statuses one at a time over the loopback HTTP endpoint and the Unix
+socket, and times each from the send until the row is readable from a
+separate SQLite connection (as the UI would read it).
+
+Usage:
+    python benchmarks/bench_local_ingest.py [messages]
+"""
+
+import contextlib
+import http.client
+import io
+import os
+import socket
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Point the db module at a scratch directory before importing it
+os.environ['NOTI_APP_DB_DIR'] = tempfile.mkdtemp(prefix="noti_bench_")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from db import DB_FILE
+from local_ingest import LocalIngestServer
+from ntfy_listener import StatusWriter
+
+
+def wait_for_status(conn, window_name, status, timeout=5):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        row = conn.execute("SELECT status FROM windows WHERE window_name = ?", (window_name,)).fetchone()
+        if row and row[0] == status:
+            return True
+        time.sleep(0.0002)
+    return False
+
+
+def measure(send, conn, messages):
+    latencies = []
+    for i in range(messages):
+        status = f"step {i}"
+        start = time.perf_counter()
+        send(f"agent-bench - {status}".encode())
+        if wait_for_status(conn, "agent-bench", status):
+            latencies.append(time.perf_counter() - start)
+        time.sleep(0.01)  # One agent update at a time, as in practice
+    return latencies
+
+
+def main():
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    socket_path = os.path.join(os.environ['NOTI_APP_DB_DIR'], "ingest.sock")
+
+    with contextlib.redirect_stdout(io.StringIO()):  # Silence per-batch DB logging
+        writer = StatusWriter()
+        writer.start()
+        server = LocalIngestServer(writer, port=18767, socket_path=socket_path,
+                                   token_file=os.path.join(os.environ['NOTI_APP_DB_DIR'], "ingest.token")).start()
+        writer.submit("agent-bench", "start")
+        time.sleep(0.2)
+
+        conn = sqlite3.connect(str(DB_FILE))
+
+        http_conn = http.client.HTTPConnection("127.0.0.1", server.port)
+
+        def send_http(body):
+            http_conn.request("POST", "/", body=body, headers={
+                "X-Noti-Token": server.token, "Content-Type": "application/json"})
+            http_conn.getresponse().read()
+
+        unix = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        unix.connect(socket_path)
+        replies = unix.makefile("rb")
+
+        def send_unix(body):
+            unix.sendall(body + b"\n")
+            replies.readline()
+
+        results = [("http", measure(send_http, conn, messages)),
+                   ("unix", measure(send_unix, conn, messages))]
+        server.stop()
+        writer.stop()
+
+    for name, latencies in results:
+        ms = sorted(latency * 1e3 for latency in latencies)
+        print(f"{name:>5}: {len(ms)}/{messages} visible in DB, median {statistics.median(ms):.2f} ms, "
+              f"p95 {ms[int(len(ms) * 0.95) - 1]:.2f} ms, max {ms[-1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark: SSE byte to UI callback, push channel vs database watcher
+
+A stand-in ntfy server sends one status at a time to the threaded listener,
+whose writer pushes each committed batch over the push channel. The "UI"
+is a main-loop thread running after()-style callbacks; it is told about
+each change both by the push channel and by a DBChangeWatcher reading
+version deltas, and the time from the SSE bytes leaving the server to each
+callback running is recorded.
+
+Usage:
+    python benchmarks/bench_push_latency.py [messages]
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import os
+import queue
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Point the db module at a scratch directory before importing it
+os.environ['NOTI_APP_DB_DIR'] = tempfile.mkdtemp(prefix="noti_bench_")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+# The UI side imports the package, the listener side the scripts, as in the app
+from src import db
+from src.db_watcher import DBChangeWatcher
+from ntfy_listener import StatusWriter, listen_for_notifications
+from push_channel import PushClient, PushServer
+
+
+class OneAtATimeServer:
+    """Chunked SSE stream; send(text) writes one ntfy message and returns when it is on the wire"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.writers = []
+        ready = threading.Event()
+        threading.Thread(target=self._serve, args=(ready,), daemon=True).start()
+        ready.wait()
+
+    def _serve(self, ready):
+        asyncio.set_event_loop(self.loop)
+        server = self.loop.run_until_complete(asyncio.start_server(self._handle, "127.0.0.1", 0))
+        self.port = server.sockets[0].getsockname()[1]
+        ready.set()
+        self.loop.run_forever()
+
+    async def _handle(self, reader, writer):
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Transfer-Encoding: chunked\r\n\r\n")
+        self.writers.append(writer)
+
+    def send(self, message_id, text):
+        event = b"data: " + json.dumps({"id": message_id, "event": "message", "message": text}).encode() + b"\n\n"
+
+        async def write():
+            for writer in self.writers:
+                writer.write(b"%x\r\n%s\r\n" % (len(event), event))
+                await writer.drain()
+            return time.perf_counter()
+        return asyncio.run_coroutine_threadsafe(write(), self.loop).result()
+
+
+def main():
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    ui_queue = queue.Queue()  # Stands in for Tk's after(0, ...) queue
+    seen = {"push": {}, "db": {}}
+
+    def after(path, windows):
+        def callback():
+            now = time.perf_counter()
+            for window in windows:
+                seen[path].setdefault(window["status"], now)
+        ui_queue.put(callback)
+
+    push_server = PushServer(lambda windows: after("push", windows))
+    cursor = [0]
+
+    def on_db_changed(version):
+        delta = db.get_windows_changed_since(cursor[0])
+        if delta:
+            cursor[0] = delta["cursor"]
+            after("db", delta["windows"])
+
+    sse = OneAtATimeServer()
+    with contextlib.redirect_stdout(io.StringIO()):  # Silence listener and DB logging
+        writer = StatusWriter(on_commit=PushClient(push_server.port, push_server.token).send)
+        writer.start()
+        watcher = DBChangeWatcher(on_db_changed)
+        watcher.start()
+        threading.Thread(target=listen_for_notifications,
+                         kwargs={"writer": writer, "topic_url": f"http://127.0.0.1:{sse.port}/topic",
+                                 "cursor_key": "bench"}, daemon=True).start()
+        while not sse.writers:
+            time.sleep(0.01)
+
+        sent = {}
+        for i in range(messages):
+            status = f"step {i}"
+            sent[status] = sse.send(f"m{i}", f"agent-bench - {status}")
+            deadline = time.perf_counter() + 2
+            while time.perf_counter() < deadline and not (status in seen["push"] and status in seen["db"]):
+                try:
+                    ui_queue.get(timeout=0.001)()  # The UI main loop
+                except queue.Empty:
+                    pass
+            time.sleep(0.02)
+        watcher.stop()
+
+    print(f"{messages} messages, SSE bytes sent -> UI callback ran")
+    for path, label in (("push", "push channel"), ("db", "DB watcher")):
+        ms = sorted((seen[path][status] - sent[status]) * 1e3 for status in sent if status in seen[path])
+        print(f"{label:>13}: {len(ms)}/{messages}, median {statistics.median(ms):.2f} ms, "
+              f"p95 {ms[int(len(ms) * 0.95) - 1]:.2f} ms, max {ms[-1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time from a silently dead connection to the listener reconnecting
+
+A stand-in ntfy server sends keepalives for a moment, then stops sending
+anything while keeping the socket open (as after a laptop sleep or Wi-Fi
+change). Measures how long the threaded and asyncio listeners take to
+notice and reconnect, with keepalives scaled down to KEEPALIVE_INTERVAL.
+
+Usage:
+    python benchmarks/bench_reconnect_latency.py [stalls]
+"""
+
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Point the db module at a scratch directory before importing it
+os.environ['NOTI_APP_DB_DIR'] = tempfile.mkdtemp(prefix="noti_bench_")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import ntfy_listener
+from async_listener import AsyncListener
+
+KEEPALIVE_INTERVAL = 0.2
+KEEPALIVE_MISSED = 3
+LIVE_KEEPALIVES = 3  # Keepalives sent before the stream goes silent
+
+
+class StallingServer:
+    """Sends a few keepalives per connection, then goes silent without closing"""
+
+    def __init__(self):
+        self.last_byte_at = None
+        self.reconnect_latencies = []
+        self.loop = asyncio.new_event_loop()
+        self.port = None
+        ready = threading.Event()
+        threading.Thread(target=self._serve, args=(ready,), daemon=True).start()
+        ready.wait()
+
+    def _serve(self, ready):
+        asyncio.set_event_loop(self.loop)
+        server = self.loop.run_until_complete(asyncio.start_server(self._handle, "127.0.0.1", 0))
+        self.port = server.sockets[0].getsockname()[1]
+        ready.set()
+        self.loop.run_forever()
+
+    async def _handle(self, reader, writer):
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        if self.last_byte_at is not None:
+            self.reconnect_latencies.append(time.perf_counter() - self.last_byte_at)
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Transfer-Encoding: chunked\r\n\r\n")
+        for _ in range(LIVE_KEEPALIVES):
+            event = b'event: keepalive\ndata: {"event":"keepalive"}\n\n'
+            writer.write(b"%x\r\n%s\r\n" % (len(event), event))
+            await writer.drain()
+            self.last_byte_at = time.perf_counter()
+            await asyncio.sleep(KEEPALIVE_INTERVAL)
+        await asyncio.sleep(3600)  # Silent, but the socket stays open
+
+
+def run_threaded(url):
+    threading.Thread(target=ntfy_listener.listen_for_notifications,
+                     kwargs={"topic_url": url, "cursor_key": "bench"}, daemon=True).start()
+
+
+def run_async(url):
+    listener = AsyncListener({"topic": ""}, ntfy_listener.StatusWriter(), server=url.rsplit("/", 1)[0])
+    threading.Thread(target=asyncio.run, args=(listener.run(),), daemon=True).start()
+
+
+def main():
+    stalls = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    ntfy_listener.KEEPALIVE_INTERVAL = KEEPALIVE_INTERVAL
+    ntfy_listener.KEEPALIVE_MISSED = KEEPALIVE_MISSED
+    # Each stand-in connection counts as healthy, so every stall gets the fast first retry
+    ntfy_listener.RECONNECT_RESET_AFTER = LIVE_KEEPALIVES * KEEPALIVE_INTERVAL
+
+    limit = KEEPALIVE_INTERVAL * KEEPALIVE_MISSED
+    print(f"keepalive every {KEEPALIVE_INTERVAL}s, dead after {KEEPALIVE_MISSED} missed ({limit:.1f}s), "
+          f"first retry after up to {ntfy_listener.RECONNECT_FIRST_DELAY}s")
+    for name, start in (("threaded", run_threaded), ("asyncio", run_async)):
+        server = StallingServer()
+        with contextlib.redirect_stdout(io.StringIO()):  # Silence listener logging
+            start(f"http://127.0.0.1:{server.port}/topic")
+            per_stall = LIVE_KEEPALIVES * KEEPALIVE_INTERVAL + limit + ntfy_listener.RECONNECT_FIRST_DELAY
+            deadline = time.monotonic() + stalls * per_stall * 3
+            while len(server.reconnect_latencies) < stalls and time.monotonic() < deadline:
+                time.sleep(0.05)
+        ms = sorted(latency * 1e3 for latency in server.reconnect_latencies)
+        print(f"{name:>9}: {len(ms)} stalls, last byte → reconnect median {statistics.median(ms):.0f} ms, "
+              f"max {ms[-1]:.0f} ms (was up to 300000 ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: a burst of status changes through the render scheduler
+
+A worker thread reports a burst of changes (as the monitor does when many
+agents finish at once) while the Tk loop runs. Compares one repaint per
+change (the old root.after(0, reload) per change) with RenderScheduler,
+counting repaints and the main-thread time they took. Needs a display (Tk).
+
+Usage:
+    python benchmarks/bench_render_coalescing.py [changes] [bars] [spacing_ms]
+    (On a headless machine, prefix the command with xvfb-run -a)
+"""
+
+import sys
+import threading
+import time
+import tkinter as tk
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.render_scheduler import RenderScheduler, RENDER_FRAME_MS
+
+
+def run(root, labels, changes, spacing, coalesce):
+    repaints = []
+
+    def render(changed_rows=()):
+        start = time.perf_counter()
+        for i, label in enumerate(labels):
+            label.configure(text=f"agent-{i}: done {len(repaints)}")
+        root.update_idletasks()  # As reload_all_windows does
+        repaints.append(time.perf_counter() - start)
+
+    scheduler = RenderScheduler(root, render)
+
+    def burst():
+        for i in range(changes):
+            row = {"window_name": f"agent-{i % len(labels)}", "status": "done"}
+            if coalesce:
+                scheduler.request([row])
+            else:
+                root.after(0, render)
+            time.sleep(spacing)
+        root.after(RENDER_FRAME_MS * 4, root.quit)  # Let the last frame land
+
+    threading.Thread(target=burst, daemon=True).start()
+    root.mainloop()
+    return repaints, scheduler.get_stats()
+
+
+def main():
+    changes = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    bars = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    spacing = (float(sys.argv[3]) if len(sys.argv) > 3 else 1) / 1000
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"Needs a display ({e}); run it under xvfb-run on a headless machine")
+    labels = [tk.Label(root, text=f"agent-{i}") for i in range(bars)]
+    for label in labels:
+        label.pack()
+
+    print(f"{changes} changes, {spacing * 1e3:g} ms apart, {bars} bars, frame {RENDER_FRAME_MS} ms")
+    for coalesce in (False, True):
+        repaints, stats = run(root, labels, changes, spacing, coalesce)
+        label = "render scheduler" if coalesce else "repaint per change"
+        line = f"  {label:<18} repaints {len(repaints):4d}, main-thread time {sum(repaints) * 1e3:7.1f} ms"
+        if coalesce:
+            line += f" (requested {stats['requested']}, coalesced {stats['coalesced']}, executed {stats['executed']})"
+        print(line)
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: keyboard selection repaint on a long packed list
+
+Builds the app's message bars for every window (non-virtualized list) and
+measures:
+
+- one selection move: restyling every bar whose state differs (the old
+  update_selection loop) vs restyling only the previous and new bar
+- key repeat: a burst of Down presses queued behind a busy frame, counting
+  selection repaints and _scroll_to_selected calls
+
+Needs a display (Tk).
+
+Usage:
+    python benchmarks/bench_selection_repaint.py [bars] [moves]
+"""
+
+import statistics
+import sys
+import time
+import tkinter as tk
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.notification_app import NotificationApp
+from src.window_store import WindowStore
+
+
+def make_app(root, bars):
+    """A NotificationApp with just the bar list built, no tray, listener or monitor"""
+    app = NotificationApp.__new__(NotificationApp)
+    app.root = root
+    app.virtual_list = None
+    app.selected_index = 0
+    app.message_bars = []
+    app.bars_by_name = {}
+    app._selected_bar = None
+    app._navigation_pending = False
+    app.navigation_stats = {"moves": 0, "repaints": 0}
+
+    app.canvas = tk.Canvas(root, width=300, height=200, highlightthickness=0)
+    app.canvas.pack(fill=tk.BOTH, expand=True)
+    app.messages_container = tk.Frame(app.canvas)
+    app.canvas.create_window((0, 0), window=app.messages_container, anchor="nw")
+    app.window_store = WindowStore()
+    app.window_store.subscribe(app._on_store_event)
+    app.window_store.load([{"window_name": f"agent-{i:04d}", "status": "ongoing"} for i in range(bars)])
+    root.update_idletasks()
+    app.canvas.configure(scrollregion=app.canvas.bbox("all"))
+    app.update_selection()
+    return app
+
+
+def full_pass(app):
+    """update_selection before the incremental repaint: visit every bar"""
+    for i, bar in enumerate(app.message_bars):
+        is_selected = (i == app.selected_index)
+        if is_selected != bar._is_selected:
+            app._apply_bar_style(bar, is_selected)
+
+
+def time_moves(app, moves, update):
+    times = []
+    for _ in range(moves):
+        app.selected_index = (app.selected_index + 1) % len(app.message_bars)
+        start = time.perf_counter()
+        update()
+        app.root.update_idletasks()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def key_repeat(app, presses):
+    """Queue presses Down events at once, as key repeat does behind a slow frame"""
+    scrolls = [0]
+    scroll_to_selected = app._scroll_to_selected
+
+    def counting_scroll():
+        scrolls[0] += 1
+        scroll_to_selected()
+
+    app._scroll_to_selected = counting_scroll
+    app.root.bind("<Down>", app.on_down_pressed)
+    app.root.focus_force()
+    app.root.update()
+    app.navigation_stats.update(moves=0, repaints=0)
+    start = time.perf_counter()
+    for _ in range(presses):
+        app.root.event_generate("<Down>", when="tail")
+    app.root.update()
+    elapsed = time.perf_counter() - start
+    return elapsed, dict(app.navigation_stats), scrolls[0]
+
+
+def main():
+    bars = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    moves = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    root = tk.Tk()
+    start = time.perf_counter()
+    app = make_app(root, bars)
+    print(f"{bars} bars built in {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+    for label, update in (("all bars (before)", lambda: full_pass(app)),
+                          ("two bars", app.update_selection)):
+        times = time_moves(app, moves, update)
+        print(f"  move, {label:<18} median {statistics.median(times) * 1e6:7.0f} us,"
+              f" max {max(times) * 1e6:7.0f} us")
+
+    elapsed, stats, scrolls = key_repeat(app, moves)
+    print(f"  key repeat: {moves} queued Down presses -> {stats['repaints']} repaint(s),"
+          f" {scrolls} scroll(s), {elapsed * 1e3:.1f} ms, selection at {app.selected_index}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
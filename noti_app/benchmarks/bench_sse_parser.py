@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: SSE parsing throughput in messages per second
+
+Replays recorded-style ntfy streams (open event, keepalives and status
+messages, CRLF and LF line endings) in socket-sized chunks through:
+  - the old line path: split lines, decode, startswith('data:'), json.loads
+  - SSEParser with the standard library json (stdlib_json_loads, the
+    fallback json_loads)
+  - SSEParser with orjson (if installed)
+
+Usage:
+    python benchmarks/bench_sse_parser.py [messages]
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from sse import SSEParser, stdlib_json_loads
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CHUNK_SIZES = [512, 16384]
+REPEATS = 3
+
+
+def record_stream(messages, keepalive_every, newline):
+    """An ntfy-style SSE stream like those captured from ntfy.sh"""
+    nl = newline.encode()
+    parts = [b"event: open" + nl + b'data: {"id":"o1","time":1700000000,"event":"open","topic":"t"}' + nl + nl]
+    for i in range(messages):
+        if keepalive_every and i % keepalive_every == 0:
+            parts.append(b"event: keepalive" + nl
+                         + b'data: {"id":"k%d","time":1700000000,"event":"keepalive","topic":"t"}' % i + nl + nl)
+        data = json.dumps({
+            "id": f"msg{i:08d}", "time": 1700000000 + i, "expires": 1700043200 + i,
+            "event": "message", "topic": "t",
+            "message": f"claude:agent-{i % 50} - ongoing step {i} of the current task"
+        }).encode()
+        parts.append(b"data: " + data + nl + nl)
+    return b"".join(parts)
+
+
+def chunked(stream, size):
+    return [stream[i:i + size] for i in range(0, len(stream), size)]
+
+
+def legacy_lines(chunks):
+    """What iter_lines() + the old loop did"""
+    count = 0
+    pending = b""
+    for chunk in chunks:
+        lines = (pending + chunk).splitlines(keepends=True)
+        pending = lines.pop() if lines and not lines[-1].endswith((b"\n", b"\r")) else b""
+        for line in lines:
+            line = line.rstrip(b"\r\n")
+            if line:
+                line = line.decode("utf-8")
+                if line.startswith("data:"):
+                    data = json.loads(line[5:].strip())
+                    if data.get("event", "message") == "message":
+                        count += 1
+    return count
+
+
+def with_parser(loads):
+    def run(chunks):
+        parser = SSEParser()
+        count = 0
+        for chunk in chunks:
+            for event in parser.feed(chunk):
+                if event.event == "message":
+                    loads(event.data)
+                    count += 1
+        return count
+    return run
+
+
+def main():
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    variants = [("line+json", legacy_lines),
+                ("sse+json", with_parser(stdlib_json_loads))]
+    if orjson:
+        variants.append(("sse+orjson", with_parser(orjson.loads)))
+
+    streams = [
+        ("LF, keepalive/100", record_stream(messages, 100, "\n")),
+        ("CRLF, keepalive/10", record_stream(messages, 10, "\r\n")),
+    ]
+
+    print(f"{'stream':>20} {'chunk':>6} " + " ".join(f"{name:>13}" for name, _ in variants) + "   (msg/s)")
+    for stream_name, stream in streams:
+        for size in CHUNK_SIZES:
+            chunks = chunked(stream, size)
+            rates = []
+            for _, run in variants:
+                best = float("inf")
+                for _ in range(REPEATS):
+                    start = time.perf_counter()
+                    count = run(chunks)
+                    best = min(best, time.perf_counter() - start)
+                assert count == messages, (count, messages)
+                rates.append(count / best)
+            print(f"{stream_name:>20} {size:>6} " + " ".join(f"{rate:>13,.0f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
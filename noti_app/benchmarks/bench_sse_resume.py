@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Soak test: resuming the ntfy stream across dropped connections and restarts
+
+Serves a stand-in ntfy SSE endpoint that honours `since=<id>` and drops
+each connection after a few messages, publishes a stream of statuses and
+runs the listener in a subprocess that is killed and restarted partway
+through. Checks that every message was applied exactly once and reports
+reconnects and skipped duplicates. Exits non-zero on a mismatch.
+
+Usage:
+    python benchmarks/bench_sse_resume.py [messages]
+"""
+
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+WINDOWS = 20
+PUBLISH_INTERVAL = 0.002
+DROP_AFTER = (5, 40)  # Messages per connection before the server hangs up
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.messages = []      # Published (id, time, text), in order
+        self.cond = threading.Condition()
+        self.connections = 0
+
+    def publish(self, text):
+        with self.cond:
+            message_id = f"m{len(self.messages):06d}"
+            self.messages.append((message_id, int(time.time()), text))
+            self.cond.notify_all()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        since = parse_qs(urlparse(self.path).query).get("since", [None])[0]
+        with server.cond:
+            server.connections += 1
+            # Like ntfy: messages after a known id, the whole cache for an unknown one
+            position = len(server.messages) if since is None else next(
+                (i + 1 for i, m in enumerate(server.messages) if m[0] == since), 0)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        self.wfile.write(b'event: open\ndata: {"event":"open"}\n\n')
+        self.wfile.flush()
+
+        budget = random.randint(*DROP_AFTER)
+        while budget > 0:
+            with server.cond:
+                if position >= len(server.messages):
+                    server.cond.wait(0.5)
+                if position >= len(server.messages):
+                    break  # Idle: hang up as well
+                message_id, when, text = server.messages[position]
+            position += 1
+            budget -= 1
+            data = {"id": message_id, "time": when, "event": "message", "message": text}
+            try:
+                self.wfile.write(f"event: message\ndata: {json.dumps(data)}\n\n".encode())
+                self.wfile.flush()
+            except OSError:
+                return
+        self.close_connection = True  # Hang up mid-stream
+
+
+def start_listener(db_dir, url):
+    code = (
+        "import ntfy_listener as l\n"
+        "l.RECONNECT_FIRST_DELAY = l.RECONNECT_DELAY_MIN = l.RECONNECT_DELAY_MAX = 0.05\n"
+        f"l.listen_for_notifications(topic_url={url!r})\n"
+    )
+    env = dict(os.environ, NOTI_APP_DB_DIR=db_dir)
+    return subprocess.Popen([sys.executable, "-c", code], cwd=SRC, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_for_rows(db_file, expected, timeout):
+    deadline = time.monotonic() + timeout
+    count = 0
+    while time.monotonic() < deadline:
+        try:
+            conn = sqlite3.connect(db_file)
+            count = conn.execute("SELECT COUNT(*) FROM events WHERE message_id IS NOT NULL").fetchone()[0]
+            conn.close()
+        except sqlite3.Error:
+            pass
+        if count >= expected:
+            return count
+        time.sleep(0.1)
+    return count
+
+
+def main():
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    db_dir = tempfile.mkdtemp(prefix="noti_bench_")
+    db_file = os.path.join(db_dir, "windows.db")
+
+    server = StandInServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/topic"
+
+    listener = start_listener(db_dir, url)
+    time.sleep(1.0)  # Let the first connection come up before publishing
+
+    start = time.perf_counter()
+    for i in range(messages):
+        server.publish(f"agent-{i % WINDOWS} - step {i}")
+        if i == messages // 2:
+            # Crash the listener: whatever was read but not committed must be replayed
+            listener.kill()
+            listener.wait()
+            listener = start_listener(db_dir, url)
+        time.sleep(PUBLISH_INTERVAL)
+
+    applied = wait_for_rows(db_file, messages, timeout=30)
+    elapsed = time.perf_counter() - start
+    time.sleep(0.5)  # Catch any late duplicate
+    listener.kill()
+    listener.wait()
+    server.shutdown()
+
+    conn = sqlite3.connect(db_file)
+    ids = [row[0] for row in conn.execute("SELECT message_id FROM events WHERE message_id IS NOT NULL")]
+    statuses = dict(conn.execute("SELECT window_name, status FROM windows"))
+    cursor = conn.execute("SELECT value FROM listener_state").fetchone()
+    conn.close()
+
+    expected_ids = {message_id for message_id, _, _ in server.messages}
+    expected_statuses = {}
+    for _, _, text in server.messages:
+        name, status = text.split(" - ", 1)
+        expected_statuses[name] = status
+
+    print(f"{messages} messages, {server.connections} connections "
+          f"(1 listener restart), applied in {elapsed:.1f} s")
+    print(f"  events recorded: {applied}, unique: {len(set(ids))}")
+    print(f"  saved cursor:    {cursor[0] if cursor else None}")
+    ok = (len(ids) == len(set(ids)) and set(ids) == expected_ids
+          and statuses == expected_statuses)
+    print("PASS: every message applied exactly once" if ok else "FAIL: lost or duplicated messages")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
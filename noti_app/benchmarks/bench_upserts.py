@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-row upserts per second, connection-per-call vs pooled connection
+
+Usage:
+    python benchmarks/bench_upserts.py [seconds]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Point the db module at a scratch directory before importing it
+os.environ['NOTI_APP_DB_DIR'] = tempfile.mkdtemp(prefix="noti_bench_")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import db
+
+UPSERT_SQL = '''
+    INSERT INTO windows (window_name, status, timestamp)
+    VALUES (?, ?, ?)
+    ON CONFLICT(window_name) DO UPDATE SET
+        status = excluded.status,
+        timestamp = excluded.timestamp
+'''
+
+
+def upsert_fresh_connection(window_name, status):
+    """The previous code path: open, upsert, commit, close"""
+    conn = db.open_connection()
+    try:
+        conn.execute(UPSERT_SQL, (window_name, status, datetime.now().isoformat()))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def upsert_pooled(window_name, status):
+    """The current code path: reuse this thread's connection"""
+    with db.db_transaction() as conn:
+        conn.execute(UPSERT_SQL, (window_name, status, datetime.now().isoformat()))
+
+
+def rate(fn, seconds):
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn(f"agent-{count % 50}", "ongoing" if count % 2 else "done")
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    print(f"DB: {db.DB_FILE}")
+    before = rate(upsert_fresh_connection, seconds)
+    after = rate(upsert_pooled, seconds)
+    print(f"connection per call: {before:>9.0f} upserts/s")
+    print(f"pooled connection:   {after:>9.0f} upserts/s ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: packing a bar per window vs the virtualized list
+
+For each list size, measures build time, time to scroll through the whole
+list and the number of Tk widgets created. Needs a display (Tk).
+
+Usage:
+    python benchmarks/bench_virtual_list.py
+"""
+
+import sys
+import time
+import tkinter as tk
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.virtual_list import VirtualBarList
+
+SIZES = [100, 1_000, 5_000]
+WIDTH, HEIGHT, ROW_HEIGHT = 280, 164, 44
+
+
+def make_rows(count):
+    return [{"window_name": f"agent-{i}", "status": "ongoing"} for i in range(count)]
+
+
+def make_bar(parent, row=None):
+    container = tk.Frame(parent, width=WIDTH, height=ROW_HEIGHT - 8)
+    label = tk.Label(container, text=(row or {}).get("window_name", ""))
+    label.pack(side=tk.LEFT)
+    status = tk.Label(container, text=(row or {}).get("status", ""))
+    status.pack(side=tk.RIGHT)
+    container._labels = (label, status)
+    return container
+
+
+def bind_bar(bar, index, row, selected):
+    bar._labels[0].configure(text=row["window_name"])
+    bar._labels[1].configure(text=row["status"] or "")
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def bench_packed(root, rows):
+    canvas = tk.Canvas(root, width=WIDTH, height=HEIGHT)
+    canvas.pack()
+    frame = tk.Frame(canvas)
+    canvas.create_window((0, 0), window=frame, anchor="nw")
+
+    start = time.perf_counter()
+    for row in rows:
+        make_bar(frame, row).pack(fill=tk.X, pady=4)
+    root.update_idletasks()
+    build = time.perf_counter() - start
+    canvas.configure(scrollregion=canvas.bbox("all"))
+
+    start = time.perf_counter()
+    for i in range(0, len(rows), 5):
+        canvas.yview_moveto(i / len(rows))
+        root.update_idletasks()
+    scroll = time.perf_counter() - start
+
+    widgets = count_widgets(canvas)
+    canvas.destroy()
+    return build, scroll, widgets
+
+
+def bench_virtual(root, rows):
+    canvas = tk.Canvas(root, width=WIDTH, height=HEIGHT)
+    canvas.pack()
+    scrollbar = tk.Scrollbar(root)
+
+    def create_bar():
+        bar = make_bar(canvas)
+        return bar, bar  # The container is the bar itself here
+
+    start = time.perf_counter()
+    vlist = VirtualBarList(
+        canvas, scrollbar, WIDTH, ROW_HEIGHT,
+        create_bar=create_bar,
+        bind_bar=bind_bar,
+        fetch_rows=lambda offset, limit: rows[offset:offset + limit],
+        count_rows=lambda: len(rows)
+    )
+    vlist.refresh()
+    root.update_idletasks()
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(0, len(rows), 5):
+        vlist.scroll_to(i)
+        root.update_idletasks()
+    scroll = time.perf_counter() - start
+
+    widgets = count_widgets(canvas)
+    canvas.destroy()
+    return build, scroll, widgets
+
+
+def main():
+    root = tk.Tk()
+    print(f"{'windows':>8} {'mode':>8} {'build ms':>9} {'scroll ms':>10} {'widgets':>8}")
+    for size in SIZES:
+        rows = make_rows(size)
+        for mode, bench in (("packed", bench_packed), ("virtual", bench_virtual)):
+            build, scroll, widgets = bench(root, rows)
+            print(f"{size:>8} {mode:>8} {build * 1e3:>9.1f} {scroll * 1e3:>10.1f} {widgets:>8}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
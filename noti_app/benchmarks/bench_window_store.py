@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: keeping the window list in display order
+
+For each list size, replays a stream of single-window changes (status
+flips, new windows, deletions) and compares re-sorting the whole list per
+change (what the render path did before WindowStore) with applying each
+change to a WindowStore. Also counts the observer events and the memory
+of the records vs plain dicts. No display needed.
+
+Usage:
+    python benchmarks/bench_window_store.py [changes]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.window_store import WindowStore, WindowRecord, status_priority
+
+SIZES = [100, 1_000, 10_000]
+STATUSES = ["done", "ongoing", "addressed", None, "waiting"]
+
+
+def make_rows(count):
+    return [{"window_name": f"agent-{i}", "status": random.choice(STATUSES),
+             "timestamp": f"2024-01-01T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}"}
+            for i in range(count)]
+
+
+def make_changes(rows, count):
+    """(row, deleted) pairs; timestamps increase like live updates"""
+    names = [row["window_name"] for row in rows]
+    changes = []
+    for i in range(count):
+        timestamp = f"2025-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}.{i:06d}"
+        roll = random.random()
+        if roll < 0.1:
+            name = f"new-{i}"
+            names.append(name)
+            changes.append(({"window_name": name, "status": "ongoing", "timestamp": timestamp}, None))
+        elif roll < 0.15 and names:
+            changes.append((None, names.pop(random.randrange(len(names)))))
+        else:
+            name = random.choice(names)
+            changes.append(({"window_name": name, "status": random.choice(STATUSES), "timestamp": timestamp}, None))
+    return changes
+
+
+def resort_per_change(rows, changes):
+    """The old path: merge into a dict, then sort everything for each render"""
+    window_rows = {row["window_name"]: row for row in rows}
+    for row, deleted in changes:
+        if deleted:
+            window_rows.pop(deleted, None)
+        else:
+            window_rows[row["window_name"]] = row
+        by_recency = sorted(window_rows.values(), key=lambda w: w.get("timestamp") or "", reverse=True)
+        ordered = sorted(by_recency, key=lambda w: status_priority(w.get("status")))
+    return [w["window_name"] for w in ordered]
+
+
+def store_per_change(store, changes):
+    events = Counter()
+    store.subscribe(lambda event, index, record, old_index: events.update([event]))
+    for row, deleted in changes:
+        if deleted:
+            store.remove(deleted)
+        else:
+            store.upsert(row)
+    return [record.window_name for record in store], events
+
+
+def memory(build):
+    tracemalloc.start()
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main():
+    changes_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    random.seed(1)
+    for size in SIZES:
+        rows = make_rows(size)
+        changes = make_changes(rows, changes_count)
+
+        # The re-sort gets at most 200 changes at the big sizes; its cost is per change anyway
+        sample = changes[:200] if size >= 10_000 else changes
+        start = time.perf_counter()
+        resort_per_change(rows, sample)
+        resort = (time.perf_counter() - start) / len(sample)
+
+        initial = WindowStore(rows)
+        start = time.perf_counter()
+        store_order, events = store_per_change(initial, changes)
+        store = (time.perf_counter() - start) / len(changes)
+
+        # Incremental order matches sorting the final state in one go
+        final = {row["window_name"]: row for row in rows}
+        for row, deleted in changes:
+            if deleted:
+                final.pop(deleted)
+            else:
+                final[row["window_name"]] = row
+        assert [record.window_name for record in WindowStore(final.values())] == store_order
+
+        dict_bytes = memory(lambda: [dict(row) for row in rows]) / size
+        record_bytes = memory(lambda: [WindowRecord(r["window_name"], r["status"], r["timestamp"]) for r in rows]) / size
+        print(f"{size:6d} windows: re-sort {resort * 1e6:8.1f} us/change, store {store * 1e6:6.1f} us/change"
+              f" ({resort / store:5.0f}x); per window {dict_bytes:.0f} B dict, {record_bytes:.0f} B record")
+        print(f"        events: {dict(events)}")
+
+
+if __name__ == "__main__":
+    main()
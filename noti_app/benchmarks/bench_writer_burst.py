@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Benchmark: a burst of SSE messages through the listener's StatusWriter
+
+Submits a burst of statuses as fast as the reader could parse them and
+reports how many transactions the writer needed to commit them.
+
+Usage:
+    python benchmarks/bench_writer_burst.py [messages] [windows]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Point the db module at a scratch directory before importing it
+os.environ['NOTI_APP_DB_DIR'] = tempfile.mkdtemp(prefix="noti_bench_")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from ntfy_listener import StatusWriter
+
+
+def main():
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    windows = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    writer = StatusWriter()
+    writer.start()
+    with contextlib.redirect_stdout(io.StringIO()):  # Silence per-batch DB logging
+        start = time.perf_counter()
+        for i in range(messages):
+            writer.submit(f"agent-{i % windows}", f"ongoing {i}")
+        submitted = time.perf_counter() - start
+        writer.stop(timeout=60)
+        elapsed = time.perf_counter() - start
+
+    stats = writer.get_stats()
+    print(f"{messages} messages over {windows} windows")
+    print(f"  reader submit time: {submitted * 1e3:.1f} ms ({messages / submitted:,.0f} msg/s)")
+    print(f"  drained in:         {elapsed * 1e3:.1f} ms")
+    print(f"  transactions:       {stats['batches']}")
+    print(f"  rows upserted:      {stats['written']} ({stats['coalesced']} coalesced)")
+    print(f"  max batch:          {stats['max_batch']}, max queue depth: {stats['max_queue_depth']}")
+
+
+if __name__ == "__main__":
+    main()
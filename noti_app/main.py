@@ -11,9 +11,13 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Now import and run the app
-from src.notification_app import NotificationApp, tk
+from src.notification_app import NotificationApp, claim_single_instance, tk
 
 if __name__ == "__main__":
+    # Hand off to an app that is already running instead of starting a second one
+    instance_lock = claim_single_instance()
+    if instance_lock is None:
+        sys.exit(0)
     root = tk.Tk()
-    app = NotificationApp(root)
+    app = NotificationApp(root, instance_lock)
     root.mainloop()
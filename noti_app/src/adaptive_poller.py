@@ -0,0 +1,80 @@
+"""
+Adaptive polling cadence.
+
+For loops that have to poll (no change notification available): after a
+poll that found activity the interval drops to min_interval, and every
+idle poll multiplies it by backoff, up to max_interval, or up to
+hidden_max_interval while the UI is hidden. wake() cuts the current wait
+short, e.g. when the window is shown or the loop is stopped.
+
+Ceilings above a second are fine for popups: the UI times "done" popups
+from when the monitor saw the change, not from the row's timestamp.
+"""
+
+import threading
+import time
+
+POLL_MIN_INTERVAL = 0.05        # Seconds between polls right after activity
+POLL_MAX_INTERVAL = 3.0         # Ceiling when idle
+POLL_HIDDEN_MAX_INTERVAL = 15.0  # Ceiling when idle and the window is hidden
+POLL_BACKOFF = 1.5              # Growth per idle poll
+
+
+class AdaptivePoller:
+    """Decides how long to sleep between polls; record each poll's outcome with done()"""
+
+    def __init__(self, min_interval=POLL_MIN_INTERVAL, max_interval=POLL_MAX_INTERVAL,
+                 hidden_max_interval=POLL_HIDDEN_MAX_INTERVAL, backoff=POLL_BACKOFF, clock=time.monotonic):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.hidden_max_interval = hidden_max_interval
+        self.backoff = backoff
+        self.clock = clock
+        self.interval = min_interval
+        self.hidden = False
+        self.polls = 0
+        self.active_polls = 0
+        self.errors = 0
+        self.last_activity = None
+        self._wake = threading.Event()
+
+    def done(self, active, error=False):
+        """Record a poll; active means it found something. Returns the next interval."""
+        self.polls += 1
+        if error:
+            self.errors += 1
+        if active:
+            self.active_polls += 1
+            self.last_activity = self.clock()
+            self.interval = self.min_interval
+        else:
+            ceiling = self.hidden_max_interval if self.hidden else self.max_interval
+            self.interval = min(self.interval * self.backoff, ceiling)
+        return self.interval
+
+    def sleep(self):
+        """Wait out the current interval; returns early if wake() is called"""
+        self._wake.wait(self.interval)
+        self._wake.clear()
+
+    def wake(self):
+        """Poll again now, at the fastest cadence"""
+        self.interval = self.min_interval
+        self._wake.set()
+
+    def set_hidden(self, hidden):
+        """Use the hidden ceiling while the window is hidden; showing it polls at once"""
+        self.hidden = hidden
+        if not hidden:
+            self.wake()
+
+    def diagnostics(self):
+        """Current state, for logging"""
+        return {
+            "interval": round(self.interval, 3),
+            "hidden": self.hidden,
+            "polls": self.polls,
+            "active_polls": self.active_polls,
+            "errors": self.errors,
+            "idle_for": None if self.last_activity is None else round(self.clock() - self.last_activity, 1),
+        }
@@ -0,0 +1,231 @@
+"""
+asyncio ntfy listener - follows many topics on one event loop
+
+Each topic (or, in multiplex mode, one comma-separated ntfy URL for all of
+them) is a TopicSubscription coroutine with its own cursor, duplicate
+filter and reconnect backoff, so one failing topic never delays the others.
+Window names are prefixed with the topic's namespace ("team-a/claude:win").
+Parsed statuses go to the same StatusWriter thread as the single-topic
+listener. HTTP is spoken directly over asyncio streams, so an idle
+subscription costs one socket and one suspended coroutine, not a thread.
+"""
+
+import asyncio
+import ssl
+import sys
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+# Add src directory to path for imports when run as standalone script
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ntfy_listener import (
+    NTFY_SERVER, TOPIC_NAME, CONNECT_TIMEOUT, KeepaliveWatchdog, ReconnectBackoff,
+    RecentIds, StatusWriter, decode_ntfy_events, load_cursor, submit_ntfy_message
+)
+from sse import SSEParser
+
+STOP_POLL_INTERVAL = 0.5  # Seconds between checks of a threading stop_event
+
+
+def parse_topics(spec):
+    """
+    Parse "topic[=namespace],..." into {topic: namespace}.
+
+    - "alerts" → namespace "alerts"
+    - "alerts=team-a" → namespace "team-a"
+    - "alerts=" → no namespace (window names are used as sent)
+    """
+    topics = {}
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        topic, _, namespace = entry.partition("=")
+        topics[topic.strip()] = namespace.strip() if "=" in entry else topic.strip()
+    return topics or {TOPIC_NAME: ""}
+
+
+async def open_event_stream(url, params=None):
+    """
+    GET url as an event stream over a plain asyncio connection.
+    Returns (reader, writer, chunked) once the response headers are read.
+    """
+    parts = urlsplit(url)
+    secure = parts.scheme == "https"
+    host = parts.hostname
+    port = parts.port or (443 if secure else 80)
+    path = (parts.path or "/") + (f"?{urlencode(params)}" if params else "")
+
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(
+            host, port,
+            ssl=ssl.create_default_context() if secure else None,
+            server_hostname=host if secure else None
+        ),
+        CONNECT_TIMEOUT
+    )
+    try:
+        writer.write(
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {parts.netloc}\r\n"
+            "Accept: text/event-stream\r\n"
+            "Cache-Control: no-cache\r\n"
+            "Connection: keep-alive\r\n\r\n".encode("ascii")
+        )
+        await writer.drain()
+
+        status_line = await asyncio.wait_for(reader.readline(), CONNECT_TIMEOUT)
+        fields = status_line.split(None, 2)
+        if len(fields) < 2 or fields[1] != b"200":
+            raise ConnectionError(f"unexpected response: {status_line.decode('latin-1').strip()}")
+
+        chunked = False
+        while True:
+            header = await asyncio.wait_for(reader.readline(), CONNECT_TIMEOUT)
+            if header in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = header.decode("latin-1").partition(":")
+            if name.strip().lower() == "transfer-encoding" and "chunked" in value.lower():
+                chunked = True
+        return reader, writer, chunked
+    except BaseException:
+        writer.close()
+        raise
+
+
+async def iter_stream_chunks(reader, chunked, watchdog):
+    """
+    Yield the body's bytes as they arrive until the server closes it.
+    Raises TimeoutError once watchdog sees no byte for too long.
+    """
+    async def read(awaitable):
+        data = await asyncio.wait_for(awaitable, watchdog.remaining())
+        watchdog.feed()
+        return data
+
+    while True:
+        if chunked:
+            size_line = await read(reader.readline())
+            if not size_line:
+                break
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                break  # Last chunk
+            data = await read(reader.readexactly(size + 2))
+            yield data[:-2]  # Chunk data is followed by CRLF
+        else:
+            data = await read(reader.read(65536))
+            if not data:
+                break
+            yield data
+
+
+class TopicSubscription:
+    """One ntfy stream (one topic, or several multiplexed) with its own cursor and backoff"""
+
+    def __init__(self, topics, writer, server=NTFY_SERVER):
+        self.topics = dict(topics)  # topic -> namespace
+        self.writer = writer
+        self.name = ",".join(self.topics)
+        self.url = f"{server}/{self.name}/sse"
+        self.cursor_key = f"ntfy_cursor:{self.name}"
+        self.recent_ids = RecentIds()
+        self.since = None
+        self.backoff = ReconnectBackoff()
+        self.connects = 0
+        self.messages = 0
+
+    async def run(self):
+        """Stream forever, reconnecting with backoff"""
+        loop = asyncio.get_running_loop()
+        cursor = await loop.run_in_executor(None, load_cursor, self.cursor_key)
+        self.since = cursor["id"] if cursor else None
+
+        while True:  # Reconnection loop
+            watchdog = KeepaliveWatchdog()
+            try:
+                await self._stream(watchdog)
+                reason = "closed by server"
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError:
+                reason = f"no data for {watchdog.idle():.0f}s ({watchdog.missed_count()} keepalives missed)"
+            except Exception as e:
+                reason = repr(e)
+
+            # Reconnect, also after a clean close by the server
+            delay = self.backoff.next_delay()
+            print(f"[LISTENER] [{self.name}] Connection lost: {reason}; reconnecting in {delay:.1f} seconds...")
+            await asyncio.sleep(delay)
+
+    async def _stream(self, watchdog):
+        params = {"since": self.since} if self.since else None
+        reader, writer, chunked = await open_event_stream(self.url, params)
+        self.connects += 1
+        self.backoff.connected()
+        watchdog.feed()
+        print(f"[LISTENER] [{self.name}] Connected" + (f" (since={self.since})" if self.since else ""))
+        parser = SSEParser()
+        try:
+            async for chunk in iter_stream_chunks(reader, chunked, watchdog):
+                for data in decode_ntfy_events(parser.feed(chunk)):
+                    self.backoff.reset()  # The stream works; start the backoff over
+                    # Multiplexed streams say which topic each message came from.
+                    # submit() blocks once the writer queue is full; then wait
+                    # for room on an executor thread so the loop keeps serving
+                    # the other streams (each still stalls until it gets room).
+                    namespace = self.topics.get(data.get("topic"), next(iter(self.topics.values())))
+                    args = (data, self.writer, self.recent_ids, self.cursor_key, namespace)
+                    if self.writer.backlogged():
+                        message_id = await asyncio.get_running_loop().run_in_executor(None, submit_ntfy_message, *args)
+                    else:
+                        message_id = submit_ntfy_message(*args)
+                    if message_id:
+                        self.since = message_id
+                        self.messages += 1
+        finally:
+            writer.close()
+
+
+class AsyncListener:
+    """Runs a TopicSubscription per topic (or one for all, if multiplex) on one event loop"""
+
+    def __init__(self, topics, writer, server=NTFY_SERVER, multiplex=False):
+        if multiplex:
+            self.subscriptions = [TopicSubscription(topics, writer, server)]
+        else:
+            self.subscriptions = [
+                TopicSubscription({topic: namespace}, writer, server)
+                for topic, namespace in topics.items()
+            ]
+
+    async def run(self, stop_event=None):
+        """Run every subscription; with a threading.Event, return once it is set"""
+        streams = asyncio.gather(*(subscription.run() for subscription in self.subscriptions))
+        if stop_event is None:
+            return await streams
+        while not stop_event.is_set() and not streams.done():
+            await asyncio.sleep(STOP_POLL_INTERVAL)
+        streams.cancel()
+        try:
+            await streams
+        except asyncio.CancelledError:
+            pass
+
+
+def listen_for_topics(topics, writer=None, server=NTFY_SERVER, multiplex=False, stop_event=None):
+    """Listen on every topic in {topic: namespace} until interrupted or stop_event is set"""
+    print(f"[LISTENER] Starting asyncio listener on {len(topics)} topics"
+          + (" (multiplexed)" if multiplex else ""))
+    if writer is None:
+        writer = StatusWriter()
+        writer.start()
+
+    try:
+        asyncio.run(AsyncListener(topics, writer, server, multiplex).run(stop_event))
+    except KeyboardInterrupt:
+        print("\n[LISTENER] Stopped listening")
+    finally:
+        writer.stop()  # Flush queued statuses
+        print(f"[WRITER] Final stats: {writer.get_stats()}")
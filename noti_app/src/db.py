@@ -14,12 +14,17 @@ from pathlib import Path
 from contextlib import contextmanager
 import platform
 import sys
+import threading
+import atexit
 
 # Database file location - use native Windows path for proper SQLite locking
 # UNC paths (\\wsl.localhost\...) don't support SQLite locking correctly
 import os
 
-if platform.system() == 'Windows':
+if os.environ.get('NOTI_APP_DB_DIR'):
+    # Explicit override (benchmarks, alternate installs)
+    DB_DIR = Path(os.environ['NOTI_APP_DB_DIR'])
+elif platform.system() == 'Windows':
     # Use Windows AppData for reliable SQLite locking
     appdata = os.environ.get('LOCALAPPDATA', r'C:\Users\ytj19\AppData\Local')
     DB_DIR = Path(appdata) / "noti_app"
@@ -33,9 +38,40 @@ DB_FILE = DB_DIR / "windows.db"
 # Ensure directory exists
 DB_DIR.mkdir(parents=True, exist_ok=True)
 
-
-def get_connection(retries=3):
-    """Get a database connection with proper settings for concurrent access."""
+# Display order: done -> ongoing -> other/None -> addressed, most recent first.
+# Shared by get_windows_page() and its expression index so the index is used.
+PRIORITY_ORDER_SQL = '''
+    CASE lower(coalesce(status, ''))
+        WHEN 'done' THEN 0
+        WHEN 'ongoing' THEN 1
+        WHEN 'addressed' THEN 3
+        ELSE 2
+    END
+'''
+
+# Statuses that are a visible change even when repeated: an agent finishing
+# another task moves its window back to the top (new timestamp) and can pop
+# the UI. Matches the UI's POPUP_STATUSES and flow control's terminal statuses.
+REPEATABLE_STATUSES = ("done",)
+_REPEATABLE_SQL = ", ".join(f"'{status}'" for status in REPEATABLE_STATUSES)
+
+# Status event history retention (enforced by compact_events)
+EVENT_MAX_AGE_DAYS = 30           # Drop events older than this
+EVENT_MAX_ROWS_PER_WINDOW = 1000  # Keep at most this many events per window
+EVENT_COMPACTION_BATCH = 500      # Rows deleted per transaction
+EVENT_COMPACTION_INTERVAL = 300   # Seconds between background compaction runs
+
+
+# Long-lived connections, one per thread. Opening a connection (plus the
+# busy_timeout pragma) on every call is slow, especially on /mnt/c under WSL.
+# Each connection also keeps sqlite3's prepared statement cache warm.
+_local = threading.local()
+_connections = []  # (thread, conn) pairs, so everything can be closed at exit
+_connections_lock = threading.Lock()
+
+
+def open_connection(retries=3):
+    """Open a new database connection with proper settings for concurrent access."""
     import time
     last_error = None
 
@@ -44,7 +80,9 @@ def get_connection(retries=3):
             conn = sqlite3.connect(
                 str(DB_FILE),
                 timeout=30.0,  # Wait up to 30 seconds for locks
-                isolation_level='DEFERRED'  # Defer locking until needed
+                isolation_level='DEFERRED',  # Defer locking until needed
+                check_same_thread=False,  # Only used by its own thread, but closed from atexit
+                cached_statements=128  # Reuse prepared statements across calls
             )
             conn.row_factory = sqlite3.Row  # Return rows as dict-like objects
             # Set busy timeout (more portable than WAL for cross-platform)
@@ -60,27 +98,102 @@ def get_connection(retries=3):
     raise last_error
 
 
+def get_connection(retries=3):
+    """Get the calling thread's long-lived connection, opening it on first use."""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and _local.path == str(DB_FILE):
+        return conn
+    if conn is not None:
+        # DB_FILE was repointed since this connection was opened
+        close_connection()
+
+    conn = open_connection(retries)
+    _local.conn = conn
+    _local.path = str(DB_FILE)
+
+    with _connections_lock:
+        # Drop connections left behind by threads that have exited
+        for thread, other in [c for c in _connections if not c[0].is_alive()]:
+            _connections.remove((thread, other))
+            try:
+                other.close()
+            except Exception:
+                pass
+        _connections.append((threading.current_thread(), conn))
+    return conn
+
+
+def close_connection():
+    """Close the calling thread's connection (reopened on next use)."""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        return
+    _local.conn = None
+    with _connections_lock:
+        _connections[:] = [c for c in _connections if c[1] is not conn]
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+def close_all_connections():
+    """Close every pooled connection. Registered with atexit."""
+    with _connections_lock:
+        connections = [conn for _, conn in _connections]
+        _connections.clear()
+    for conn in connections:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    _local.conn = None
+
+
+atexit.register(close_all_connections)
+
+
 @contextmanager
 def db_transaction():
-    """Context manager for database transactions with automatic commit/rollback."""
-    conn = None
+    """
+    Context manager for database transactions with automatic commit/rollback.
+    Nested use on the same thread runs inside the outer transaction under a
+    SAVEPOINT: a nested block that raises has its own writes rolled back
+    (even if the caller catches the error), and the outer block decides
+    whether the rest commits.
+    """
+    conn = get_connection()
+    depth = getattr(_local, 'depth', 0)
+    savepoint = f'nested_{depth}' if depth else None
+    if savepoint:
+        if not conn.in_transaction:
+            # Otherwise the savepoint would open (and RELEASE commit) a
+            # transaction of its own
+            conn.execute('BEGIN')
+        conn.execute(f'SAVEPOINT {savepoint}')
+    _local.depth = depth + 1
     try:
-        conn = get_connection()
         yield conn
-        conn.commit()
+        if savepoint:
+            conn.execute(f'RELEASE {savepoint}')
+        else:
+            conn.commit()
     except Exception as e:
-        if conn:
+        if savepoint:
+            try:
+                conn.execute(f'ROLLBACK TO {savepoint}')
+                conn.execute(f'RELEASE {savepoint}')
+            except Exception:
+                pass  # The outer block's rollback still undoes it
+        else:
             try:
                 conn.rollback()
-            except:
-                pass
+            except Exception:
+                # Connection is unusable - open a fresh one next time
+                close_connection()
         raise e
     finally:
-        if conn:
-            try:
-                conn.close()
-            except:
-                pass
+        _local.depth = depth
 
 
 def init_db():
@@ -91,7 +204,8 @@ def init_db():
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 window_name TEXT UNIQUE NOT NULL,
                 status TEXT,
-                timestamp TEXT NOT NULL
+                timestamp TEXT NOT NULL,
+                version INTEGER NOT NULL DEFAULT 0
             )
         ''')
         # Create index for faster lookups
@@ -102,30 +216,261 @@ def init_db():
             CREATE INDEX IF NOT EXISTS idx_timestamp ON windows(timestamp DESC)
         ''')
 
+        # Monotonic change counter, bumped by triggers on every write to windows.
+        # Readers compare it instead of hashing the whole table (see get_db_version)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS db_meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        ''')
+        conn.execute('''
+            INSERT OR IGNORE INTO db_meta (key, value) VALUES ('data_version', 0)
+        ''')
+
+        # Display order, with window_name breaking ties so paging is deterministic
+        # (the same key as WindowStore). Replace the index older versions created without it
+        index = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'idx_priority'").fetchone()
+        if index and 'window_name' not in index['sql']:
+            conn.execute('DROP INDEX idx_priority')
+        conn.execute(f'''
+            CREATE INDEX IF NOT EXISTS idx_priority ON windows(({PRIORITY_ORDER_SQL}), timestamp DESC, window_name)
+        ''')
+
+        # Tombstones for deleted windows, so delta readers see removals
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS deleted_windows (
+                window_name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL
+            )
+        ''')
+
+        # Migrate databases created before rows carried a version
+        columns = [row['name'] for row in conn.execute('PRAGMA table_info(windows)')]
+        if 'version' not in columns:
+            conn.execute('ALTER TABLE windows ADD COLUMN version INTEGER NOT NULL DEFAULT 0')
+            conn.execute("UPDATE db_meta SET value = value + 1 WHERE key = 'data_version'")
+            conn.execute("UPDATE windows SET version = (SELECT value FROM db_meta WHERE key = 'data_version')")
+
+        # When a window last reported in, even with an unchanged status.
+        # Not watched by the version triggers, so bumping it is invisible to readers
+        if 'last_seen' not in columns:
+            conn.execute('ALTER TABLE windows ADD COLUMN last_seen TEXT')
+
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_version ON windows(version)
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_deleted_version ON deleted_windows(version)
+        ''')
+
+        # Append-only history of every ingested status (see get_events)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY,
+                window_name TEXT NOT NULL,
+                status TEXT,
+                timestamp TEXT NOT NULL
+            )
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_events_window ON events(window_name, id)
+        ''')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events(timestamp)
+        ''')
 
-def update_window_status(window_name: str, status: str = None) -> bool:
+        # ntfy message id of each event, so a replayed message is applied only once
+        columns = [row['name'] for row in conn.execute('PRAGMA table_info(events)')]
+        if 'message_id' not in columns:
+            conn.execute('ALTER TABLE events ADD COLUMN message_id TEXT')
+        conn.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_events_message_id ON events(message_id)
+            WHERE message_id IS NOT NULL
+        ''')
+
+        # Small key/value store for the listener (e.g. its ntfy stream cursor)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS listener_state (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
+
+        # Every write bumps data_version and stamps the new value on the row
+        # (or its tombstone), which is what get_windows_changed_since() reads.
+        # Recreated on each start so older trigger definitions get replaced.
+        for op in ('insert', 'update', 'delete'):
+            conn.execute(f'DROP TRIGGER IF EXISTS windows_version_{op}')
+        conn.execute('''
+            CREATE TRIGGER windows_version_insert
+            AFTER INSERT ON windows
+            BEGIN
+                UPDATE db_meta SET value = value + 1 WHERE key = 'data_version';
+                UPDATE windows SET version = (SELECT value FROM db_meta WHERE key = 'data_version')
+                    WHERE id = NEW.id;
+                DELETE FROM deleted_windows WHERE window_name = NEW.window_name;
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER windows_version_update
+            AFTER UPDATE OF window_name, status, timestamp ON windows
+            WHEN OLD.window_name IS NOT NEW.window_name
+              OR OLD.status IS NOT NEW.status
+              OR OLD.timestamp IS NOT NEW.timestamp
+            BEGIN
+                UPDATE db_meta SET value = value + 1 WHERE key = 'data_version';
+                UPDATE windows SET version = (SELECT value FROM db_meta WHERE key = 'data_version')
+                    WHERE id = NEW.id;
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER windows_version_delete
+            AFTER DELETE ON windows
+            BEGIN
+                UPDATE db_meta SET value = value + 1 WHERE key = 'data_version';
+                INSERT OR REPLACE INTO deleted_windows (window_name, version)
+                    VALUES (OLD.window_name, (SELECT value FROM db_meta WHERE key = 'data_version'));
+            END
+        ''')
+
+
+def _upsert_windows(conn, rows) -> set:
+    """
+    Upsert (window_name, status, timestamp) rows inside an open transaction.
+    A row whose status is unchanged only gets its last_seen bumped, so it
+    keeps its timestamp and version and readers see no change, unless the
+    status is one of REPEATABLE_STATUSES.
+    Returns the names of the windows that visibly changed.
+    """
+    # Runs first so the transaction (and write lock) is held before the
+    # version is read below
+    conn.executemany(
+        'UPDATE windows SET last_seen = ? WHERE window_name = ? AND status IS ?',
+        [(timestamp, window_name, status) for window_name, status, timestamp in rows]
+    )
+    before = conn.execute("SELECT value FROM db_meta WHERE key = 'data_version'").fetchone()['value']
+    conn.executemany(f'''
+        INSERT INTO windows (window_name, status, timestamp, last_seen)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(window_name) DO UPDATE SET
+            status = excluded.status,
+            timestamp = excluded.timestamp,
+            last_seen = excluded.last_seen
+        WHERE windows.status IS NOT excluded.status
+           OR lower(coalesce(excluded.status, '')) IN ({_REPEATABLE_SQL})
+    ''', [(window_name, status, timestamp, timestamp) for window_name, status, timestamp in rows])
+    return {row['window_name'] for row in conn.execute(
+        'SELECT window_name FROM windows WHERE version > ?', (before,)
+    )}
+
+
+def update_window_status(window_name: str, status: str = None):
     """
-    Update or insert a window status (upsert).
-    Returns True on success, False on failure.
+    Update or insert a window status (upsert). An unchanged status only
+    bumps last_seen (see _upsert_windows); it is still recorded as an event.
+    Returns True if the window visibly changed, False if it did not, and
+    None on failure.
     """
     timestamp = datetime.now().isoformat()
 
     try:
         with db_transaction() as conn:
-            # SQLite UPSERT (INSERT OR REPLACE)
-            conn.execute('''
-                INSERT INTO windows (window_name, status, timestamp)
-                VALUES (?, ?, ?)
-                ON CONFLICT(window_name) DO UPDATE SET
-                    status = excluded.status,
-                    timestamp = excluded.timestamp
-            ''', (window_name, status, timestamp))
-
-        print(f"[DB] Updated: {window_name}" + (f" - {status}" if status else ""))
-        return True
+            changed = _upsert_windows(conn, [(window_name, status, timestamp)])
+            # Same transaction, so history costs no extra commit
+            conn.execute(
+                'INSERT INTO events (window_name, status, timestamp) VALUES (?, ?, ?)',
+                (window_name, status, timestamp)
+            )
+
+        if changed:
+            print(f"[DB] Updated: {window_name}" + (f" - {status}" if status else ""))
+        return bool(changed)
     except Exception as e:
         print(f"[DB] Error updating window status: {e}")
-        return False
+        return None
+
+
+def update_window_statuses_many(windows, history=None, state=None):
+    """
+    Upsert many window statuses in a single transaction.
+    Each item is a dict with window_name, status and an optional timestamp
+    (defaults to now) and message_id. Items without a window_name are skipped.
+    Windows whose status is unchanged only get last_seen bumped.
+    history, if given, is the list of items to record in the events table
+    instead of `windows` (e.g. every message, when `windows` was coalesced).
+    state, if given, is a dict of listener_state keys to write in the same
+    transaction (e.g. the stream cursor, so it never runs ahead of the data).
+    Returns the set of window names that visibly changed (empty if none did),
+    or None on failure.
+    """
+    now = datetime.now().isoformat()
+
+    def to_rows(items):
+        return [
+            (w['window_name'], w.get('status'), w.get('timestamp') or now)
+            for w in items
+            if w.get('window_name')
+        ]
+
+    rows = to_rows(windows)
+    event_rows = [
+        (w['window_name'], w.get('status'), w.get('timestamp') or now, w.get('message_id'))
+        for w in (windows if history is None else history)
+        if w.get('window_name')
+    ]
+    if not rows and not event_rows and not state:
+        return set()
+
+    try:
+        with db_transaction() as conn:
+            changed = _upsert_windows(conn, rows) if rows else set()
+            conn.executemany(
+                'INSERT OR IGNORE INTO events (window_name, status, timestamp, message_id) VALUES (?, ?, ?, ?)',
+                event_rows
+            )
+            if state:
+                conn.executemany('''
+                    INSERT INTO listener_state (key, value) VALUES (?, ?)
+                    ON CONFLICT(key) DO UPDATE SET value = excluded.value
+                ''', list(state.items()))
+
+        print(f"[DB] Updated {len(changed)} of {len(rows)} windows")
+        return changed
+    except Exception as e:
+        print(f"[DB] Error updating window statuses: {e}")
+        return None
+
+
+def get_applied_message_ids(message_ids) -> set:
+    """
+    Return the subset of ntfy message ids already recorded in the events table.
+    Raises on database errors so callers never mistake a failure for "new".
+    """
+    message_ids = list(message_ids)
+    applied = set()
+    with db_transaction() as conn:
+        # Stay well under SQLite's bound-parameter limit
+        for i in range(0, len(message_ids), 500):
+            chunk = message_ids[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            applied.update(
+                row['message_id'] for row in conn.execute(
+                    f'SELECT message_id FROM events WHERE message_id IN ({placeholders})', chunk
+                )
+            )
+    return applied
+
+
+def get_listener_state(key: str):
+    """Return a listener_state value, or None if unset or unreadable."""
+    try:
+        with db_transaction() as conn:
+            row = conn.execute('SELECT value FROM listener_state WHERE key = ?', (key,)).fetchone()
+        return row['value'] if row else None
+    except Exception as e:
+        print(f"[DB] Error reading listener state: {e}")
+        return None
 
 
 def get_all_windows() -> list:
@@ -146,6 +491,89 @@ def get_all_windows() -> list:
         return []
 
 
+def get_windows_page(offset: int, limit: int) -> list:
+    """
+    Get one page of windows in display order (status priority, then most
+    recent first, then name), for views that only show part of the list.
+    Returns list of dicts with window_name, status, timestamp.
+    """
+    try:
+        with db_transaction() as conn:
+            cursor = conn.execute(f'''
+                SELECT window_name, status, timestamp
+                FROM windows
+                ORDER BY ({PRIORITY_ORDER_SQL}), timestamp DESC, window_name
+                LIMIT ? OFFSET ?
+            ''', (limit, offset))
+            return [dict(row) for row in cursor.fetchall()]
+    except Exception as e:
+        print(f"[DB] Error loading windows page: {e}")
+        return []
+
+
+def count_windows() -> int:
+    """Get the number of tracked windows. Returns 0 on failure."""
+    try:
+        with db_transaction() as conn:
+            return conn.execute('SELECT COUNT(*) FROM windows').fetchall()[0][0]
+    except Exception as e:
+        print(f"[DB] Error counting windows: {e}")
+        return 0
+
+
+def get_windows_changed_since(cursor: int):
+    """
+    Get the windows upserted and deleted since a version cursor.
+    Pass cursor=0 (or None) for a full snapshot, then pass back the returned
+    cursor on each call to receive only what changed in between.
+
+    Returns a dict:
+        windows: list of dicts (window_name, status, timestamp, version)
+        deleted: list of window names removed since the cursor
+        cursor:  cursor to pass on the next call
+        full:    True if 'windows' is a full snapshot that replaces the
+                 caller's state (first call, or the database was recreated)
+    Returns None if the database is locked or unavailable.
+    """
+    try:
+        with db_transaction() as conn:
+            rows = conn.execute(
+                "SELECT value FROM db_meta WHERE key = 'data_version'"
+            ).fetchall()
+            new_cursor = rows[0][0] if rows else 0
+
+            # A cursor from the future means the database was recreated
+            full = not cursor or cursor > new_cursor
+            since = 0 if full else cursor
+
+            # Bounded by new_cursor so rows written after the counter was read
+            # are left for the next call rather than reported half-way
+            windows = conn.execute('''
+                SELECT window_name, status, timestamp, version
+                FROM windows
+                WHERE version > ? AND version <= ?
+                ORDER BY timestamp DESC
+            ''', (since, new_cursor)).fetchall()
+            deleted = [] if full else conn.execute('''
+                SELECT window_name
+                FROM deleted_windows
+                WHERE version > ? AND version <= ?
+            ''', (since, new_cursor)).fetchall()
+
+            return {
+                'windows': [dict(row) for row in windows],
+                'deleted': [row['window_name'] for row in deleted],
+                'cursor': new_cursor,
+                'full': full,
+            }
+    except sqlite3.OperationalError:
+        # Database locked - caller keeps its cursor and retries
+        return None
+    except Exception as e:
+        print(f"[DB] Error loading window changes: {e}")
+        return None
+
+
 def delete_window(window_name: str) -> bool:
     """Delete a window by name. Returns True on success."""
     try:
@@ -158,6 +586,115 @@ def delete_window(window_name: str) -> bool:
         return False
 
 
+def get_events(window_name: str = None, since=None, until=None, limit: int = 1000) -> list:
+    """
+    Get status history, newest first.
+    Optionally filtered to one window and/or a time range; since and until
+    are datetimes or ISO strings (since inclusive, until exclusive).
+    Returns list of dicts with id, window_name, status, timestamp.
+    """
+    clauses = []
+    params = []
+    if window_name is not None:
+        clauses.append('window_name = ?')
+        params.append(window_name)
+    if since is not None:
+        clauses.append('timestamp >= ?')
+        params.append(since.isoformat() if isinstance(since, datetime) else since)
+    if until is not None:
+        clauses.append('timestamp < ?')
+        params.append(until.isoformat() if isinstance(until, datetime) else until)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+    params.append(limit)
+
+    try:
+        with db_transaction() as conn:
+            cursor = conn.execute(f'''
+                SELECT id, window_name, status, timestamp
+                FROM events
+                {where}
+                ORDER BY id DESC
+                LIMIT ?
+            ''', params)
+            return [dict(row) for row in cursor.fetchall()]
+    except Exception as e:
+        print(f"[DB] Error loading events: {e}")
+        return []
+
+
+def compact_events(max_age_days: float = EVENT_MAX_AGE_DAYS,
+                   max_rows_per_window: int = EVENT_MAX_ROWS_PER_WINDOW,
+                   batch_size: int = EVENT_COMPACTION_BATCH,
+                   pause: float = 0.05) -> int:
+    """
+    Apply event retention: drop events older than max_age_days and trim each
+    window to its newest max_rows_per_window events.
+    Deletes at most batch_size rows per transaction and sleeps `pause`
+    seconds between batches, so the write lock is never held for long.
+    Returns the number of events deleted.
+    """
+    import time
+    from datetime import timedelta
+
+    def delete_batches(select_sql, params):
+        deleted = 0
+        while True:
+            with db_transaction() as conn:
+                cursor = conn.execute(
+                    f'DELETE FROM events WHERE id IN ({select_sql})',
+                    params
+                )
+                count = cursor.rowcount
+            deleted += count
+            if count < batch_size:
+                return deleted
+            time.sleep(pause)
+
+    deleted = 0
+    try:
+        if max_age_days is not None:
+            cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat()
+            deleted += delete_batches(
+                'SELECT id FROM events WHERE timestamp < ? ORDER BY timestamp LIMIT ?',
+                (cutoff, batch_size)
+            )
+
+        if max_rows_per_window is not None:
+            with db_transaction() as conn:
+                over_limit = [row['window_name'] for row in conn.execute('''
+                    SELECT window_name FROM events
+                    GROUP BY window_name
+                    HAVING COUNT(*) > ?
+                ''', (max_rows_per_window,)).fetchall()]
+            for window_name in over_limit:
+                deleted += delete_batches(
+                    'SELECT id FROM events WHERE window_name = ? ORDER BY id DESC LIMIT ? OFFSET ?',
+                    (window_name, batch_size, max_rows_per_window)
+                )
+
+        if deleted:
+            print(f"[DB] Compacted {deleted} events")
+    except Exception as e:
+        print(f"[DB] Error compacting events: {e}")
+    return deleted
+
+
+def start_event_compactor(interval: float = EVENT_COMPACTION_INTERVAL, stop_event=None):
+    """
+    Run compact_events() every `interval` seconds in a daemon thread.
+    Set stop_event (a threading.Event) to stop it. Returns the thread.
+    """
+    stop_event = stop_event or threading.Event()
+
+    def run():
+        while not stop_event.wait(interval):
+            compact_events()
+
+    thread = threading.Thread(target=run, name="event-compactor", daemon=True)
+    thread.start()
+    return thread
+
+
 def get_db_mtime() -> float:
     """
     Get the modification time of the database file.
@@ -171,10 +708,32 @@ def get_db_mtime() -> float:
     return 0.0
 
 
+def get_db_version():
+    """
+    Get the database change counter.
+    Constant-cost alternative to get_db_hash(): a single primary-key lookup
+    that changes whenever any row in windows is inserted, updated or deleted.
+    Returns None if the database is locked or unavailable.
+    """
+    try:
+        with db_transaction() as conn:
+            # fetchall() finishes the statement so no read lock outlives the call
+            rows = conn.execute(
+                "SELECT value FROM db_meta WHERE key = 'data_version'"
+            ).fetchall()
+            return rows[0][0] if rows else 0
+    except sqlite3.OperationalError:
+        # Database locked or schema not initialized yet - try again next poll
+        return None
+    except Exception as e:
+        print(f"[DB] Error getting version: {e}")
+        return None
+
+
 def get_db_hash() -> str:
     """
     Get a hash representing the current database state.
-    Used for change detection.
+    Cost grows with the number of rows; prefer get_db_version() for polling.
     Falls back to mtime if database is locked.
     """
     import hashlib
@@ -225,16 +784,10 @@ def migrate_from_jsonl(jsonl_path: Path) -> bool:
             print("[DB] JSONL file is empty, nothing to migrate")
             return True
 
-        with db_transaction() as conn:
-            for window in windows:
-                conn.execute('''
-                    INSERT OR REPLACE INTO windows (window_name, status, timestamp)
-                    VALUES (?, ?, ?)
-                ''', (
-                    window.get('window_name', 'unknown'),
-                    window.get('status'),
-                    window.get('timestamp', datetime.now().isoformat())
-                ))
+        for window in windows:
+            window.setdefault('window_name', 'unknown')
+        if update_window_statuses_many(windows) is None:
+            return False
 
         print(f"[DB] Migrated {len(windows)} windows from JSONL")
 
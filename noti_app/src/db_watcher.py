@@ -0,0 +1,203 @@
+"""
+Database change notification for noti_app.
+
+Wakes a callback shortly after another process commits to the SQLite
+database, instead of polling it on a fixed interval:
+- Linux: inotify on the database directory (db, -journal and -wal files)
+- Windows: FindFirstChangeNotification on the database directory
+- Anywhere else, or if the above fail: polling of get_db_version() on an
+  AdaptivePoller cadence (fast after a change, slower when idle or hidden)
+
+Filesystem events only trigger a get_db_version() check; the callback runs
+when the change counter actually moved, so writes that don't touch the
+windows table (event history, compaction) don't wake the UI.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import platform
+import select
+import struct
+import threading
+import traceback
+
+from . import db
+from .adaptive_poller import AdaptivePoller
+
+# With filesystem events: still re-check this often in case an event is missed
+# (e.g. a write made from the other side of the WSL/Windows boundary)
+EVENT_SAFETY_INTERVAL = 2.0
+
+# inotify constants (linux/inotify.h)
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_EVENT_HEADER = struct.Struct('iIII')
+
+# Windows change notification constants (winnt.h / winbase.h)
+_FILE_NOTIFY_CHANGE_SIZE = 0x00000008
+_FILE_NOTIFY_CHANGE_LAST_WRITE = 0x00000010
+_WAIT_OBJECT_0 = 0x00000000
+_INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+
+class _InotifySource:
+    """Blocks until one of the database files changes (Linux)"""
+
+    def __init__(self, db_file):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+        if libc.inotify_add_watch(self.fd, os.fsencode(str(db_file.parent)), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, "inotify_add_watch failed")
+        base = db_file.name
+        self.names = {base, f"{base}-journal", f"{base}-wal"}
+
+    def wait(self, timeout):
+        """Return True if a database file changed within timeout seconds"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        relevant = False
+        try:
+            while True:
+                data = os.read(self.fd, 4096)
+                offset = 0
+                while offset < len(data):
+                    _, _, _, name_len = _IN_EVENT_HEADER.unpack_from(data, offset)
+                    offset += _IN_EVENT_HEADER.size
+                    name = data[offset:offset + name_len].rstrip(b'\0').decode(errors='replace')
+                    offset += name_len
+                    relevant = relevant or name in self.names
+        except BlockingIOError:
+            pass  # Drained
+        return relevant
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _WindowsChangeSource:
+    """Blocks until something in the database directory is written (Windows)"""
+
+    def __init__(self, db_file):
+        self.kernel32 = ctypes.windll.kernel32
+        self.kernel32.FindFirstChangeNotificationW.restype = ctypes.c_void_p
+        self.kernel32.FindNextChangeNotification.argtypes = [ctypes.c_void_p]
+        self.kernel32.FindCloseChangeNotification.argtypes = [ctypes.c_void_p]
+        self.kernel32.WaitForSingleObject.argtypes = [ctypes.c_void_p, ctypes.c_uint32]
+        self.handle = self.kernel32.FindFirstChangeNotificationW(
+            str(db_file.parent), False,
+            _FILE_NOTIFY_CHANGE_SIZE | _FILE_NOTIFY_CHANGE_LAST_WRITE
+        )
+        if not self.handle or self.handle == _INVALID_HANDLE_VALUE:
+            raise OSError("FindFirstChangeNotificationW failed")
+
+    def wait(self, timeout):
+        """Return True if the database directory changed within timeout seconds"""
+        result = self.kernel32.WaitForSingleObject(self.handle, int(timeout * 1000))
+        if result != _WAIT_OBJECT_0:
+            return False
+        self.kernel32.FindNextChangeNotification(self.handle)  # Re-arm
+        return True
+
+    def close(self):
+        self.kernel32.FindCloseChangeNotification(self.handle)
+
+
+def _open_event_source(db_file):
+    """Return a filesystem event source for this platform, or None"""
+    try:
+        if platform.system() == 'Linux':
+            return _InotifySource(db_file)
+        if platform.system() == 'Windows':
+            return _WindowsChangeSource(db_file)
+    except (OSError, AttributeError) as e:
+        print(f"[WATCHER] Filesystem events unavailable ({e}), falling back to polling")
+    return None
+
+
+class DBChangeWatcher:
+    """
+    Calls on_change(version) whenever the database change counter moves,
+    including once for the first successful read.
+
+    Use run() to watch on the calling thread, or start() for a daemon thread.
+    Without filesystem events it polls on `poller`'s cadence.
+    """
+
+    def __init__(self, on_change, use_events=True, poller=None):
+        self.on_change = on_change
+        self.use_events = use_events
+        self.poller = poller or AdaptivePoller()
+        self.mode = None  # 'inotify', 'windows' or 'polling' once running
+        self.last_version = None
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        """Watch in a background daemon thread"""
+        self._thread = threading.Thread(target=self.run, name="db-watcher", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        """Stop watching (run() returns within one wait interval)"""
+        self._running = False
+        self.poller.wake()
+
+    def set_hidden(self, hidden):
+        """Poll less often while the window is hidden (polling mode only)"""
+        self.poller.set_hidden(hidden)
+
+    def run(self):
+        """Watch until stop() is called"""
+        self._running = True
+        source = _open_event_source(db.DB_FILE) if self.use_events else None
+        if isinstance(source, _InotifySource):
+            self.mode = 'inotify'
+        elif source is not None:
+            self.mode = 'windows'
+        else:
+            self.mode = 'polling'
+        print(f"[WATCHER] Watching {db.DB_FILE} ({self.mode})")
+
+        try:
+            while self._running:
+                changed = self._check()
+                if source is not None:
+                    source.wait(EVENT_SAFETY_INTERVAL)
+                else:
+                    # Tighten after activity, back off when idle (an error counts as idle)
+                    self.poller.done(changed is True, error=changed is None)
+                    self.poller.sleep()
+        finally:
+            if source is not None:
+                source.close()
+
+    def _check(self):
+        """
+        Call on_change if the database version moved. Returns True if it
+        did, False if not, and None if the version could not be read or the
+        callback failed.
+        """
+        try:
+            version = db.get_db_version()
+            if version is None:
+                return None
+            if version == self.last_version:
+                return False
+            self.last_version = version
+            self.on_change(version)
+            return True
+        except Exception as e:
+            print(f"[WATCHER] Error handling database change: {e}")
+            traceback.print_exc()
+            return None
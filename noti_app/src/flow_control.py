@@ -0,0 +1,208 @@
+"""
+Per-window flow control between message parsing and the StatusWriter.
+
+Chatty agents publish "ongoing" progress several times a second; each
+message would otherwise cost a database write and a UI update. The
+FlowController sits in front of the writer with the same submit() call:
+
+- A status identical to the one forwarded for the window less than
+  FLOW_COLLAPSE_WINDOW ago is dropped (a no-op). After that it goes through
+  again, so a window deleted in the UI comes back with the agent's next
+  update.
+- Other non-terminal statuses need FLOW_MIN_INTERVAL since the window's
+  last forwarded update and a token from its bucket (FLOW_RATE per second,
+  up to FLOW_BURST). Otherwise the newest one waits as the window's pending
+  update and is forwarded once allowed, so the final state always lands.
+- Terminal statuses (FLOW_TERMINAL_STATUSES) are forwarded at once and
+  discard the pending update they supersede.
+
+Dropped, superseded and deferred messages still reach the writer at once
+as history-only submits (update_window=False), so every message lands in
+the event history and advances the stream cursor; only the window row
+update is saved. A deferred update is forwarded later without its
+message id (record_event=False), as its event is already recorded.
+Flow state of windows idle for FLOW_IDLE_EVICT is forgotten.
+"""
+
+import threading
+import time
+
+FLOW_TERMINAL_STATUSES = ("done",)  # Never delayed (matches the UI's POPUP_STATUSES)
+FLOW_MIN_INTERVAL = 0.5  # Seconds between non-terminal updates of one window
+FLOW_RATE = 0.5          # Non-terminal updates per second a window earns...
+FLOW_BURST = 5           # ...and may save up
+FLOW_COLLAPSE_WINDOW = 5.0  # Seconds an identical status is treated as a repeat
+FLOW_IDLE_EVICT = 300     # Seconds without updates before a window's state is dropped
+FLOW_STATS_INTERVAL = 60  # Seconds between stats log lines (when suppressing)
+
+
+class _WindowFlow:
+    __slots__ = ("status", "sent_at", "tokens", "refilled_at", "pending")
+
+    def __init__(self, now, tokens):
+        self.status = None       # Last status forwarded
+        self.sent_at = None      # When it was forwarded
+        self.tokens = tokens
+        self.refilled_at = now
+        self.pending = None      # (status, submit kwargs) waiting for its turn
+
+
+class FlowController:
+    """Rate-limits and collapses statuses per window before they reach the writer"""
+
+    def __init__(self, writer, min_interval=FLOW_MIN_INTERVAL, rate=FLOW_RATE, burst=FLOW_BURST,
+                 terminal_statuses=FLOW_TERMINAL_STATUSES, collapse_window=FLOW_COLLAPSE_WINDOW,
+                 idle_evict=FLOW_IDLE_EVICT, clock=time.monotonic):
+        self.writer = writer
+        self.min_interval = min_interval
+        self.rate = rate
+        self.burst = burst
+        self.terminal_statuses = frozenset(s.lower() for s in terminal_statuses)
+        self.collapse_window = collapse_window
+        # Never forget state that still matters (a repeat, or an unfilled bucket)
+        self.idle_evict = max(idle_evict, collapse_window, burst / rate)
+        self.clock = clock
+        self._windows = {}
+        self._last_sweep = clock()
+        self._pending = {}  # window_name -> _WindowFlow, for windows with a pending update
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+        self.stats = {
+            "forwarded": 0,         # Updates passed to the writer
+            "collapsed": 0,         # Dropped as identical to the window's current status
+            "rate_limited": 0,      # Superseded while waiting for their turn
+            "deferred": 0,          # Held back, then forwarded late
+            "history_only": 0,      # Messages passed on for the event history only
+            "evicted": 0,           # Idle windows whose flow state was dropped
+        }
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="flow-control", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        """Forward every pending update now, then stop the writer behind us"""
+        with self._cond:
+            self._running = False
+            for window_name, flow in self._pending.items():
+                self._forward(window_name, flow, *flow.pending, self.clock())
+                flow.pending = None
+                self.stats["deferred"] += 1
+            self._pending.clear()
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout)
+        self.writer.stop(timeout)
+
+    def get_stats(self):
+        with self._cond:
+            stats = {f"flow_{key}": value for key, value in self.stats.items()}
+            stats["flow_suppressed"] = self.stats["collapsed"] + self.stats["rate_limited"]
+        return {**self.writer.get_stats(), **stats}
+
+    def backlogged(self):
+        return self.writer.backlogged()
+
+    def submit(self, window_name, status, **kwargs):
+        """Same call as StatusWriter.submit(); forwards, defers or drops the update"""
+        now = self.clock()
+        with self._cond:
+            self._evict_idle(now)
+            flow = self._windows.get(window_name)
+            if flow is None:
+                flow = self._windows[window_name] = _WindowFlow(now, self.burst)
+
+            if (status or "").lower() in self.terminal_statuses:
+                if flow.pending:
+                    self.stats["rate_limited"] += 1
+                    self._drop_pending(window_name, flow)
+                self._forward(window_name, flow, status, kwargs, now)
+                return
+
+            if status == flow.status and flow.sent_at is not None and now - flow.sent_at < self.collapse_window:
+                if flow.pending:
+                    self.stats["rate_limited"] += 1  # The window went back to where it was
+                    self._drop_pending(window_name, flow)
+                self.stats["collapsed"] += 1
+                self._record(window_name, status, kwargs)
+                return
+
+            if flow.pending:
+                self.stats["rate_limited"] += 1  # Superseded by this one
+                self._drop_pending(window_name, flow)
+            if self._due(flow, now) <= now:
+                self._forward(window_name, flow, status, kwargs, now)
+                return
+            self._record(window_name, status, kwargs)
+            flow.pending = (status, {"record_event": False})
+            self._pending[window_name] = flow
+            self._cond.notify()
+
+    # ====== INTERNALS (call with self._cond held) ======
+
+    def _record(self, window_name, status, kwargs):
+        """Pass a message the window row won't get (yet) on to the event history"""
+        self.writer.submit(window_name, status, update_window=False, **kwargs)
+        self.stats["history_only"] += 1
+
+    def _evict_idle(self, now):
+        """Forget windows with nothing pending and no update for idle_evict (swept now and then)"""
+        if now - self._last_sweep < self.idle_evict / 5:
+            return
+        self._last_sweep = now
+        cutoff = now - self.idle_evict
+        idle = [name for name, flow in self._windows.items()
+                if flow.pending is None and (flow.sent_at or flow.refilled_at) < cutoff]
+        for name in idle:
+            del self._windows[name]
+        self.stats["evicted"] += len(idle)
+
+    def _drop_pending(self, window_name, flow):
+        flow.pending = None
+        del self._pending[window_name]
+
+    def _refill(self, flow, now):
+        flow.tokens = min(self.burst, flow.tokens + (now - flow.refilled_at) * self.rate)
+        flow.refilled_at = now
+
+    def _due(self, flow, now):
+        """Earliest time the window may take another non-terminal update"""
+        self._refill(flow, now)
+        due = now if flow.sent_at is None else flow.sent_at + self.min_interval
+        if flow.tokens < 1:
+            due = max(due, now + (1 - flow.tokens) / self.rate)
+        return due
+
+    def _forward(self, window_name, flow, status, kwargs, now):
+        # Submitting under the lock keeps a late pending update from
+        # overtaking a newer one on its way to the writer
+        self._refill(flow, now)
+        flow.tokens = max(flow.tokens - 1, 0)
+        flow.status = status
+        flow.sent_at = now
+        self.writer.submit(window_name, status, **kwargs)
+        self.stats["forwarded"] += 1
+
+    def _run(self):
+        last_stats = self.clock()
+        with self._cond:
+            while self._running:
+                now = self.clock()
+                next_due = None
+                for window_name, flow in list(self._pending.items()):
+                    due = self._due(flow, now)
+                    if due <= now:
+                        self._forward(window_name, flow, *flow.pending, now)
+                        self._drop_pending(window_name, flow)
+                        self.stats["deferred"] += 1
+                    elif next_due is None or due < next_due:
+                        next_due = due
+
+                if now - last_stats >= FLOW_STATS_INTERVAL and (self.stats["collapsed"] or self.stats["rate_limited"]):
+                    last_stats = now
+                    print(f"[FLOW] Stats: {self.stats}")
+
+                self._cond.wait(None if next_due is None else next_due - now)
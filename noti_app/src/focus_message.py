@@ -0,0 +1,46 @@
+"""
+ntfy message text ↔ window names, shared by the listener and the UI.
+
+parse_focus_message() splits "window - status" text; FOCUS_NAME_PATTERN
+is what a window name must match to be handed to the focus: protocol.
+Kept free of other app imports so the listener, local ingest and the UI
+can all use it without importing one another.
+"""
+
+import re
+
+# Window names that may be handed to the focus: protocol. Names come from
+# ntfy and local agents, and end up in a PowerShell command line, so
+# anything with quotes or other shell syntax is refused.
+FOCUS_NAME_PATTERN = re.compile(r"[\w .:@#/+=-]{1,200}")
+
+
+def parse_focus_message(message_text):
+    """
+    Parse incoming messages into window_name and status
+
+    Expected formats:
+    - "claude:windows - task completed" → window_name: "claude:windows", status: "task completed"
+    - "app - status message" → window_name: "app", status: "status message"
+    - "app" → window_name: "app", status: None
+    """
+    if not message_text:
+        return None
+
+    message_text = message_text.strip()
+
+    # Parse different message formats
+    if " - " in message_text:
+        # Format: "window_name - status"
+        parts = message_text.split(" - ", 1)
+        window_name = parts[0]
+        status = parts[1] if len(parts) > 1 else None
+    else:
+        # Default: treat entire message as window_name
+        window_name = message_text
+        status = None
+
+    return {
+        "window_name": window_name,
+        "status": status
+    }
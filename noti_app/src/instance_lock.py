@@ -0,0 +1,208 @@
+"""
+Single-instance guard for the UI and the listener.
+
+The running instance holds an advisory lock (flock, or msvcrt.locking on
+Windows) on <LOCK_DIR>/noti_app-<name>-<user>.lock; the OS drops it when
+the process dies, however it dies, so a stale file never blocks a launch.
+Next to it, <name>.json records the holder's pid, start time and a
+loopback control port with a random token. A second launch finds the lock
+taken with one non-blocking call and sends the holder a command ("show",
+"stop") over that port instead of hunting for processes by command line.
+
+The record holds the control token, so it is created with mode 0600. That
+mode only means something on POSIX. On Windows the file gets the ACL of
+its directory instead. The default LOCK_DIR there is the user's own %TEMP%,
+which other users cannot read, so a NOTI_APP_LOCK_DIR override on Windows
+should also point into the user's profile.
+"""
+
+import getpass
+import json
+import os
+import secrets
+import socket
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+if os.name == "nt":
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    _kernel32.OpenProcess.restype = wintypes.HANDLE
+    _kernel32.GetProcessTimes.argtypes = (wintypes.HANDLE,) + (ctypes.POINTER(wintypes.FILETIME),) * 4
+    _kernel32.GetProcessTimes.restype = wintypes.BOOL
+    _kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    _kernel32.CloseHandle.restype = wintypes.BOOL
+else:
+    import fcntl
+
+LOCK_DIR = Path(os.environ.get("NOTI_APP_LOCK_DIR") or os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir())
+CONTROL_TIMEOUT = 1.0  # Seconds to wait for the holder to answer a command
+RECORD_WAIT = 0.5      # A holder that just took the lock may not have written its record yet
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+FILETIME_EPOCH = 11644473600  # Seconds from 1601-01-01 (FILETIME's epoch) to 1970-01-01
+
+
+def process_start_time(pid):
+    """When pid started (epoch seconds), or None where that can't be read (e.g. macOS)"""
+    if os.name == "nt":
+        return _windows_process_start_time(pid)
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            ticks = int(f.read().rsplit(b")", 1)[1].split()[19])  # Field 22, starttime
+        with open("/proc/stat", "rb") as f:
+            boot = next(int(line.split()[1]) for line in f if line.startswith(b"btime"))
+        return boot + ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, StopIteration):
+        return None
+
+
+def _windows_process_start_time(pid):
+    """Creation time of pid from GetProcessTimes, or None if it can't be opened"""
+    handle = _kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        return None  # No such process, or not ours to query
+    try:
+        created, exited, kernel, user = (wintypes.FILETIME() for _ in range(4))
+        if not _kernel32.GetProcessTimes(handle, ctypes.byref(created), ctypes.byref(exited),
+                                         ctypes.byref(kernel), ctypes.byref(user)):
+            return None
+        intervals = created.dwHighDateTime << 32 | created.dwLowDateTime  # 100 ns units
+        return intervals / 1e7 - FILETIME_EPOCH
+    finally:
+        _kernel32.CloseHandle(handle)
+
+
+class InstanceLock:
+    """The lock for one kind of instance ("app", "listener"), with its control port"""
+
+    def __init__(self, name, directory=LOCK_DIR):
+        user = "".join(c for c in getpass.getuser() if c.isalnum()) or "user"
+        base = Path(directory) / f"noti_app-{name}-{user}"
+        self.name = name
+        self.lock_path = base.with_suffix(".lock")
+        self.record_path = base.with_suffix(".json")
+        self.on_command = None  # Called with each command received while we hold the lock
+        self.token = None
+        self._fd = None
+        self._sock = None
+
+    # ====== HOLDER SIDE ======
+
+    def acquire(self, on_command=None):
+        """Take the lock without blocking; True if this process is now the instance"""
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.name == "nt":
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+
+        self._fd = fd
+        self.on_command = on_command or self.on_command
+        self.token = secrets.token_hex(16)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(4)
+        threading.Thread(target=self._serve, name=f"{self.name}-control", daemon=True).start()
+        self._write_record({
+            "pid": os.getpid(),
+            "started": process_start_time(os.getpid()) or time.time(),
+            "port": self._sock.getsockname()[1],
+            "token": self.token,
+        })
+        return True
+
+    def wait_acquire(self, timeout, on_command=None, interval=0.05):
+        """Retry acquire() until it succeeds or timeout seconds pass"""
+        deadline = time.monotonic() + timeout
+        while not self.acquire(on_command):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+        return True
+
+    def release(self):
+        if self._fd is None:
+            return
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        try:
+            self.record_path.unlink()
+        except OSError:
+            pass
+        if os.name == "nt":
+            try:
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+            except OSError:
+                pass
+        os.close(self._fd)  # Also drops a flock
+        self._fd = None
+
+    def _write_record(self, record):
+        tmp = self.record_path.with_suffix(".tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)  # The token is a secret
+        with os.fdopen(fd, "w") as f:
+            json.dump(record, f)
+        os.replace(tmp, self.record_path)
+
+    def _serve(self):
+        sock = self._sock
+        while True:
+            try:
+                conn, _ = sock.accept()
+            except OSError:
+                break  # Released
+            with conn:
+                try:
+                    conn.settimeout(CONTROL_TIMEOUT)
+                    token, _, command = conn.makefile("rb").readline().decode("ascii", "replace").strip().partition(" ")
+                    if not secrets.compare_digest(token.encode("utf-8"), self.token.encode("ascii")):
+                        conn.sendall(b"denied\n")
+                        continue
+                    handler = self.on_command
+                    reply = "ok" if handler else "busy"  # Still starting up
+                    if handler:
+                        handler(command)
+                    conn.sendall(reply.encode("ascii") + b"\n")
+                except Exception as e:
+                    print(f"[LOCK] Error handling {self.name} command: {e}")
+
+    # ====== CLIENT SIDE ======
+
+    def holder(self):
+        """Record of the live instance holding the lock, or None if there is none"""
+        deadline = time.monotonic() + RECORD_WAIT
+        while True:
+            try:
+                record = json.loads(self.record_path.read_text())
+                started = process_start_time(record["pid"])
+                if started is None or abs(started - record["started"]) < 1:
+                    return record
+                # The pid was reused: the record is from an instance that died
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.02)
+
+    def send(self, command):
+        """Send a command to the running instance; returns its reply, or None if unreachable"""
+        record = self.holder()
+        if record is None:
+            return None
+        try:
+            with socket.create_connection(("127.0.0.1", record["port"]), timeout=CONTROL_TIMEOUT) as conn:
+                conn.sendall(f"{record['token']} {command}\n".encode("ascii"))
+                return conn.makefile("rb").readline().decode("ascii", "replace").strip() or None
+        except OSError:
+            return None
@@ -0,0 +1,89 @@
+"""
+In-process listener mode.
+
+Runs the ntfy listener engine (ntfy_listener.run_listener) on a supervised
+daemon thread of the UI process instead of a second Python interpreter.
+The engine keeps its own reconnect backoff and keepalive watchdog, so
+connection drops behave exactly as in the subprocess; the supervisor only
+restarts the engine if it raises. Committed rows go straight to on_commit,
+with no push socket in between.
+
+The engine is imported the way the listener script imports its modules
+(src/ on sys.path), so it has its own db module instance and connections,
+just as it would in its own process.
+"""
+
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+
+LISTENER_RESTART_DELAY_MIN = 1    # Seconds before restarting a crashed engine
+LISTENER_RESTART_DELAY_MAX = 60   # Cap for repeated crashes
+LISTENER_STABLE_AFTER = 60        # An engine that ran this long resets the delay
+
+
+class ListenerThread:
+    """Supervises run_listener() on a daemon thread, restarting it when it crashes"""
+
+    def __init__(self, on_commit=None, **engine_kwargs):
+        self.on_commit = on_commit
+        self.engine_kwargs = engine_kwargs
+        self.restarts = 0
+        self._stop = threading.Event()
+        self._drained = threading.Event()  # Set by the engine once it has flushed after a stop
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._supervise, name="ntfy-listener", daemon=True)
+        self._thread.start()
+        print("[APP] Listener started in-process")
+        return self
+
+    def is_alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self, timeout=5):
+        """
+        Ask the engine to stop and wait up to timeout seconds for it to flush
+        queued statuses. A stream blocked in a read only notices the stop at
+        its next keepalive; the thread is a daemon, so it never holds up exit.
+        """
+        self._stop.set()
+        if self._thread is None:
+            return
+        flushed = self._drained.wait(timeout)
+        self._thread.join(0.5)
+        if not self._thread.is_alive():
+            print("[APP] Listener stopped")
+        elif flushed:
+            print("[APP] Listener flushed; its stream exits with the app")
+        else:
+            print("[APP] Listener still flushing; leaving it to exit with the app")
+
+    def _supervise(self):
+        sys.path.insert(0, str(Path(__file__).parent))
+        import ntfy_listener
+
+        delay = LISTENER_RESTART_DELAY_MIN
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self._drained.clear()
+            try:
+                ntfy_listener.run_listener(stop_event=self._stop, on_commit=self.on_commit,
+                                           drained=self._drained, **self.engine_kwargs)
+                if self._stop.is_set():
+                    break
+                print("[APP] Listener returned unexpectedly")
+            except Exception:
+                print("[APP] Listener crashed:")
+                traceback.print_exc()
+
+            if time.monotonic() - started >= LISTENER_STABLE_AFTER:
+                delay = LISTENER_RESTART_DELAY_MIN
+            self.restarts += 1
+            print(f"[APP] Restarting listener in {delay} seconds (restart #{self.restarts})")
+            self._stop.wait(delay)
+            delay = min(delay * 2, LISTENER_RESTART_DELAY_MAX)
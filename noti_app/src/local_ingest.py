@@ -0,0 +1,216 @@
+"""
+Local ingestion endpoint for the ntfy listener.
+
+Agents on the same machine can hand their status straight to the listener
+instead of going through ntfy.sh. Messages take the same path as ntfy ones
+(parse_focus_message, then the StatusWriter), so they land in the same
+database. Two transports are offered:
+
+- A Unix domain socket at LOCAL_INGEST_SOCKET, one message per line, with
+  one reply line per message giving the number accepted.
+- HTTP on 127.0.0.1:LOCAL_INGEST_PORT, one message per POST. Off unless
+  NOTI_APP_INGEST_HTTP=1. Every request must carry the token from
+  LOCAL_INGEST_TOKEN_FILE (or NOTI_APP_INGEST_TOKEN) and a JSON body;
+  requests with an Origin header are refused, so web pages can't post:
+      curl -H "X-Noti-Token: $(cat /tmp/noti_app_ingest.token)" \
+           -H "Content-Type: application/json" \
+           -d '"claude:win - task completed"' http://127.0.0.1:8767/
+
+A message is either "window - status" text or JSON: a string, an object
+with "message" (ntfy-style) or "window_name"/"status", or a list of those.
+"""
+
+import os
+import secrets
+import socketserver
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add src directory to path for imports when run as standalone script
+sys.path.insert(0, str(Path(__file__).parent))
+
+from focus_message import parse_focus_message
+from sse import json_loads
+
+_RUNTIME_DIR = Path(os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir())
+
+LOCAL_INGEST_HOST = "127.0.0.1"  # Loopback only
+LOCAL_INGEST_HTTP = os.environ.get("NOTI_APP_INGEST_HTTP") == "1"  # HTTP endpoint is opt-in
+LOCAL_INGEST_PORT = int(os.environ.get("NOTI_APP_INGEST_PORT", "8767"))  # 0 disables HTTP
+LOCAL_INGEST_TOKEN_HEADER = "X-Noti-Token"
+LOCAL_INGEST_TOKEN_FILE = os.environ.get("NOTI_APP_INGEST_TOKEN_FILE") or str(
+    _RUNTIME_DIR / "noti_app_ingest.token"
+)  # Written (owner-only) while the HTTP endpoint is up
+LOCAL_INGEST_SOCKET = os.environ.get("NOTI_APP_INGEST_SOCKET") or str(
+    _RUNTIME_DIR / "noti_app_ingest.sock"
+)  # Empty disables the Unix socket (never available on Windows)
+LOCAL_INGEST_MAX_BODY = 1024 * 1024  # Bytes accepted per request
+
+
+def parse_ingest_payload(body):
+    """Parse a request body (bytes) into a list of {"window_name", "status"} dicts"""
+    body = body.strip()
+    if not body:
+        return []
+    if body[:1] in (b"[", b"{", b'"'):
+        try:
+            payload = json_loads(body)
+        except ValueError:
+            payload = body.decode("utf-8", "replace")  # Not JSON after all; treat as text
+    else:
+        payload = body.decode("utf-8", "replace")
+
+    items = payload if isinstance(payload, list) else [payload]
+    parsed = []
+    for item in items:
+        if isinstance(item, str):
+            entry = parse_focus_message(item)
+        elif isinstance(item, dict) and item.get("window_name"):
+            entry = {"window_name": str(item["window_name"]), "status": item.get("status")}
+        elif isinstance(item, dict):
+            entry = parse_focus_message(item.get("message", ""))
+        else:
+            entry = None
+        if entry:
+            parsed.append(entry)
+    return parsed
+
+
+def ingest(body, writer):
+    """Queue every message in body on the writer; returns how many were accepted"""
+    parsed = parse_ingest_payload(body)
+    for entry in parsed:
+        writer.submit(entry["window_name"], entry.get("status"))
+    return len(parsed)
+
+
+class _HTTPIngestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so agents can reuse a connection
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+    def do_POST(self):
+        error = self._check_request()
+        if error:
+            # The body is left unread, so the connection can't be reused
+            self._reply(*error)
+            self.close_connection = True
+            return
+        length = int(self.headers["Content-Length"])
+        accepted = ingest(self.rfile.read(length), self.server.writer)
+        if accepted:
+            self._reply(202, b'{"accepted": %d}' % accepted)
+        else:
+            self._reply(400, b'{"error": "no message"}')
+
+    do_PUT = do_POST
+
+    def _check_request(self):
+        """(code, body) to refuse the request with, or None to accept it"""
+        if self.headers.get("Origin") is not None:
+            return 403, b'{"error": "cross-origin requests are not accepted"}'
+        token = (self.headers.get(LOCAL_INGEST_TOKEN_HEADER) or "").encode("utf-8", "replace")
+        if not secrets.compare_digest(token, self.server.token.encode("ascii")):
+            return 401, b'{"error": "missing or wrong token"}'
+        content_type = (self.headers.get("Content-Type") or "").split(";")[0].strip().lower()
+        if content_type != "application/json":
+            return 415, b'{"error": "body must be application/json"}'
+        try:
+            length = int(self.headers.get("Content-Length"))
+        except (TypeError, ValueError):
+            length = -1
+        if length < 0:
+            return 411, b'{"error": "Content-Length required"}'
+        if length > LOCAL_INGEST_MAX_BODY:
+            return 413, b'{"error": "body too large"}'
+        return None
+
+    def _reply(self, code, body):
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Per-request logging would swamp the listener log
+
+
+class _UnixIngestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            accepted = ingest(line, self.server.writer)
+            self.wfile.write(b"%d\n" % accepted)
+            self.wfile.flush()
+
+
+class LocalIngestServer:
+    """Serves the HTTP and Unix socket endpoints on background threads"""
+
+    def __init__(self, writer, port=LOCAL_INGEST_PORT if LOCAL_INGEST_HTTP else 0,
+                 socket_path=LOCAL_INGEST_SOCKET, token=None, token_file=LOCAL_INGEST_TOKEN_FILE):
+        self.writer = writer
+        self.port = port
+        self.socket_path = socket_path
+        # Same kind of shared secret as the push channel's; agents read it from token_file
+        self.token = token or os.environ.get("NOTI_APP_INGEST_TOKEN") or secrets.token_hex(16)
+        self.token_file = token_file
+        self._wrote_token = False
+        self.servers = []
+
+    def start(self):
+        """Start whichever endpoints can be bound; failures are logged, not raised"""
+        if self.port:
+            try:
+                server = ThreadingHTTPServer((LOCAL_INGEST_HOST, self.port), _HTTPIngestHandler)
+                server.daemon_threads = True
+                server.token = self.token
+                self._write_token()
+                self._serve(server)
+                self.port = server.server_address[1]
+                print(f"[INGEST] HTTP endpoint on http://{LOCAL_INGEST_HOST}:{self.port}/ (token in {self.token_file})")
+            except OSError as e:
+                print(f"[INGEST] Could not bind HTTP port {self.port}: {e}")
+
+        if self.socket_path and hasattr(socketserver, "ThreadingUnixStreamServer"):
+            try:
+                if os.path.exists(self.socket_path):
+                    os.unlink(self.socket_path)  # Left behind by a previous listener
+                server = socketserver.ThreadingUnixStreamServer(self.socket_path, _UnixIngestHandler)
+                server.daemon_threads = True
+                os.chmod(self.socket_path, 0o600)
+                self._serve(server)
+                print(f"[INGEST] Unix socket endpoint on {self.socket_path}")
+            except OSError as e:
+                print(f"[INGEST] Could not bind Unix socket {self.socket_path}: {e}")
+        return self
+
+    def _write_token(self):
+        """Leave the token where local agents (same user) can read it"""
+        if not self.token_file:
+            return
+        if os.path.exists(self.token_file):
+            os.unlink(self.token_file)  # Recreate rather than reuse someone else's file
+        fd = os.open(self.token_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(self.token)
+        self._wrote_token = True
+
+    def _serve(self, server):
+        server.writer = self.writer
+        threading.Thread(target=server.serve_forever, name="local-ingest", daemon=True).start()
+        self.servers.append(server)
+
+    def stop(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+        self.servers = []
+        for path in (self.socket_path, self.token_file if self._wrote_token else None):
+            if path and os.path.exists(path):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
@@ -5,10 +5,9 @@ import threading
 import time
 from datetime import datetime
 from pathlib import Path
-from PIL import Image, ImageDraw, ImageTk
+from PIL import Image, ImageDraw
 import atexit
 import os
-import signal
 import ctypes
 import pystray
 from pynput import keyboard
@@ -31,10 +30,18 @@ from .styles import (
     get_message_bar_style, get_status_color,
     apply_window_theme
 )
-from .ui_utils import create_rounded_rectangle_image
+from .ui_utils import get_rounded_rectangle_photo
+from .db_watcher import DBChangeWatcher
+from .virtual_list import VirtualBarList
+from .push_channel import PushServer
+from .listener_thread import ListenerThread
+from .instance_lock import InstanceLock
+from .render_scheduler import RenderScheduler
+from .window_store import WindowStore
+from .focus_message import FOCUS_NAME_PATTERN
 from .db import (
-    get_all_windows, update_window_status, delete_window,
-    get_db_hash, migrate_from_jsonl, DB_DIR
+    get_all_windows, update_window_status, update_window_statuses_many, delete_window,
+    get_windows_changed_since, get_windows_page, count_windows, migrate_from_jsonl, DB_DIR
 )
 
 # ==================== CONFIGURATION ====================
@@ -48,6 +55,20 @@ WINDOW_POSITION = "upper-monitor-center"
 POSITION_OFFSET_X = 500
 POSITION_OFFSET_Y = 500
 
+# Message bar height and row pitch (bar plus spacing), scaled for DPI
+BAR_HEIGHT = int(36 * DPI_SCALE)
+ROW_HEIGHT = BAR_HEIGHT + (int(BAR_SPACING * DPI_SCALE) // 2) * 2
+
+# Virtualized list: only create bars for the visible rows and page them in
+# from the database as the list scrolls. Keeps the UI constant-cost with
+# thousands of tracked windows.
+VIRTUALIZED_LIST = False
+
+# Run the ntfy listener on a thread of this process instead of a second
+# Python interpreter: faster cold start and one process's worth of memory.
+# The subprocess keeps listening while the UI is restarted; this mode doesn't.
+LISTENER_IN_PROCESS = os.environ.get("NOTI_APP_LISTENER_IN_PROCESS") == "1"
+
 # Hard-coded spawn position for upper monitor center (adjust empirically)
 SPAWN_X = 1500  # Adjust: increase to move right, decrease to move left
 SPAWN_Y = -1100 # Adjust: increase (less negative) to move down, decrease (more negative) to move up
@@ -77,35 +98,38 @@ POPUP_STATUSES = ["done"]  # Only used if POPUP_DISABLED = False
 DEBUG_MODE = False
 # ========================================================
 
+def claim_single_instance():
+    """
+    Take the app's instance lock before any UI is created. If another app
+    holds it, ask that one to show its window and return None; the caller
+    should exit. Otherwise returns the lock for NotificationApp.
+    """
+    lock = InstanceLock("app")
+    if lock.acquire():
+        return lock
+    holder = lock.holder()
+    reply = lock.send("show")
+    print(f"[APP] Already running (PID {holder['pid'] if holder else '?'}); asked it to show: {reply}")
+    return None
+
+
 def load_window_statuses():
-    """Load window statuses from SQLite database, sorted by status priority"""
+    """Load window statuses from SQLite database (WindowStore puts them in display order)"""
     windows = get_all_windows()
 
     if not windows:
         return get_default_windows()
 
-    # Sort by status priority: done (top) -> ongoing -> other/None -> addressed (last)
-    def status_priority(w):
-        status = (w.get('status') or '').lower()
-        if status == 'done':
-            return 0
-        elif status == 'ongoing':
-            return 1
-        elif status == 'addressed':
-            return 3
-        else:
-            return 2  # None or other statuses in the middle
-
-    return sorted(windows, key=status_priority)
+    return windows
 
 
 def save_window_statuses(windows):
     """Save window statuses to SQLite database (batch update)"""
     try:
-        for window in windows:
-            window_name = window.get('window_name')
-            if window_name:
-                update_window_status(window_name, window.get('status'))
+        # Fresh timestamps, matching a per-window update_window_status() call
+        rows = [{'window_name': w.get('window_name'), 'status': w.get('status')} for w in windows]
+        if update_window_statuses_many(rows) is None:
+            return False
         print(f"[DB] Saved {len(windows)} windows")
         return True
     except Exception as e:
@@ -123,10 +147,15 @@ def get_default_windows():
 
 
 class NotificationApp:
-    def __init__(self, root):
+    def __init__(self, root, instance_lock=None):
         self.root = root
+        self.instance_lock = instance_lock
+        if instance_lock:
+            instance_lock.on_command = self.on_instance_command
         self.root.title("Notifications")
         self.root.resizable(False, False)
+        # The close button shuts down cleanly in both listener modes
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
         # Migrate from JSONL to SQLite (one-time)
         if LEGACY_JSONL.exists():
@@ -143,10 +172,17 @@ class NotificationApp:
         # Track selected message index
         self.selected_index = 0
         self.message_bars = []
+        self.bars_by_name = {}  # window_name -> bar, for in-place updates
+        self._selected_bar = None  # Bar currently drawn as selected
+        self._navigation_pending = False  # A selection repaint is queued
+        self.navigation_stats = {"moves": 0, "repaints": 0}
 
 
-        # Start the ntfy listener subprocess
-        self.start_listener_subprocess()
+        # Start the ntfy listener (subprocess, or thread if LISTENER_IN_PROCESS)
+        if LISTENER_IN_PROCESS:
+            self.start_listener_thread()
+        else:
+            self.start_listener_subprocess()
 
         # Get screen dimensions
         screen_width = self.root.winfo_screenwidth()
@@ -186,6 +222,12 @@ class NotificationApp:
         self.root.withdraw()
         self.window_visible = False
 
+        # Bursts of changes between two frames become one repaint, and while
+        # hidden nothing is drawn until _show_window() (popup statuses excepted).
+        # The monitor thread supplies the render callback.
+        self.render_scheduler = RenderScheduler(self.root, should_wake=self._has_recent_popup_status)
+        self.render_scheduler.defer()
+
         # Create main frame with padding (scaled for DPI)
         window_padding_scaled = int(WINDOW_PADDING * DPI_SCALE)
         main_frame = tk.Frame(self.root, bg=BG_PRIMARY)
@@ -201,8 +243,9 @@ class NotificationApp:
             lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
         )
 
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        if not VIRTUALIZED_LIST:
+            canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+            canvas.configure(yscrollcommand=scrollbar.set)
 
         # Pack scrollbar and canvas
         canvas.pack(side="left", fill="both", expand=True)
@@ -223,17 +266,28 @@ class NotificationApp:
         self.messages_container = messages_container
         self.canvas = canvas
 
-        # Load windows from status file (or use defaults if file is empty)
-        # Windows are already sorted by timestamp (most recent first)
-        self.windows = load_window_statuses()
+        if VIRTUALIZED_LIST:
+            # Bars are pooled by the virtual list and rows paged in from the database
+            self.window_store = None
+            self.virtual_list = VirtualBarList(
+                canvas, scrollbar,
+                width=WINDOW_WIDTH - window_padding_scaled * 2,
+                row_height=ROW_HEIGHT,
+                create_bar=lambda: self._build_bar(canvas),
+                bind_bar=self._bind_bar,
+                fetch_rows=get_windows_page,
+                count_rows=count_windows
+            )
+            self.virtual_list.refresh()
+        else:
+            self.virtual_list = None
 
-        # Alias for backwards compatibility (windows are displayed as messages in UI)
-        self.messages = self.windows
+            # Windows in display order; the bars follow its change events
+            self.window_store = WindowStore()
+            self.window_store.subscribe(self._on_store_event)
 
-        # Create message bars
-        for i, window in enumerate(self.windows):
-            bar = self.create_message_bar(messages_container, i, window)
-            self.message_bars.append(bar)
+            # Load windows from the database (or use defaults if it is empty)
+            self.window_store.load(load_window_statuses())
 
         # Create footer with keyboard hints
         footer_frame = tk.Frame(main_frame, bg=BG_PRIMARY)
@@ -262,7 +316,7 @@ class NotificationApp:
         self.root.bind("<Key>", self.on_letter_pressed)  # Any letter key hides window
 
         # Track message count for detecting updates
-        self.last_message_count = len(self.messages)
+        self.last_message_count = self._window_count()
 
         # Start background monitor thread
         self.monitor_running = True
@@ -272,8 +326,10 @@ class NotificationApp:
         )
         monitor_thread.start()
 
-        # Start listener health check (every 30 seconds)
-        self.check_listener_health()
+        # Start listener health check (every 30 seconds); the in-process
+        # listener is restarted by its own supervisor
+        if not LISTENER_IN_PROCESS:
+            self.check_listener_health()
 
         # Set focus and highlight first message
         self.root.focus()
@@ -284,30 +340,29 @@ class NotificationApp:
 
     def create_message_bar(self, parent, index, message):
         """Create a keyboard-navigable message bar with Pillow rounded corners"""
-        message['index'] = index
-
         # Container with padding
-        container = tk.Frame(parent, bg=BG_PRIMARY, highlightthickness=0)
+        container, content_frame = self._build_bar(parent, message)
         container.pack(fill=tk.X, pady=int(BAR_SPACING * DPI_SCALE) // 2, padx=0)
 
+        # Status label on the RIGHT (secondary info) with color-coded status
+        self._set_bar_status(content_frame, message.get("status"))
+
+        self.bars_by_name[message.get("window_name")] = content_frame
+        return content_frame
+
+    def _build_bar(self, parent, message=None):
+        """Create the widgets of one bar without placing it. Returns (container, bar)."""
+        container = tk.Frame(parent, bg=BG_PRIMARY, highlightthickness=0)
+
         # Calculate bar dimensions to fit window
         # Note: WINDOW_WIDTH is already scaled for DPI
         bar_width = WINDOW_WIDTH - int(WINDOW_PADDING * DPI_SCALE) * 2
-        bar_height = int(36 * DPI_SCALE)
+        bar_height = BAR_HEIGHT
 
-        # Create rounded rectangle images for both states (normal and selected)
+        # Rounded rectangle images for both states (normal and selected), shared by all bars
         corner_radius_scaled = int(CORNER_RADIUS * DPI_SCALE)
-        bg_img_normal = create_rounded_rectangle_image(bar_width, bar_height, corner_radius_scaled, BG_SECONDARY)
-        bg_img_selected = create_rounded_rectangle_image(bar_width, bar_height, corner_radius_scaled, BG_SELECTED)
-
-        # Convert to PhotoImages
-        if not hasattr(self, 'photo_images'):
-            self.photo_images = []
-
-        photo_normal = ImageTk.PhotoImage(bg_img_normal)
-        photo_selected = ImageTk.PhotoImage(bg_img_selected)
-        self.photo_images.append(photo_normal)  # Keep references
-        self.photo_images.append(photo_selected)
+        photo_normal = get_rounded_rectangle_photo(bar_width, bar_height, corner_radius_scaled, BG_SECONDARY, DPI_SCALE)
+        photo_selected = get_rounded_rectangle_photo(bar_width, bar_height, corner_radius_scaled, BG_SELECTED, DPI_SCALE)
 
         # Create canvas with background image
         canvas = tk.Canvas(
@@ -330,7 +385,7 @@ class NotificationApp:
         # Window name label on the LEFT (main focus)
         window_label = tk.Label(
             content_frame,
-            text=message.get("window_name", "Unknown").upper(),  # Uppercase for emphasis
+            text=(message or {}).get("window_name", "Unknown").upper(),  # Uppercase for emphasis
             font=TITLE_FONT,
             bg=BG_SECONDARY,
             fg=TEXT_PRIMARY,
@@ -339,59 +394,198 @@ class NotificationApp:
         padding_x_scaled = int(BAR_PADDING_X * DPI_SCALE)
         window_label.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(padding_x_scaled, 0))
 
-        # Status label on the RIGHT (secondary info) with color-coded status
-        if message.get("status"):
-            status_color = get_status_color(message["status"], is_selected=False)
-            status_label = tk.Label(
-                content_frame,
-                text=message["status"],
-                font=CONTENT_FONT,
-                bg=BG_SECONDARY,
-                fg=status_color,  # Color-coded status
-                anchor="e"
-            )
-            status_label.pack(side=tk.RIGHT, padx=(0, padding_x_scaled))
-        else:
-            status_label = None
-
         # Store references for selection updates (using content_frame as the main bar reference)
+        content_frame._container = container
         content_frame._window_label = window_label
-        content_frame._status_label = status_label
+        content_frame._status_label = None
+        content_frame._status = None
         content_frame._message = message
         content_frame._canvas = canvas
         content_frame._bg_image_id = bg_image_id
         content_frame._photo_normal = photo_normal
         content_frame._photo_selected = photo_selected
+        content_frame._is_selected = False
+
+        return container, content_frame
+
+    def _bind_bar(self, bar, index, message, is_selected):
+        """Show a window on a pooled bar (virtualized list), touching only what differs"""
+        if bar._message is None or bar._message.get("window_name") != message.get("window_name"):
+            bar._window_label.configure(text=message.get("window_name", "Unknown").upper())
+        bar._message = message
+        if message.get("status") != bar._status:
+            self._set_bar_status(bar, message.get("status"))
+        if is_selected != bar._is_selected:
+            self._apply_bar_style(bar, is_selected)
+
+    def _set_bar_status(self, bar, status):
+        """Show status text on a bar, creating or removing its status label as needed"""
+        bar._status = status
+        if not status:
+            if bar._status_label:
+                bar._status_label.destroy()
+                bar._status_label = None
+            return
 
-        return content_frame
+        style = get_message_bar_style(is_selected=bar._is_selected)
+        status_color = get_status_color(status, is_selected=bar._is_selected)
+        if bar._status_label:
+            bar._status_label.configure(text=status, fg=status_color)
+            return
+
+        padding_x_scaled = int(BAR_PADDING_X * DPI_SCALE)
+        bar._status_label = tk.Label(
+            bar,
+            text=status,
+            font=CONTENT_FONT,
+            bg=style["bg"],
+            fg=status_color,  # Color-coded status
+            anchor="e"
+        )
+        bar._status_label.pack(side=tk.RIGHT, padx=(0, padding_x_scaled))
+
+    def reconcile_message_bars(self, windows):
+        """
+        Bring the message bars in line with windows, keyed by window_name.
+        Existing bars are updated in place and moved by repacking; bars are only
+        created or destroyed for windows that appeared or disappeared. A name
+        listed twice gets one bar, for its first entry.
+        """
+        unique = {}
+        for window in windows:
+            unique.setdefault(window.get("window_name"), window)
+        windows = list(unique.values())
+
+        # Destroy bars whose window is gone
+        wanted = unique.keys()
+        for name in [n for n in self.bars_by_name if n not in wanted]:
+            bar = self.bars_by_name.pop(name)
+            if bar is self._selected_bar:
+                self._selected_bar = None
+            bar._container.destroy()
+        packed = [bar for bar in self.message_bars if bar._message.get("window_name") in wanted]
+
+        # Update surviving bars in place, create bars for new windows (packed at the end)
+        new_bars = []
+        for i, window in enumerate(windows):
+            bar = self.bars_by_name.get(window.get("window_name"))
+            if bar is None:
+                bar = self.create_message_bar(self.messages_container, i, window)
+                packed.append(bar)
+            else:
+                if window.get("status") != bar._status:
+                    self._set_bar_status(bar, window.get("status"))
+                bar._message = window
+            new_bars.append(bar)
+
+        # Move only the bars that are out of place
+        for i, bar in enumerate(new_bars):
+            if packed[i] is not bar:
+                bar._container.pack_configure(before=packed[i]._container)
+                packed.remove(bar)
+                packed.insert(i, bar)
+
+        self.message_bars = new_bars
+
+    def _on_store_event(self, event, index, record, old_index):
+        """WindowStore observer: apply one change to the packed bars"""
+        if event == "reset":
+            self.reconcile_message_bars(self.window_store.rows())
+            return
+        if event == "remove":
+            bar = self.message_bars.pop(index)
+            self.bars_by_name.pop(record.window_name, None)
+            if bar is self._selected_bar:
+                self._selected_bar = None
+            bar._container.destroy()
+            return
+
+        message = record.as_dict()
+        if event == "insert":
+            bar = self.create_message_bar(self.messages_container, index, message)  # Packed at the end
+        else:
+            bar = self.message_bars[index if event == "update" else old_index]
+            if message.get("status") != bar._status:
+                self._set_bar_status(bar, message.get("status"))
+            bar._message = message
+            if event == "update":
+                return
+            self.message_bars.pop(old_index)
+        self.message_bars.insert(index, bar)
+
+        # Repack next to its new neighbour
+        if index + 1 < len(self.message_bars):
+            bar._container.pack_configure(before=self.message_bars[index + 1]._container)
+        elif event == "move":
+            bar._container.pack_configure(after=self.message_bars[index - 1]._container)
 
     # ====== SELECTION & INPUT ======
     # Functions for handling keyboard navigation and message selection
 
     def update_selection(self):
-        """Update visual state of all message bars based on selected_index"""
-        for i, bar in enumerate(self.message_bars):
-            is_selected = (i == self.selected_index)
-            style = get_message_bar_style(is_selected=is_selected)
-            bg = style["bg"]
-            # Update canvas background image (handles rounded corners)
-            if is_selected:
-                bar._canvas.itemconfig(bar._bg_image_id, image=bar._photo_selected)
-            else:
-                bar._canvas.itemconfig(bar._bg_image_id, image=bar._photo_normal)
-            # Update content frame and labels
-            bar.configure(bg=bg)
-            bar._window_label.configure(bg=bg, fg=style["fg_title"])
-            if bar._status_label:
-                # Use color-coded status when not selected, white when selected
-                status_text = bar._message.get("status", "")
-                status_color = get_status_color(status_text, is_selected=is_selected)
-                bar._status_label.configure(bg=bg, fg=status_color)
+        """
+        Update visual state of message bars based on selected_index.
+        Only the previously and newly selected bars are restyled.
+        """
+        if self.virtual_list:
+            self.virtual_list.set_selected(self.selected_index)
+            return
+        selected = None
+        if 0 <= self.selected_index < len(self.message_bars):
+            selected = self.message_bars[self.selected_index]
+        previous = self._selected_bar
+        if previous is not None and previous is not selected and previous._is_selected:
+            self._apply_bar_style(previous, False)
+        if selected is not None and not selected._is_selected:
+            self._apply_bar_style(selected, True)
+        self._selected_bar = selected
+
+    def _move_selection(self, step):
+        """
+        Move the selection by step. Repainting is left to _flush_navigation(),
+        so key-repeat events queued behind a slow frame cost one repaint.
+        """
+        self.selected_index = (self.selected_index + step) % self._window_count()
+        self.navigation_stats["moves"] += 1
+        if not self._navigation_pending:
+            self._navigation_pending = True
+            self.root.after_idle(self._flush_navigation)
+
+    def _flush_navigation(self):
+        """Draw the selection and scroll to it, once for all moves since the last flush"""
+        self._navigation_pending = False
+        if not self._window_count():
+            return
+        self.navigation_stats["repaints"] += 1
+        self.update_selection()
+        self._scroll_to_selected()
+
+    def _apply_bar_style(self, bar, is_selected):
+        """Restyle one bar for its selection state"""
+        bar._is_selected = is_selected
+        style = get_message_bar_style(is_selected=is_selected)
+        bg = style["bg"]
+        # Update canvas background image (handles rounded corners)
+        if is_selected:
+            bar._canvas.itemconfig(bar._bg_image_id, image=bar._photo_selected)
+        else:
+            bar._canvas.itemconfig(bar._bg_image_id, image=bar._photo_normal)
+        # Update content frame and labels
+        bar.configure(bg=bg)
+        bar._window_label.configure(bg=bg, fg=style["fg_title"])
+        if bar._status_label:
+            # Use color-coded status when not selected, white when selected
+            status_text = bar._message.get("status", "")
+            status_color = get_status_color(status_text, is_selected=is_selected)
+            bar._status_label.configure(bg=bg, fg=status_color)
 
     def trigger_selected_message(self):
         """Trigger action for the selected message"""
-        message = self.messages[self.selected_index]
-        if "window_name" in message:
+        message = self._window_at(self.selected_index)
+        if message and "window_name" in message:
+            if not FOCUS_NAME_PATTERN.fullmatch(message['window_name'] or ""):
+                print(f"[UI] Not focusing {message['window_name']!r}: unsafe characters in window name")
+                return
             try:
                 # Hide window to tray before triggering focus
                 self._hide_window()
@@ -406,27 +600,44 @@ class NotificationApp:
 
     def on_tab_pressed(self, event):
         """Handle Tab key - move to next message"""
-        self.selected_index = (self.selected_index + 1) % len(self.messages)
-        self.update_selection()
-        self._scroll_to_selected()
+        if not self._window_count():
+            return "break"
+        self._move_selection(1)
         return "break"
 
     def on_up_pressed(self, event):
         """Handle Up arrow - move to previous message"""
-        self.selected_index = (self.selected_index - 1) % len(self.messages)
-        self.update_selection()
-        self._scroll_to_selected()
+        if not self._window_count():
+            return "break"
+        self._move_selection(-1)
         return "break"
 
     def on_down_pressed(self, event):
         """Handle Down arrow - move to next message"""
-        self.selected_index = (self.selected_index + 1) % len(self.messages)
-        self.update_selection()
-        self._scroll_to_selected()
+        if not self._window_count():
+            return "break"
+        self._move_selection(1)
         return "break"
 
+    def _window_count(self):
+        """Number of windows in the list (virtualized or not)"""
+        if self.virtual_list:
+            return self.virtual_list.count
+        return len(self.window_store)
+
+    def _window_at(self, index):
+        """Window dict at a list position, or None"""
+        if self.virtual_list:
+            return self.virtual_list.row_at(index)
+        if 0 <= index < len(self.window_store):
+            return self.window_store[index].as_dict()
+        return None
+
     def _scroll_to_selected(self):
         """Scroll canvas to ensure selected item is visible"""
+        if self.virtual_list:
+            self.virtual_list.scroll_to(self.selected_index)
+            return
         if not self.message_bars or self.selected_index < 0:
             return
 
@@ -463,27 +674,31 @@ class NotificationApp:
     def on_page_up(self, event):
         """Handle Page Up key - scroll up"""
         self.canvas.yview_scroll(-5, "units")
+        if self.virtual_list:
+            self.virtual_list.render()  # Recycle bars for the new view now
         return "break"
 
     def on_page_down(self, event):
         """Handle Page Down key - scroll down"""
         self.canvas.yview_scroll(5, "units")
+        if self.virtual_list:
+            self.virtual_list.render()
         return "break"
 
     def on_home_pressed(self, event):
         """Handle Home key - jump to first window"""
-        if self.messages:
+        if self._window_count():
             self.selected_index = 0
-            self.update_selection()
             self.canvas.yview_moveto(0)  # Scroll to top
+            self.update_selection()
         return "break"
 
     def on_end_pressed(self, event):
         """Handle End key - jump to last window"""
-        if self.messages:
-            self.selected_index = len(self.messages) - 1
-            self.update_selection()
+        if self._window_count():
+            self.selected_index = self._window_count() - 1
             self.canvas.yview_moveto(1)  # Scroll to bottom
+            self.update_selection()
         return "break"
 
     def on_letter_pressed(self, event):
@@ -497,11 +712,11 @@ class NotificationApp:
 
     def on_delete_pressed(self, event):
         """Handle Delete key - delete selected window from database"""
-        if not self.windows or self.selected_index < 0:
+        window_to_delete = self._window_at(self.selected_index)
+        if not window_to_delete:
             return "break"
 
-        # Get the window to delete
-        window_to_delete = self.windows[self.selected_index]
+        # Name of the window to delete
         window_name = window_to_delete.get("window_name", "Unknown")
 
         print(f"[UI] Deleting window: {window_name}")
@@ -516,17 +731,17 @@ class NotificationApp:
 
     def on_addressed_pressed(self, event):
         """Handle 'a' key - mark selected window as addressed"""
-        if not self.windows or self.selected_index < 0:
+        window = self._window_at(self.selected_index)
+        if not window:
             return "break"
 
-        # Get the window to update
-        window = self.windows[self.selected_index]
+        # Name of the window to update
         window_name = window.get("window_name", "Unknown")
 
         print(f"[UI] Marking as addressed: {window_name}")
 
         # Update status in database (monitor thread will handle UI reload)
-        if update_window_status(window_name, "addressed"):
+        if update_window_status(window_name, "addressed") is not None:
             print(f"[UI] '{window_name}' marked as addressed.")
         else:
             print(f"[UI] Failed to update '{window_name}'")
@@ -537,7 +752,7 @@ class NotificationApp:
     # Functions for monitoring message queue and updating the UI with new messages
 
     def monitor_queue_for_updates(self):
-        """Background thread - continuously monitor database for ANY changes"""
+        """Background thread - wait for database change notifications and apply them"""
         print(f"[MONITOR] Starting database monitor")
         print(f"[MONITOR] DB_DIR = {DB_DIR}")
 
@@ -550,44 +765,125 @@ class NotificationApp:
             except: pass
 
         log_debug(f"Monitor started. DB_DIR={DB_DIR}")
-        check_count = 0
-        last_hash = None
 
-        while self.monitor_running:
-            try:
-                # Use database hash for change detection (atomic, reliable)
-                current_hash = get_db_hash()
-
-                check_count += 1
-                if check_count % 10 == 0:
-                    print(f"[MONITOR] Check #{check_count}: DB hash={current_hash[:8] if current_hash else 'None'}...")
-
-                # Detect change by comparing database hash
-                if current_hash and current_hash != last_hash and last_hash is not None:
-                    print(f"[MONITOR] DB changed (hash: {last_hash[:8]}... -> {current_hash[:8]}...)")
-                    log_debug(f"DB changed: {last_hash} -> {current_hash}")
-
-                    # Load windows from database
-                    current_windows = load_window_statuses()
-                    log_debug(f"Loaded {len(current_windows)} windows: {[w.get('window_name') for w in current_windows]}")
-
-                    # Schedule full UI reload on main thread
-                    self.root.after(0, self.reload_all_windows, current_windows)
-                    log_debug("Scheduled reload_all_windows")
-
-                    # Update last hash
-                    last_hash = current_hash
-                elif last_hash is None:
-                    # First time - just record hash, don't reload
-                    last_hash = current_hash
-
-                # Sleep before next check
-                time.sleep(0.5)
-            except Exception as e:
-                print(f"[MONITOR] Error monitoring database: {e}")
-                import traceback
-                traceback.print_exc()
-                time.sleep(1)
+        # Local copy of the windows table, kept current from version-cursor deltas
+        # and pushes from the listener (whichever reports a change first)
+        window_rows = {}
+        cursor = 0
+        seeded = False
+        state_lock = threading.Lock()
+
+        # What the next render has to apply besides the changed rows
+        pending_deleted = set()  # Windows deleted since the last render
+        pending_full = False     # The delta was a full read; reload everything
+        showing_defaults = False  # The store holds the sample windows, not the database's
+
+        def apply_rows(rows, deleted=(), full=False, newer_only=False):
+            """Merge rows into window_rows; returns the rows the UI hasn't shown yet"""
+            nonlocal window_rows, pending_full
+            if full:
+                window_rows = {}
+                pending_full = True
+            for window_name in deleted:
+                window_rows.pop(window_name, None)
+                pending_deleted.add(window_name)
+            fresh = []
+            detected_at = datetime.now().isoformat()
+            for row in rows:
+                known = window_rows.get(row['window_name'])
+                if newer_only and known and (row.get('timestamp') or '') < (known.get('timestamp') or ''):
+                    continue  # A late push; the database already gave us something newer
+                if known is None or (known.get('status'), known.get('timestamp')) != (row.get('status'), row.get('timestamp')):
+                    if seeded and not full:
+                        # A change made since the last check: popups judge it by when
+                        # it was seen, as the polling fallback may see it seconds late
+                        row['detected_at'] = detected_at
+                    fresh.append(row)
+                window_rows[row['window_name']] = row
+                pending_deleted.discard(row['window_name'])  # Deleted and then recreated
+            return fresh
+
+        def render(changed_rows):
+            """Render scheduler callback (main thread), at most once per frame"""
+            nonlocal pending_deleted, pending_full, showing_defaults
+            if self.virtual_list:
+                # Re-read the visible page only; changed rows drive the popup check
+                with state_lock:
+                    pending_deleted, pending_full = set(), False
+                self.refresh_virtual_list(changed_rows)
+                return
+
+            with state_lock:
+                deleted, pending_deleted = pending_deleted, set()
+                full = pending_full or showing_defaults or not window_rows
+                pending_full = False
+                if full:
+                    rows = list(window_rows.values())
+                else:
+                    # Latest copy of each changed window still present
+                    rows = [window_rows[r['window_name']] for r in changed_rows if r['window_name'] in window_rows]
+
+            if full:
+                showing_defaults = not rows
+                log_debug(f"Loaded {len(rows)} windows: {[w.get('window_name') for w in rows]}")
+                self.reload_all_windows(rows or get_default_windows())
+            else:
+                log_debug(f"Applying {len(rows)} changed, {len(deleted)} deleted windows")
+                self.apply_window_changes(rows, deleted)
+
+        self.render_scheduler.render = render
+
+        def schedule_ui_update(changed_rows):
+            self.render_scheduler.request(changed_rows)
+            log_debug("Requested repaint")
+
+        def on_db_changed(version):
+            """Called by the watcher (this thread) when the DB change counter moves"""
+            nonlocal cursor, seeded
+
+            if self.virtual_list and not seeded:
+                # The virtualized list pages rows itself; only the cursor is needed
+                cursor, seeded = version, True
+                return
+
+            # Fetch only rows changed since the last cursor
+            delta = get_windows_changed_since(cursor)
+            if delta is None:
+                return
+            with state_lock:
+                fresh = apply_rows(delta['windows'], delta['deleted'], delta['full'])
+                last_cursor, cursor = cursor, delta['cursor']
+
+                # First time just records the state, doesn't reload
+                if not seeded:
+                    seeded = True
+                    return
+                if not (delta['full'] or fresh or delta['deleted']):
+                    return  # Already applied (by the previous delta or a push)
+
+                print(f"[MONITOR] DB changed (version: {last_cursor} -> {cursor}, "
+                      f"{len(fresh)} upserted, {len(delta['deleted'])} deleted)")
+                log_debug(f"DB changed: {last_cursor} -> {cursor}")
+                schedule_ui_update(fresh)
+
+        def on_push(windows):
+            """Called by the push channel reader with rows the listener just committed"""
+            with state_lock:
+                if not seeded:
+                    return  # The initial read will include them
+                fresh = apply_rows(windows, newer_only=True)
+                if not fresh:
+                    return
+                print(f"[MONITOR] Pushed by listener: {len(fresh)} upserted")
+                schedule_ui_update(fresh)
+
+        self.push_handler = on_push
+
+        # Blocks until on_closing() stops the watcher
+        self.db_watcher = DBChangeWatcher(on_db_changed)
+        self.db_watcher.set_hidden(not self.window_visible)
+        if self.monitor_running:
+            self.db_watcher.run()
 
     def reload_all_windows(self, new_windows):
         """Reload the entire UI with new window list (called from main thread via root.after)"""
@@ -597,57 +893,89 @@ class NotificationApp:
         print(f"[UI] Reloading all windows: {len(new_windows)} total")
 
         # Check if any windows have a "done" status within the last 1 second
-        should_popup = False
+        should_popup = self._has_recent_popup_status(new_windows)
 
-        # Skip popup logic if disabled
-        if not POPUP_DISABLED:
-            current_time = datetime.now()
-            for window in new_windows:
-                window_name = window.get("window_name")
-                window_status = window.get("status")
-                window_timestamp = window.get("timestamp")
-
-                if window_status in POPUP_STATUSES:
-                    # Parse timestamp and check if it's recent (within 1 second)
-                    try:
-                        window_time = datetime.fromisoformat(window_timestamp)
-                        time_diff = (current_time - window_time).total_seconds()
-
-                        if time_diff <= 1.0:  # Within last 1 second
-                            should_popup = True
-                            print(f"[UI] RECENT done: '{window_name}' ({time_diff:.2f}s ago) - triggers popup")
-                            break
-                        else:
-                            print(f"[UI] OLD done: '{window_name}' ({time_diff:.2f}s ago) - no popup")
-                    except:
-                        pass  # Skip if timestamp parsing fails
-
-        # Update our windows and messages lists
-        # new_windows are already sorted by timestamp (most recent first) from load_window_statuses()
-        self.windows = new_windows
-        self.messages = self.windows  # Alias for compatibility
-
-        # Clear all existing message bars from the UI
-        for widget in self.messages_container.winfo_children():
-            widget.destroy()
-
-        # Clear the message bars list
-        self.message_bars = []
+        # Replace the store's contents; its reset event reconciles the bars
+        # (keyed by window_name)
+        self.window_store.load(new_windows)
+        self._windows_changed()
 
-        # Recreate all message bars
-        for i, window in enumerate(self.windows):
-            bar = self.create_message_bar(self.messages_container, i, window)
-            self.message_bars.append(bar)
+        # Popup window if needed
+        self._popup_if(should_popup)
 
+        print(f"[UI] Reloaded {len(self.window_store)} windows, {len(self.message_bars)} bars")
+
+    def apply_window_changes(self, changed_windows, deleted=()):
+        """Apply changed and deleted windows to the store (main thread); only their bars move"""
+        if not hasattr(self, 'messages_container'):
+            return
+
+        should_popup = self._has_recent_popup_status(changed_windows)
+
+        events = self.window_store.apply(changed_windows, deleted)
+        self._windows_changed()
+
+        self._popup_if(should_popup)
+
+        print(f"[UI] Applied {len(changed_windows)} changed, {len(deleted)} deleted windows "
+              f"({events} bar changes), {len(self.message_bars)} bars")
+
+    def _windows_changed(self):
+        """Keep the selection in range and redraw after the window list changed"""
         # Update selection to first item if needed
-        if self.selected_index >= len(self.windows):
-            self.selected_index = 0 if self.windows else -1
+        if self.selected_index >= len(self.window_store):
+            self.selected_index = 0 if len(self.window_store) else -1
         self.update_selection()
 
         # Force UI redraw
         self.messages_container.update_idletasks()
 
-        # Popup window if needed
+    def refresh_virtual_list(self, changed_windows):
+        """Re-read the visible rows of the virtualized list (called from main thread via root.after)"""
+        should_popup = self._has_recent_popup_status(changed_windows)
+
+        self.virtual_list.refresh()
+
+        # Update selection to first item if needed
+        if self.selected_index >= self.virtual_list.count:
+            self.selected_index = 0 if self.virtual_list.count else -1
+        self.update_selection()
+
+        self._popup_if(should_popup)
+
+    def _has_recent_popup_status(self, windows):
+        """
+        True if any window got a POPUP_STATUSES status within the last second.
+        Changes the monitor saw arrive are timed from when it saw them
+        ("detected_at"), others (a full read) from their own timestamp.
+        """
+        # Skip popup logic if disabled
+        if POPUP_DISABLED:
+            return False
+
+        current_time = datetime.now()
+        for window in windows:
+            window_name = window.get("window_name")
+            window_status = window.get("status")
+            window_timestamp = window.get("detected_at") or window.get("timestamp")
+
+            if window_status in POPUP_STATUSES:
+                # Parse timestamp and check if it's recent (within 1 second)
+                try:
+                    window_time = datetime.fromisoformat(window_timestamp)
+                    time_diff = (current_time - window_time).total_seconds()
+
+                    if time_diff <= 1.0:  # Within last 1 second
+                        print(f"[UI] RECENT done: '{window_name}' ({time_diff:.2f}s ago) - triggers popup")
+                        return True
+                    else:
+                        print(f"[UI] OLD done: '{window_name}' ({time_diff:.2f}s ago) - no popup")
+                except:
+                    pass  # Skip if timestamp parsing fails
+        return False
+
+    def _popup_if(self, should_popup):
+        """Show or raise the window if a popup was triggered"""
         if should_popup:
             if not self.window_visible:
                 print(f"[UI] Window is hidden - showing from tray")
@@ -658,38 +986,23 @@ class NotificationApp:
         else:
             print(f"[UI] No popup - no window statuses in POPUP_STATUSES list")
 
-        print(f"[UI] Reloaded {len(self.windows)} windows, {len(self.message_bars)} bars created")
-
     def add_new_messages(self, new_messages):
         """Add new messages to the UI (called from main thread via root.after)"""
         # Get the messages container (need to store reference during init)
         if not hasattr(self, 'messages_container'):
             return
 
-        # Add new messages to the beginning of our messages list
-        for msg in reversed(new_messages):
-            self.messages.insert(0, msg)
-
-        # Clear all existing message bars from the UI
-        for widget in self.messages_container.winfo_children():
-            widget.destroy()
-
-        # Clear the message bars list
-        self.message_bars = []
-
-        # Recreate all message bars in the correct order
-        for i, msg in enumerate(self.messages):
-            bar = self.create_message_bar(self.messages_container, i, msg)
-            self.message_bars.append(bar)
+        # Upsert into the store; its events create or move the affected bars
+        self.window_store.apply(new_messages)
 
         # Update selection to first item if needed
-        if self.selected_index >= len(self.messages):
-            self.selected_index = 0 if self.messages else -1
+        if self.selected_index >= len(self.window_store):
+            self.selected_index = 0 if len(self.window_store) else -1
         self.update_selection()
 
         # Debug output
-        print(f"[UI] Added {len(new_messages)} new messages. Total messages: {len(self.messages)}")
-        print(f"[UI] Recreated {len(self.message_bars)} message bars")
+        print(f"[UI] Added {len(new_messages)} new messages. Total messages: {len(self.window_store)}")
+        print(f"[UI] Showing {len(self.message_bars)} message bars")
 
         # Force UI redraw - this is critical for dynamic widgets
         self.messages_container.update_idletasks()
@@ -720,7 +1033,7 @@ class NotificationApp:
         self.update_selection()
 
         # Print to console for debugging
-        print(f"[UI] Added {len(new_messages)} new message(s). Total: {len(self.messages)}")
+        print(f"[UI] Added {len(new_messages)} new message(s). Total: {len(self.window_store)}")
 
     # ====== UI/WINDOW MANAGEMENT ======
     # Functions for system tray, hotkey setup, window visibility, and popups
@@ -762,6 +1075,12 @@ class NotificationApp:
 
     def _show_window(self):
         """Internal method to show window (called from main thread)"""
+        # Draw everything that changed while hidden, in one render
+        self.window_visible = True
+        self.render_scheduler.resume()
+        if hasattr(self, 'db_watcher'):
+            self.db_watcher.set_hidden(False)
+
         # Pre-render all content before showing to avoid white flash
         if hasattr(self, 'messages_container'):
             self.messages_container.update_idletasks()
@@ -785,6 +1104,9 @@ class NotificationApp:
         """Internal method to hide window (called from main thread)"""
         self.root.withdraw()
         self.window_visible = False
+        self.render_scheduler.defer()  # Only the model is kept current until shown again
+        if hasattr(self, 'db_watcher'):
+            self.db_watcher.set_hidden(True)
         print("[APP] Window hidden to tray")
 
     def quit_app(self, icon=None, item=None):
@@ -827,19 +1149,21 @@ class NotificationApp:
     def start_listener_subprocess(self):
         """Start the ntfy listener as a subprocess on same platform as app"""
         try:
+            # Channel for the listener to push committed rows to us directly
+            if getattr(self, 'push_server', None) is None:
+                try:
+                    self.push_server = PushServer(self.on_listener_push)
+                    print(f"[APP] Push channel listening on port {self.push_server.port}")
+                except OSError as e:
+                    print(f"[APP] Could not open push channel: {e}")
+                    self.push_server = None
+            listener_env = dict(os.environ, **(self.push_server.env() if self.push_server else {}))
+
             # Get the path to the listener script
             listener_path = Path(__file__).parent / "ntfy_listener.py"
 
-            # Kill any existing listener processes first
-            try:
-                if platform.system() == 'Windows':
-                    subprocess.run(["taskkill", "/F", "/IM", "python.exe", "/FI", "WINDOWTITLE eq ntfy_listener*"],
-                                 capture_output=True, text=True)
-                else:
-                    subprocess.run(["pkill", "-f", "ntfy_listener.py"],
-                                 capture_output=True, text=True)
-            except:
-                pass
+            # A listener that is already running hands over to the new one
+            # through its instance lock (see claim_listener_lock)
 
             # Start the listener subprocess
             print(f"[APP] sys.executable = {sys.executable}")
@@ -862,6 +1186,7 @@ class NotificationApp:
                     [sys.executable, str(listener_path)],
                     stdout=log_file if log_file != subprocess.DEVNULL else subprocess.DEVNULL,
                     stderr=subprocess.STDOUT if log_file != subprocess.DEVNULL else subprocess.DEVNULL,
+                    env=listener_env,
                     creationflags=subprocess.CREATE_NO_WINDOW
                 )
             else:
@@ -869,7 +1194,8 @@ class NotificationApp:
                 self.listener_process = subprocess.Popen(
                     ["python3", str(listener_path)],
                     stdout=log_file if log_file != subprocess.DEVNULL else subprocess.DEVNULL,
-                    stderr=subprocess.STDOUT if log_file != subprocess.DEVNULL else subprocess.DEVNULL
+                    stderr=subprocess.STDOUT if log_file != subprocess.DEVNULL else subprocess.DEVNULL,
+                    env=listener_env
                 )
 
             print(f"[APP] Listener started with PID: {self.listener_process.pid}")
@@ -877,14 +1203,21 @@ class NotificationApp:
             # Register cleanup on exit
             atexit.register(self.stop_listener_subprocess)
 
-            # Also handle window close event
-            self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
-
         except Exception as e:
             print(f"[APP] Error starting listener: {e}")
             import traceback
             traceback.print_exc()
 
+    def start_listener_thread(self):
+        """Run the ntfy listener on a supervised thread of this process"""
+        self.listener_thread = ListenerThread(on_commit=self.on_listener_push).start()
+
+    def on_listener_push(self, windows):
+        """Push channel / in-process writer callback: hand the rows to the monitor"""
+        handler = getattr(self, 'push_handler', None)
+        if handler:
+            handler(windows)
+
     def check_listener_health(self):
         """Check if listener process is alive and restart if dead"""
         try:
@@ -926,35 +1259,11 @@ class NotificationApp:
             except Exception as e:
                 print(f"[APP] Error stopping listener: {e}")
 
-    def kill_existing_processes(self):
-        """Kill any existing notification app processes"""
-        current_pid = os.getpid()
-        print(f"[APP] Checking for existing app instances (current PID: {current_pid})")
-
-        try:
-            # Kill other Python processes running notification_app or main.py
-            if platform.system() == 'Windows' or 'win' in sys.platform:
-                # Windows - use taskkill
-                subprocess.run(["taskkill", "/F", "/IM", "notification_app.py"],
-                             capture_output=True, text=True)
-                subprocess.run(["taskkill", "/F", "/IM", "main.py"],
-                             capture_output=True, text=True)
-            else:
-                # Linux/WSL - use pgrep and kill
-                result = subprocess.run(["pgrep", "-f", "notification_app.py"],
-                                      capture_output=True, text=True)
-                if result.returncode == 0:
-                    pids = result.stdout.strip().split('\n')
-                    for pid_str in pids:
-                        pid = int(pid_str.strip())
-                        if pid != current_pid:
-                            try:
-                                os.kill(pid, signal.SIGTERM)
-                                print(f"[APP] Killed existing app PID: {pid}")
-                            except:
-                                pass
-        except Exception as e:
-            print(f"[APP] Could not check for existing apps: {e}")
+    def on_instance_command(self, command):
+        """Instance lock callback (control thread): a second launch wants us shown"""
+        if command == "show":
+            print("[APP] Another launch asked us to show the window")
+            self.show_window()
 
     def popup_window(self):
         """Bring window to front and focus it"""
@@ -981,7 +1290,15 @@ class NotificationApp:
     def on_closing(self):
         """Handle window close event"""
         self.monitor_running = False  # Stop the monitoring thread
+        if hasattr(self, 'db_watcher'):
+            self.db_watcher.stop()
         self.stop_listener_subprocess()  # Stop the listener
+        if getattr(self, 'listener_thread', None):
+            self.listener_thread.stop()
+        if getattr(self, 'push_server', None):
+            self.push_server.close()
+        if self.instance_lock:
+            self.instance_lock.release()
         if hasattr(self, 'tray_icon'):
             self.tray_icon.stop()  # Stop the tray icon
         if hasattr(self, 'hotkey_listener'):
@@ -990,6 +1307,9 @@ class NotificationApp:
 
 
 if __name__ == "__main__":
+    instance_lock = claim_single_instance()
+    if instance_lock is None:
+        sys.exit(0)
     root = tk.Tk()
-    app = NotificationApp(root)
+    app = NotificationApp(root, instance_lock)
     root.mainloop()
@@ -12,8 +12,11 @@ sys.stderr.reconfigure(line_buffering=True) if hasattr(sys.stderr, 'reconfigure'
 import requests
 import json
 import os
-import signal
-import subprocess
+import threading
+import queue
+import time
+import random
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 import platform
@@ -26,47 +29,414 @@ NTFY_SERVER = "https://ntfy.sh"
 TOPIC_NAME = "tom_noti_app_abc123xyz"
 TOPIC_URL = f"{NTFY_SERVER}/{TOPIC_NAME}"
 
+# Writer batching: the reader hands parsed statuses to a bounded queue, and a
+# writer thread commits them in batches so a locked database never stalls the
+# SSE socket. A batch closes after WRITE_BATCH_MAX messages or once the queue
+# has been idle for WRITE_BATCH_LINGER seconds. A lone message (nothing else
+# queued behind it) is written at once rather than waiting out the linger.
+WRITE_QUEUE_SIZE = 10000
+WRITE_QUEUE_RESERVE = 100  # Free slots below which backlogged() says submit() may block
+WRITE_BATCH_MAX = 500
+WRITE_BATCH_LINGER = 0.005
+WRITE_RETRIES = 3
+WRITER_STATS_INTERVAL = 60  # Seconds between stats log lines (when active)
+
+# Resuming: the id and time of the last committed message are stored in
+# listener_state with each batch, and reconnects ask ntfy for messages after
+# that id (`since=<id>`). Anything replayed anyway (ntfy returns its whole
+# cache for an id it no longer knows) is dropped by id, first against the
+# RECENT_IDS_MAX ids read by this process, then against the events table.
+CURSOR_KEY = f"ntfy_cursor:{TOPIC_NAME}"
+RECENT_IDS_MAX = 1000
+
+# Dead connections: ntfy sends a keepalive event every KEEPALIVE_INTERVAL
+# seconds, so a stream with no bytes for KEEPALIVE_MISSED intervals is
+# dropped and reconnected. The first retry is quick; later ones back off
+# exponentially from RECONNECT_DELAY_MIN, with jitter so that many clients
+# (or topics) cut off together do not reconnect in lockstep. The backoff only
+# starts over once a connection has proved healthy: it delivered a message or
+# stayed up for RECONNECT_RESET_AFTER seconds. A server that accepts and then
+# drops every connection is retried at the backed-off pace, not every 0.5 s.
+KEEPALIVE_INTERVAL = 45  # ntfy's default keepalive-interval
+KEEPALIVE_MISSED = 2
+CONNECT_TIMEOUT = 15  # Seconds to establish a connection
+RECONNECT_FIRST_DELAY = 0.5  # Seconds before the first reconnect attempt
+RECONNECT_DELAY_MIN = 5  # Seconds before the second attempt, doubling after that
+RECONNECT_DELAY_MAX = 60  # Max seconds between retries
+RECONNECT_JITTER = 0.5  # Delays are randomly shortened by up to this fraction
+RECONNECT_RESET_AFTER = 30  # Seconds a connection must stay up to reset the backoff
+
+# Several topics, as "topic[=namespace],...": runs the asyncio engine in
+# async_listener.py instead of the single TOPIC_NAME stream
+LISTENER_TOPICS = os.environ.get("NOTI_APP_TOPICS", "")
+LISTENER_MULTIPLEX = os.environ.get("NOTI_APP_TOPICS_MULTIPLEX") == "1"  # One stream for all topics
+
+# Rate-limit and collapse chatty per-window updates before they are written
+# (see flow_control.py for the limits); NOTI_APP_FLOW_CONTROL=0 turns it off
+FLOW_CONTROL = os.environ.get("NOTI_APP_FLOW_CONTROL", "1") != "0"
+
+# Taking over from a listener that is already running
+LISTENER_HANDOFF_TIMEOUT = 5  # Seconds to wait for the old listener to let go of its lock
+LISTENER_STOP_GRACE = 2  # Seconds a stopped listener may spend flushing before it exits
+
 # Import database module
-from db import update_window_status, DB_DIR as STATUS_DIR
+from db import (
+    update_window_statuses_many, get_applied_message_ids, get_listener_state,
+    start_event_compactor, DB_DIR as STATUS_DIR
+)
+from sse import SSEParser, json_loads
+from push_channel import PushClient, PUSH_PORT_ENV, PUSH_TOKEN_ENV
+from instance_lock import InstanceLock
+from flow_control import FlowController
+from focus_message import parse_focus_message
+
+
+def load_cursor(key=CURSOR_KEY):
+    """Last committed stream position as {"id", "time"}, or None if there is none"""
+    value = get_listener_state(key)
+    if not value:
+        return None
+    try:
+        cursor = json.loads(value)
+    except json.JSONDecodeError:
+        return None
+    return cursor if isinstance(cursor, dict) and cursor.get("id") else None
 
 
-def parse_focus_message(message_text):
-    """
-    Parse incoming messages into window_name and status
+class KeepaliveWatchdog:
+    """Tracks time since a stream's last byte against the missed-keepalive limit"""
+
+    def __init__(self, interval=None, missed=None, clock=time.monotonic):
+        self.interval = interval or KEEPALIVE_INTERVAL
+        self.missed = missed or KEEPALIVE_MISSED
+        self.limit = self.interval * self.missed  # Seconds of silence before the stream is dead
+        self.clock = clock
+        self.last_byte = clock()
+
+    def feed(self):
+        """Record that bytes just arrived"""
+        self.last_byte = self.clock()
+
+    def idle(self):
+        """Seconds since the last byte"""
+        return self.clock() - self.last_byte
 
-    Expected formats:
-    - "claude:windows - task completed" → window_name: "claude:windows", status: "task completed"
-    - "app - status message" → window_name: "app", status: "status message"
-    - "app" → window_name: "app", status: None
+    def missed_count(self):
+        """Keepalive intervals that have passed without a byte"""
+        return int(self.idle() // self.interval)
+
+    def remaining(self):
+        """Seconds left before the stream counts as dead (0 once it has)"""
+        return max(0.0, self.limit - self.idle())
+
+    def expired(self):
+        return self.idle() >= self.limit
+
+
+class ReconnectBackoff:
+    """
+    Reconnect delays: a fast first retry, then jittered exponential backoff.
+    Call connected() when a connection opens and reset() when it delivers a
+    message; a connection that lasted reset_after seconds also resets it.
     """
-    if not message_text:
-        return None
 
-    message_text = message_text.strip()
+    def __init__(self, first=None, minimum=None, maximum=None, jitter=None, reset_after=None,
+                 clock=time.monotonic):
+        self.first = RECONNECT_FIRST_DELAY if first is None else first
+        self.minimum = RECONNECT_DELAY_MIN if minimum is None else minimum
+        self.maximum = RECONNECT_DELAY_MAX if maximum is None else maximum
+        self.jitter = RECONNECT_JITTER if jitter is None else jitter
+        self.reset_after = RECONNECT_RESET_AFTER if reset_after is None else reset_after
+        self.clock = clock
+        self.attempts = 0
+        self.connected_at = None
+
+    def connected(self):
+        """Call once a connection is up"""
+        self.connected_at = self.clock()
+
+    def reset(self):
+        """Call once a connection has delivered a message"""
+        self.attempts = 0
+
+    def next_delay(self):
+        """Seconds to wait before the next attempt"""
+        if self.connected_at is not None and self.clock() - self.connected_at >= self.reset_after:
+            self.attempts = 0  # The connection that just ended was healthy
+        self.connected_at = None
+        self.attempts += 1
+        if self.attempts == 1:
+            delay = self.first
+        else:
+            delay = min(self.minimum * 2 ** (self.attempts - 2), self.maximum)
+        return delay * (1 - self.jitter * random.random())
 
-    # Parse different message formats
-    if " - " in message_text:
-        # Format: "window_name - status"
-        parts = message_text.split(" - ", 1)
-        window_name = parts[0]
-        status = parts[1] if len(parts) > 1 else None
-    else:
-        # Default: treat entire message as window_name
-        window_name = message_text
-        status = None
 
-    return {
-        "window_name": window_name,
-        "status": status
-    }
+class RecentIds:
+    """The last `maxlen` message ids read from a stream"""
+
+    def __init__(self, maxlen=RECENT_IDS_MAX):
+        self.ids = set()
+        self.order = deque()
+        self.maxlen = maxlen
+
+    def add(self, message_id):
+        """Remember an id; returns False if it was already seen"""
+        if message_id in self.ids:
+            return False
+        self.ids.add(message_id)
+        self.order.append(message_id)
+        if len(self.order) > self.maxlen:
+            self.ids.discard(self.order.popleft())
+        return True
+
+
+def iter_response_chunks(response, size=65536):
+    """
+    Yield a streamed response body as soon as bytes arrive.
+    (iter_lines() holds data back until a full 512-byte read completes.)
+    """
+    raw = response.raw
+    if response.headers.get('transfer-encoding', '').lower() == 'chunked' or not hasattr(raw, 'read1'):
+        # Chunked bodies are yielded chunk by chunk as the server flushes them
+        yield from response.iter_content(chunk_size=None)
+        return
+    while True:
+        data = raw.read1(size, decode_content=True)  # Should the server compress anyway
+        if not data:
+            break
+        yield data
+
+
+def decode_ntfy_events(events):
+    """
+    Decoded JSON of each ntfy message event.
+    open/keepalive events are skipped without decoding their data.
+    """
+    for event in events:
+        if event.event != 'message':
+            continue
+        try:
+            yield json_loads(event.data)
+        except ValueError:
+            print(f"[WARN] Could not parse message: {event.data!r}")
+
+
+def submit_ntfy_message(data, writer, recent_ids, cursor_key=None, namespace=None):
+    """
+    Hand one decoded ntfy event to the writer.
+    Returns the message id to resume after, or None if the event was not a
+    new message (open/keepalive events, or an id already read).
+    """
+    # Skip open/keepalive events
+    if data.get('event', 'message') != 'message':
+        return None
 
+    message_id = data.get('id')
+    if message_id and not recent_ids.add(message_id):
+        return None  # Already read before the reconnect
+
+    # Parse message into window_name and status
+    parsed = parse_focus_message(data.get('message', ''))
+
+    if parsed:
+        window_name = parsed["window_name"]
+        if namespace:
+            window_name = f"{namespace}/{window_name}"
+        writer.submit(
+            window_name,
+            parsed.get("status"),
+            message_id=message_id,
+            message_time=data.get('time'),
+            cursor_key=cursor_key
+        )
+    return message_id
 
-## update_window_status is now imported from db module
 
+class StatusWriter:
+    """
+    Drains parsed statuses from a bounded queue and commits them in batches.
+    Within a batch only the latest status per window_name is upserted (every
+    message still lands in the event history), all in one transaction.
+    Messages whose ntfy id is already in the event history are skipped, and
+    the cursor of each stream (cursor_key, or the one passed to submit) is
+    saved in the same transaction. on_commit(rows), if set, is called with
+    the rows that visibly changed after each commit (e.g. to push them to
+    the UI).
+    """
 
-def listen_for_notifications():
-    """Listen for ntfy notifications and update window status with auto-reconnection"""
-    print(f"[LISTENER] Starting ntfy listener on: {TOPIC_URL}")
+    def __init__(self, maxsize=WRITE_QUEUE_SIZE, batch_max=WRITE_BATCH_MAX, linger=WRITE_BATCH_LINGER,
+                 cursor_key=None, on_commit=None):
+        self.queue = queue.Queue(maxsize)
+        self.batch_max = batch_max
+        self.linger = linger
+        self.cursor_key = cursor_key
+        self.on_commit = on_commit
+        self._running = False
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {
+            "received": 0,      # Messages submitted by the reader
+            "written": 0,       # Rows visibly changed after coalescing
+            "unchanged": 0,     # Rows whose status was already current (only last_seen bumped)
+            "coalesced": 0,     # Messages superseded by a later one in the same batch
+            "duplicates": 0,    # Messages skipped because their id was already applied
+            "batches": 0,       # Transactions committed
+            "failed": 0,        # Messages dropped after WRITE_RETRIES failed commits
+            "max_batch": 0,     # Largest batch seen
+            "max_queue_depth": 0,
+        }
+
+    def submit(self, window_name, status, message_id=None, message_time=None, cursor_key=None,
+               update_window=True, record_event=True):
+        """
+        Queue a status (called by the reader). Blocks only if the queue is full.
+        update_window=False only records the message in the event history (and
+        its cursor); record_event=False only updates the window row.
+        """
+        self.queue.put({
+            "window_name": window_name,
+            "status": status,
+            "timestamp": datetime.now().isoformat(),  # Time received, not time written
+            "message_id": message_id,
+            "message_time": message_time,
+            "cursor_key": cursor_key or self.cursor_key,
+            "update_window": update_window,
+            "record_event": record_event,
+        })
+        with self._lock:
+            self.stats["received"] += 1
+            self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self.queue.qsize())
+
+    def backlogged(self):
+        """True when the queue is (nearly) full, so submit() may block"""
+        return self.queue.qsize() >= self.queue.maxsize - WRITE_QUEUE_RESERVE
+
+    def get_stats(self):
+        """Snapshot of the counters plus the current queue depth"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats["queue_depth"] = self.queue.qsize()
+        stats["avg_batch"] = (stats["received"] - stats["failed"] - stats["duplicates"]) / stats["batches"] if stats["batches"] else 0.0
+        return stats
+
+    def start(self):
+        """Start the writer thread"""
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="status-writer", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout=5):
+        """Stop the writer thread after flushing whatever is queued"""
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        last_stats = time.monotonic()
+        while self._running or not self.queue.empty():
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+
+            if batch and time.monotonic() - last_stats >= WRITER_STATS_INTERVAL:
+                last_stats = time.monotonic()
+                print(f"[WRITER] Stats: {self.get_stats()}")
+
+    def _next_batch(self):
+        """Block for the first message, then gather more until the batch closes"""
+        try:
+            batch = [self.queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        if self.queue.empty():
+            return batch  # Not part of a burst; don't add linger latency
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.batch_max:
+            try:
+                remaining = deadline - time.monotonic()
+                batch.append(self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        """Commit one batch, keeping only the latest status per window"""
+        state = self._cursor_state(batch)
+
+        for attempt in range(WRITE_RETRIES):
+            fresh = self._drop_applied(batch)
+            if fresh is not None:
+                updates = [item for item in fresh if item.get("update_window", True)]
+                history = [item for item in fresh if item.get("record_event", True)]
+                latest = {}
+                for item in updates:
+                    latest.pop(item["window_name"], None)  # Re-insert so order follows the latest message
+                    latest[item["window_name"]] = item
+                rows = list(latest.values())
+
+                changed = update_window_statuses_many(rows, history=history, state=state)
+                if changed is not None:
+                    with self._lock:
+                        self.stats["batches"] += 1
+                        self.stats["written"] += len(changed)
+                        self.stats["unchanged"] += len(rows) - len(changed)
+                        self.stats["coalesced"] += len(updates) - len(rows)
+                        self.stats["duplicates"] += len(batch) - len(fresh)
+                        self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+                    rows = [row for row in rows if row["window_name"] in changed]
+                    if self.on_commit and rows:
+                        try:
+                            self.on_commit(rows)
+                        except Exception as e:
+                            print(f"[WRITER] on_commit failed: {e}")
+                    return
+            if attempt + 1 < WRITE_RETRIES:
+                time.sleep(0.5 * (attempt + 1))
+
+        print(f"[WRITER] Dropped batch of {len(batch)} messages after {WRITE_RETRIES} failed commits")
+        with self._lock:
+            self.stats["failed"] += len(batch)
+
+    def _drop_applied(self, batch):
+        """Batch without messages whose id was already applied, or None if the lookup failed"""
+        ids = [item["message_id"] for item in batch if item.get("message_id")]
+        if not ids:
+            return batch
+        try:
+            seen = get_applied_message_ids(ids)
+        except Exception as e:
+            print(f"[WRITER] Could not check message ids: {e}")
+            return None
+
+        fresh = []
+        for item in batch:
+            message_id = item.get("message_id")
+            if message_id:
+                if message_id in seen:
+                    continue
+                seen.add(message_id)  # Also drops repeats within the batch
+            fresh.append(item)
+        return fresh
+
+    def _cursor_state(self, batch):
+        """listener_state update recording the last message of each stream in the batch"""
+        state = {}
+        for item in batch:
+            if item.get("message_id") and item.get("cursor_key"):
+                cursor = {"id": item["message_id"], "time": item["message_time"]}
+                state[item["cursor_key"]] = json.dumps(cursor)
+        return state or None
+
+
+def listen_for_notifications(writer=None, topic_url=TOPIC_URL, cursor_key=CURSOR_KEY, stop_event=None):
+    """
+    Listen for ntfy notifications and update window status with auto-reconnection.
+    Runs until interrupted, or until stop_event (a threading.Event) is set; a
+    stream blocked in a read notices that at its next keepalive at the latest.
+    """
+    print(f"[LISTENER] Starting ntfy listener on: {topic_url}")
     print(f"[LISTENER] Using SQLite database in: {STATUS_DIR}")
 
     # Debug log
@@ -81,104 +451,180 @@ def listen_for_notifications():
 
     log(f"Listener started. DB_DIR={STATUS_DIR}")
 
-    reconnect_delay = 5  # Start with 5 second delay
-    max_reconnect_delay = 60  # Max 60 seconds between retries
+    # Database writes happen on the writer thread so this loop only reads the socket
+    if writer is None:
+        writer = StatusWriter(cursor_key=cursor_key)
+        writer.start()
+
+    # Resume after the last committed message, if any
+    cursor = load_cursor(cursor_key)
+    since = cursor["id"] if cursor else None
+    if cursor:
+        log(f"Resuming after message {cursor['id']} (time={cursor['time']})")
+
+    # Ids of recently read messages, to drop the overlap of a resumed stream
+    recent_ids = RecentIds()
+
+    backoff = ReconnectBackoff()
+    stop_event = stop_event or threading.Event()
 
-    while True:  # Reconnection loop
+    while not stop_event.is_set():  # Reconnection loop
+        watchdog = KeepaliveWatchdog()
         try:
-            log(f"Connecting to {TOPIC_URL}/sse...")
+            params = {"since": since} if since else None
+            log(f"Connecting to {topic_url}/sse" + (f"?since={since}" if since else "") + "...")
+            # The read timeout applies to every socket read, so it fires once
+            # no byte has arrived for watchdog.limit seconds
+            # An uncompressed stream, since a compressor would hold events back
             response = requests.get(
-                f"{TOPIC_URL}/sse",
+                f"{topic_url}/sse",
+                params=params,
+                headers={"Accept-Encoding": "identity"},
                 stream=True,
-                timeout=300  # 5 minute timeout for detecting dead connections
+                timeout=(CONNECT_TIMEOUT, watchdog.limit)
             )
 
             log(f"Connected successfully (status={response.status_code})")
-            reconnect_delay = 5  # Reset delay on successful connection
-
-            for line in response.iter_lines():
-                if line:
-                    line = line.decode('utf-8')
-
-                    # Parse ntfy SSE format: data: {"message": "..."}
-                    if line.startswith('data:'):
-                        try:
-                            data = json.loads(line[5:].strip())
-
-                            # Extract message content
-                            message_text = data.get('message', '')
-
-                            # Parse message into window_name and status
-                            parsed = parse_focus_message(message_text)
-
-                            if parsed:
-                                update_window_status(
-                                    parsed["window_name"],
-                                    parsed.get("status")
-                                )
-
-                        except json.JSONDecodeError:
-                            print(f"[WARN] Could not parse message: {line}")
+            backoff.connected()
+            watchdog.feed()
+
+            parser = SSEParser()
+            with response:
+                for chunk in iter_response_chunks(response):
+                    watchdog.feed()
+                    for data in decode_ntfy_events(parser.feed(chunk)):
+                        backoff.reset()  # The stream works; start the backoff over
+                        since = submit_ntfy_message(data, writer, recent_ids, cursor_key) or since
+                    if stop_event.is_set():
+                        break
 
         except KeyboardInterrupt:
             print("\n[LISTENER] Stopped listening")
+            writer.stop()  # Flush queued statuses
+            print(f"[WRITER] Final stats: {writer.get_stats()}")
             break  # Exit cleanly on Ctrl+C
 
         except Exception as e:
+            if watchdog.expired():
+                log(f"No data for {watchdog.idle():.0f}s ({watchdog.missed_count()} keepalives missed)")
             print(f"[ERROR] Connection lost: {e}")
-            print(f"[LISTENER] Reconnecting in {reconnect_delay} seconds...")
 
-            import time
-            time.sleep(reconnect_delay)
+        if stop_event.is_set():
+            print("[LISTENER] Stopped listening")
+            break
 
-            # Exponential backoff
-            reconnect_delay = min(reconnect_delay * 2, max_reconnect_delay)
-            continue  # Retry connection
+        # Reconnect, also after a clean close by the server
+        delay = backoff.next_delay()
+        print(f"[LISTENER] Reconnecting in {delay:.1f} seconds...")
+        stop_event.wait(delay)
 
 
-def kill_existing_listeners():
-    """Kill any existing ntfy_listener processes except this one"""
-    current_pid = os.getpid()
-    current_process_name = Path(__file__).name
+def claim_listener_lock(on_stop):
+    """
+    Become the only listener: take the listener lock, asking a running
+    listener to stop first if there is one. on_stop is called when a later
+    listener asks us to stop. Returns the lock, or None if it stayed taken.
+    """
+    lock = InstanceLock("listener")
+    if lock.acquire(lambda command: command == "stop" and on_stop()):
+        return lock
 
-    print(f"[LISTENER] Checking for existing listeners (current PID: {current_pid})")
+    holder = lock.holder()
+    print(f"[LISTENER] Listener PID {holder['pid'] if holder else '?'} is running; asking it to stop")
+    lock.send("stop")
+    if lock.wait_acquire(LISTENER_HANDOFF_TIMEOUT, lambda command: command == "stop" and on_stop()):
+        return lock
+    print("[LISTENER] The running listener did not stop; leaving it in charge")
+    return None
 
-    try:
-        # Use pkill to kill other instances
-        result = subprocess.run(
-            ["pgrep", "-f", current_process_name],
-            capture_output=True,
-            text=True
-        )
 
-        if result.returncode == 0:
-            pids = result.stdout.strip().split('\n')
-            killed_count = 0
-
-            for pid_str in pids:
-                pid = int(pid_str.strip())
-                if pid != current_pid:
-                    try:
-                        os.kill(pid, signal.SIGTERM)
-                        print(f"[LISTENER] Killed existing listener PID: {pid}")
-                        killed_count += 1
-                    except ProcessLookupError:
-                        pass
-
-            if killed_count > 0:
-                print(f"[LISTENER] Killed {killed_count} existing listener(s)")
-            else:
-                print("[LISTENER] No other listeners found")
-        else:
-            print("[LISTENER] No existing listeners found")
+def run_listener(stop_event=None, on_commit=None, topic_url=TOPIC_URL, drained=None):
+    """
+    Run the whole listener: event compaction, the writer, the local ingestion
+    endpoint and the ntfy stream(s). Blocks until interrupted or until
+    stop_event is set. on_commit receives committed rows (in-process mode);
+    otherwise they go over the push channel if the UI that started us asked
+    for it.
+
+    Once stop_event is set, pending flow-controlled updates and queued
+    statuses are flushed at once, without waiting for a stream blocked in a
+    read to notice; drained (a threading.Event), if given, is set when that
+    is done.
+    """
+    stop_event = stop_event or threading.Event()
+    drained = drained or threading.Event()
+
+    # One listener per user; a newer one takes over from an older one
+    lock = claim_listener_lock(stop_event.set)
+    if lock is None:
+        drained.set()
+        return
+
+    # Enforce event history retention in the background
+    compactor_stop = threading.Event()
+    start_event_compactor(stop_event=compactor_stop)
+
+    # One writer for ntfy and the local endpoint, so both share its batching
+    writer = StatusWriter(cursor_key=CURSOR_KEY, on_commit=on_commit)
+    writer.start()
+
+    # Push committed rows straight to the UI that started us, if it asked
+    if on_commit is None and os.environ.get(PUSH_PORT_ENV):
+        push_client = PushClient(os.environ[PUSH_PORT_ENV], os.environ.get(PUSH_TOKEN_ENV, ""))
+        writer.on_commit = push_client.send
+        print(f"[LISTENER] Pushing updates to the UI on port {push_client.port}")
+
+    # Everything below submits through flow control, which stops the writer in turn
+    if FLOW_CONTROL:
+        writer = FlowController(writer).start()
+
+    # Let agents on this machine skip the round trip through ntfy
+    from local_ingest import LocalIngestServer
+    ingest_server = LocalIngestServer(writer).start()
+
+    drain_lock = threading.Lock()
+
+    def drain():
+        """Stop taking local statuses and flush everything accepted so far (once)"""
+        with drain_lock:
+            if drained.is_set():
+                return
+            ingest_server.stop()
+            compactor_stop.set()
+            writer.stop()  # Forwards pending flow-controlled updates, then flushes the queue
+            print("[LISTENER] Flushed queued statuses")
+            drained.set()
+
+    def drain_on_stop():
+        stop_event.wait()
+        drain()
+
+    threading.Thread(target=drain_on_stop, name="listener-drain", daemon=True).start()
 
-    except Exception as e:
-        print(f"[LISTENER] Could not check for existing listeners: {e}")
+    try:
+        if LISTENER_TOPICS:
+            from async_listener import listen_for_topics, parse_topics
+            listen_for_topics(parse_topics(LISTENER_TOPICS), writer=writer, multiplex=LISTENER_MULTIPLEX,
+                              stop_event=stop_event)
+        else:
+            listen_for_notifications(writer=writer, topic_url=topic_url, stop_event=stop_event)
+    finally:
+        drain()  # A no-op if stop_event already did it
+        lock.release()
 
 
 if __name__ == "__main__":
-    # Kill any existing listeners before starting
-    kill_existing_listeners()
-
-    # Start listening
-    listen_for_notifications()
+    stop_event = threading.Event()
+    drained = threading.Event()
+
+    def exit_when_stuck():
+        # A stream blocked in a read only sees stop_event at its next
+        # keepalive. Accepted statuses are flushed on stop regardless, and
+        # the cursor makes exiting mid-stream safe
+        stop_event.wait()
+        drained.wait(LISTENER_STOP_GRACE)
+        print("[LISTENER] Exiting without waiting for the stream")
+        os._exit(0)
+
+    threading.Thread(target=exit_when_stuck, daemon=True).start()
+    run_listener(stop_event, drained=drained)
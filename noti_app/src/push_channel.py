@@ -0,0 +1,163 @@
+"""
+Listener → UI push channel.
+
+The UI opens a PushServer on a loopback port and hands the port and a
+random token to the listener subprocess through the environment
+(PUSH_PORT_ENV / PUSH_TOKEN_ENV). After each committed batch the listener's
+PushClient sends the changed rows as one JSON line, so the UI can update
+without waiting to notice the database change. SQLite stays the durable
+store: a lost push costs nothing but latency, since the UI still applies
+every change it reads from the database.
+
+Wire format: the token line, then one {"windows": [{window_name, status,
+timestamp}, ...]} JSON object per line.
+
+A connection must send its token within PUSH_AUTH_TIMEOUT, and at most
+PUSH_MAX_CONNECTIONS are served at once, so stray local clients cannot pile
+up reader threads. Once authenticated the connection has no read timeout:
+the listener stays connected and quiet between batches.
+"""
+
+import json
+import secrets
+import socket
+import threading
+import time
+
+PUSH_PORT_ENV = "NOTI_APP_PUSH_PORT"
+PUSH_TOKEN_ENV = "NOTI_APP_PUSH_TOKEN"
+PUSH_FIELDS = ("window_name", "status", "timestamp")
+PUSH_RETRY_INTERVAL = 1.0  # Seconds between reconnect attempts from the listener
+PUSH_SEND_TIMEOUT = 1.0  # Give up on a send the UI is not reading
+PUSH_AUTH_TIMEOUT = 5.0  # Seconds a new connection has to send its token
+PUSH_MAX_CONNECTIONS = 4  # Connections served at once; more are closed at once
+PUSH_MAX_TOKEN_LINE = 256  # Bytes read looking for the token line
+
+
+class PushServer:
+    """UI side: accepts the listener's connection and calls on_delta(windows) per message"""
+
+    def __init__(self, on_delta):
+        self.on_delta = on_delta
+        self.token = secrets.token_hex(16)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(4)
+        self.port = self.sock.getsockname()[1]
+        self.received = 0
+        self.rejected = 0
+        self._slots = threading.BoundedSemaphore(PUSH_MAX_CONNECTIONS)
+        self._running = True
+        threading.Thread(target=self._accept_loop, name="push-accept", daemon=True).start()
+
+    def env(self):
+        """Environment variables telling the listener where to push"""
+        return {PUSH_PORT_ENV: str(self.port), PUSH_TOKEN_ENV: self.token}
+
+    def close(self):
+        self._running = False
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                break  # Closed
+            if not self._slots.acquire(blocking=False):
+                print("[PUSH] Rejected a connection: too many open")
+                self.rejected += 1
+                conn.close()
+                continue
+            threading.Thread(target=self._read_loop, args=(conn,), name="push-reader", daemon=True).start()
+
+    def _read_loop(self, conn):
+        try:
+            with conn, conn.makefile("rb") as lines:
+                if not self._authenticate(conn, lines):
+                    self.rejected += 1
+                    return
+                self._read_pushes(lines)
+        except OSError:
+            pass  # Connection reset; the listener reconnects
+        finally:
+            self._slots.release()
+
+    def _authenticate(self, conn, lines):
+        conn.settimeout(PUSH_AUTH_TIMEOUT)
+        try:
+            token = lines.readline(PUSH_MAX_TOKEN_LINE).strip()
+        except socket.timeout:
+            print("[PUSH] Rejected a connection that sent no token")
+            return False
+        if not secrets.compare_digest(token, self.token.encode("ascii")):
+            print("[PUSH] Rejected a connection with a bad token")
+            return False
+        conn.settimeout(None)
+        return True
+
+    def _read_pushes(self, lines):
+        for line in lines:
+            try:
+                windows = json.loads(line)["windows"]
+            except (ValueError, KeyError, TypeError):
+                print(f"[PUSH] Could not parse push: {line[:200]!r}")
+                continue
+            self.received += 1
+            try:
+                self.on_delta(windows)
+            except Exception as e:
+                print(f"[PUSH] Error applying push: {e}")
+
+
+class PushClient:
+    """Listener side: best-effort sender of committed rows to the UI"""
+
+    def __init__(self, port, token):
+        self.port = int(port)
+        self.token = token
+        self.sock = None
+        self.sent = 0
+        self.dropped = 0
+        self._next_attempt = 0.0
+
+    def send(self, rows):
+        """Push rows (dicts with PUSH_FIELDS); never raises"""
+        if self.sock is None and not self._connect():
+            self.dropped += 1
+            return False
+        line = json.dumps({"windows": [{key: row.get(key) for key in PUSH_FIELDS} for row in rows]})
+        try:
+            self.sock.sendall(line.encode("utf-8") + b"\n")
+            self.sent += 1
+            return True
+        except OSError as e:
+            print(f"[PUSH] Lost connection to UI: {e}")
+            self.close()
+            self.dropped += 1
+            return False
+
+    def close(self):
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+    def _connect(self):
+        if time.monotonic() < self._next_attempt:
+            return False
+        try:
+            sock = socket.create_connection(("127.0.0.1", self.port), timeout=PUSH_SEND_TIMEOUT)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.sendall(self.token.encode("ascii") + b"\n")
+        except OSError as e:
+            print(f"[PUSH] Could not connect to UI on port {self.port}: {e}")
+            self._next_attempt = time.monotonic() + PUSH_RETRY_INTERVAL
+            return False
+        self.sock = sock
+        return True
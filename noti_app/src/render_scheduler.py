@@ -0,0 +1,88 @@
+"""
+Frame-coalesced UI refresh.
+
+The monitor can report many changes in quick succession (several agents
+finishing at once). Instead of a root.after(0, reload) per change, each
+change marks the UI dirty through RenderScheduler.request(); the render
+callback then runs on the Tk thread at most once per frame, with every
+row changed since the previous repaint.
+
+While the window is hidden the scheduler can be told to defer(): changes
+then only accumulate, and resume() draws them in one render when the
+window is shown. Changes for which should_wake(changed_rows) is true (e.g.
+popup statuses) are still rendered, so they can bring the window up.
+"""
+
+import threading
+import time
+
+RENDER_FRAME_MS = 50  # Repaint at most once per this many ms
+
+
+class RenderScheduler:
+    """Merges repaint requests from any thread into at most one render per frame"""
+
+    def __init__(self, root, render=None, frame_ms=RENDER_FRAME_MS, should_wake=None):
+        self.root = root
+        self.render = render  # render(changed_rows), called on the Tk thread
+        self.frame = frame_ms / 1000
+        self.should_wake = should_wake
+        self.stats = {
+            "requested": 0,   # Calls to request()
+            "coalesced": 0,   # Requests merged into an already scheduled repaint
+            "executed": 0,    # Repaints actually run
+            "deferred": 0,    # Requests held back while deferring
+        }
+        self._lock = threading.Lock()
+        self._pending = {}        # window_name -> latest changed row since the last repaint
+        self._dirty = False       # Something changed since the last repaint (maybe only deletions)
+        self._scheduled = False
+        self._deferring = False
+        self._last_render = 0.0
+
+    def defer(self):
+        """Stop rendering (window hidden); requests only accumulate"""
+        with self._lock:
+            self._deferring = True
+
+    def resume(self):
+        """Stop deferring and render whatever accumulated, now (Tk thread)"""
+        with self._lock:
+            self._deferring = False
+            if not self._dirty or self._scheduled or self.render is None:
+                return  # Nothing held back, or a repaint is already on its way
+        self._run()
+
+    def request(self, changed_rows=()):
+        """Mark the UI dirty; safe to call from any thread"""
+        wake = bool(self._deferring and self.should_wake and self.should_wake(changed_rows))
+        with self._lock:
+            self.stats["requested"] += 1
+            for row in changed_rows:
+                self._pending[row.get("window_name")] = row
+            self._dirty = True
+            if self._deferring and not self._scheduled and not wake:
+                self.stats["deferred"] += 1
+                return
+            if self._scheduled:
+                self.stats["coalesced"] += 1
+                return
+            self._scheduled = True
+            delay = max(0.0, self._last_render + self.frame - time.monotonic())
+        # The first change after a quiet spell is drawn right away; the rest
+        # of a burst waits for the end of the frame
+        self.root.after(int(delay * 1000), self._run)
+
+    def _run(self):
+        with self._lock:
+            changed_rows = list(self._pending.values())
+            self._pending = {}
+            self._dirty = False
+            self._scheduled = False
+            self._last_render = time.monotonic()
+            self.stats["executed"] += 1
+        self.render(changed_rows)
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats)
@@ -0,0 +1,114 @@
+"""
+Incremental Server-Sent Events parser.
+
+Fed raw byte chunks exactly as they come off the socket (lines may be split
+anywhere), it returns complete events with their `event`, `id` and
+(multi-line) `data` fields, following the WHATWG event stream rules. Data
+stays as bytes so it can go straight to the JSON decoder. json_loads is
+orjson's decoder when it is installed and the standard library's otherwise.
+"""
+
+import json
+
+_decoder = json.JSONDecoder()
+
+
+def stdlib_json_loads(data):
+    """json.loads() for the parser's bytes, trimmed to what the hot path needs"""
+    # json.loads() sniffs the encoding of bytes input; decoding first is faster
+    text = data.decode("utf-8") if isinstance(data, bytes) else data
+    try:
+        # raw_decode() skips loads()'s two whitespace scans around the value
+        value, end = _decoder.raw_decode(text)
+        if end == len(text):
+            return value
+    except ValueError:
+        pass
+    return json.loads(text)  # Surrounding whitespace, or raise the proper error
+
+
+try:
+    import orjson
+    json_loads = orjson.loads  # Raises orjson.JSONDecodeError, a json.JSONDecodeError subclass
+except ImportError:
+    json_loads = stdlib_json_loads
+
+
+class SSEEvent:
+    """One dispatched event: type (str), data (bytes) and the stream's last event id (str or None)"""
+
+    __slots__ = ("event", "data", "id")
+
+    def __init__(self, event, data, id):
+        self.event = event
+        self.data = data
+        self.id = id
+
+    def __repr__(self):
+        return f"SSEEvent(event={self.event!r}, data={self.data!r}, id={self.id!r})"
+
+
+class SSEParser:
+    """Turns a stream of byte chunks into SSEEvents"""
+
+    def __init__(self):
+        self.last_event_id = None
+        self.retry = None       # Reconnection time (ms) requested by the server, if any
+        self._buffer = b""
+        self._event = None
+        self._data = []
+        self._skip_lf = False   # Previous chunk ended in \r; a leading \n belongs to it
+
+    def reset(self):
+        """Forget any partial event (call when the connection is replaced)"""
+        self._buffer = b""
+        self._event = None
+        self._data = []
+        self._skip_lf = False
+
+    def feed(self, chunk):
+        """Parse a chunk and return the list of events it completed"""
+        if self._skip_lf:
+            self._skip_lf = False
+            if chunk[:1] == b"\n":
+                chunk = chunk[1:]
+        if b"\r" in chunk:
+            # Normalise CRLF and bare CR line endings
+            self._skip_lf = chunk.endswith(b"\r")
+            chunk = chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+        lines = (self._buffer + chunk).split(b"\n")
+        self._buffer = lines.pop()  # Incomplete last line (or b"")
+
+        events = []
+        data = self._data
+        for line in lines:
+            if line.startswith(b"data:"):
+                # Fast path for the most common field
+                data.append(line[6:] if line[5:6] == b" " else line[5:])
+                continue
+            if not line:
+                # Blank line: dispatch the pending event
+                if data and (len(data) > 1 or data[0]):
+                    events.append(SSEEvent(self._event or "message", b"\n".join(data), self.last_event_id))
+                self._event = None
+                data = self._data = []
+                continue
+            if line[0] == 0x3A:  # ":" starts a comment
+                continue
+
+            field, sep, value = line.partition(b":")
+            if sep and value[:1] == b" ":
+                value = value[1:]
+            if field == b"data":
+                data.append(value)
+            elif field == b"event":
+                self._event = value.decode("utf-8", "replace")
+            elif field == b"id":
+                if b"\0" not in value:
+                    self.last_event_id = value.decode("utf-8", "replace")
+            elif field == b"retry":
+                if value.isdigit():
+                    self.retry = int(value)
+            # Unknown fields are ignored
+        return events
@@ -1,6 +1,14 @@
 """UI utility functions for the notification app"""
 
-from PIL import Image, ImageDraw
+from collections import OrderedDict
+
+from PIL import Image, ImageDraw, ImageTk
+
+# Max distinct rendered bar backgrounds kept alive (least recently used are dropped)
+ROUNDED_PHOTO_CACHE_SIZE = 32
+
+# (width, height, radius, color_hex, dpi_scale) -> PhotoImage
+_rounded_photo_cache = OrderedDict()
 
 
 def create_rounded_rectangle_image(width, height, radius, color_hex):
@@ -24,3 +32,28 @@ def create_rounded_rectangle_image(width, height, radius, color_hex):
     draw.ellipse([width - radius * 2, height - radius * 2, width, height], fill=color)
 
     return img
+
+
+def get_rounded_rectangle_photo(width, height, radius, color_hex, dpi_scale=1.0):
+    """
+    Get a shared PhotoImage of a rounded rectangle, rendering it on first use.
+    Bars with the same geometry and colour share one image, so memory stays
+    flat no matter how many bars are created. Must be called on the Tk thread.
+    """
+    key = (width, height, radius, color_hex, dpi_scale)
+    photo = _rounded_photo_cache.get(key)
+    if photo is not None:
+        _rounded_photo_cache.move_to_end(key)
+        return photo
+
+    photo = ImageTk.PhotoImage(create_rounded_rectangle_image(width, height, radius, color_hex))
+    _rounded_photo_cache[key] = photo
+    if len(_rounded_photo_cache) > ROUNDED_PHOTO_CACHE_SIZE:
+        # Widgets still showing an evicted image keep their own reference to it
+        _rounded_photo_cache.popitem(last=False)
+    return photo
+
+
+def rounded_photo_cache_size():
+    """Number of PhotoImages currently held by the cache"""
+    return len(_rounded_photo_cache)
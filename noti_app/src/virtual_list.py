@@ -0,0 +1,150 @@
+"""
+Virtualized list of message bars for the notification app.
+
+Only enough bars to fill the visible part of the canvas (plus a few rows of
+overscan) are ever created. As the view scrolls they are moved and rebound
+to whichever rows are now visible, so the widget count stays constant no
+matter how many windows are tracked. Rows are fetched a page at a time
+through fetch_rows(offset, limit) and count_rows().
+"""
+
+# Extra rows materialized above and below the viewport
+OVERSCAN_ROWS = 3
+
+
+class VirtualBarList:
+    """
+    Recycles a small pool of bars over a canvas scrolled as if it held them all.
+
+    create_bar()                        -> (container, bar), not yet placed
+    bind_bar(bar, index, row, selected) -> show row (a window dict) on bar
+    fetch_rows(offset, limit)           -> list of window dicts in display order
+    count_rows()                        -> total number of rows
+    """
+
+    def __init__(self, canvas, scrollbar, width, row_height,
+                 create_bar, bind_bar, fetch_rows, count_rows, overscan=OVERSCAN_ROWS):
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.width = width
+        self.row_height = row_height
+        self.create_bar = create_bar
+        self.bind_bar = bind_bar
+        self.fetch_rows = fetch_rows
+        self.count_rows = count_rows
+        self.overscan = overscan
+
+        self.count = 0
+        self.selected_index = 0
+        self.rows = {}       # row index -> window dict, for the materialized range only
+        self.slots = []      # [canvas item id, bar, bound (index, row, selected) or None]
+        self._range = (0, 0)
+
+        # Scroll in whole rows, and re-render whenever the view moves
+        self.canvas.configure(yscrollincrement=row_height, yscrollcommand=self._on_yview)
+
+    # ====== DATA ======
+
+    def refresh(self):
+        """Re-read the row count and the visible rows (call after the data changed)"""
+        self.count = self.count_rows()
+        self.canvas.configure(scrollregion=(0, 0, self.width, self.count * self.row_height))
+        self.rows = {}
+        self.render(force=True)
+
+    def row_at(self, index):
+        """Window dict at a row index, or None if out of range"""
+        if not 0 <= index < self.count:
+            return None
+        if index not in self.rows:
+            page = self.fetch_rows(index, 1)
+            if not page:
+                return None
+            self.rows[index] = page[0]
+        return self.rows[index]
+
+    # ====== SELECTION & SCROLLING ======
+
+    def set_selected(self, index):
+        """Move the selection highlight; only rebinds the bars whose state changed"""
+        self.selected_index = index
+        self.render(force=False, restyle=True)
+
+    def scroll_to(self, index):
+        """Scroll the minimum amount needed to make row index fully visible"""
+        total = self.count * self.row_height
+        if total <= 0:
+            return
+        top = self.canvas.canvasy(0)
+        height = self.canvas.winfo_height()
+        y = index * self.row_height
+        if y < top:
+            self.canvas.yview_moveto(y / total)
+        elif y + self.row_height > top + height:
+            self.canvas.yview_moveto((y + self.row_height - height) / total)
+        self.render()
+
+    def _on_yview(self, first, last):
+        """yscrollcommand hook: keep the scrollbar in sync and recycle bars"""
+        self.scrollbar.set(first, last)
+        self.render()
+
+    # ====== RENDERING ======
+
+    def visible_range(self):
+        """Row indexes [start, end) that should currently have a bar"""
+        top = self.canvas.canvasy(0)
+        height = max(self.canvas.winfo_height(), self.row_height)
+        start = max(0, int(top // self.row_height) - self.overscan)
+        end = min(self.count, int((top + height) // self.row_height) + 1 + self.overscan)
+        return start, max(start, end)
+
+    def render(self, force=False, restyle=False):
+        """Bind pool bars to the visible rows, fetching any rows not yet loaded"""
+        start, end = self.visible_range()
+        if not (force or restyle) and (start, end) == self._range:
+            return
+        self._range = (start, end)
+
+        # Fetch missing rows as one page and forget rows that scrolled away
+        missing = [i for i in range(start, end) if i not in self.rows]
+        if missing:
+            page = self.fetch_rows(missing[0], missing[-1] - missing[0] + 1)
+            for offset, row in enumerate(page):
+                self.rows[missing[0] + offset] = row
+        self.rows = {i: row for i, row in self.rows.items() if start <= i < end}
+
+        # Grow the pool to cover the viewport (happens once, or on resize)
+        if len(self.slots) < end - start:
+            while len(self.slots) < end - start:
+                container, bar = self.create_bar()
+                item = self.canvas.create_window(0, -self.row_height, window=container, anchor="nw")
+                self.slots.append([item, bar, None])
+            for slot in self.slots:
+                # Slot assignment changed with the pool size - park and rebind
+                self.canvas.coords(slot[0], 0, -self.row_height)
+                slot[2] = None
+
+        # Row i always lands in slot i % pool size, so scrolling by one row
+        # rebinds a single bar instead of shifting every bar down by one
+        used = set()
+        for index in range(start, end):
+            row = self.rows.get(index)
+            if row is None:
+                continue
+            slot = self.slots[index % len(self.slots)]
+            used.add(id(slot))
+            selected = index == self.selected_index
+            bound = slot[2]
+            if bound is not None and bound[0] == index and bound[1] is row and bound[2] == selected:
+                continue  # Already showing exactly this
+            if bound is None or bound[0] != index:
+                self.canvas.coords(slot[0], 0, index * self.row_height)
+            self.bind_bar(slot[1], index, row, selected)
+            slot[2] = (index, row, selected)
+
+        for slot in self.slots:
+            if id(slot) not in used and slot[2] is not None:
+                # Park unused bars above the scroll region
+                self.canvas.coords(slot[0], 0, -self.row_height)
+                slot[2] = None
@@ -0,0 +1,181 @@
+"""
+Ordered model of the tracked windows, independent of Tk.
+
+WindowStore holds one compact record per window in display order: status
+priority (done -> ongoing -> other/None -> addressed), then most recent
+first, the same order as db.get_windows_page(). Changes are placed with
+bisect instead of re-sorting the whole list, and observers are told
+exactly what happened:
+
+    observer(event, index, record, old_index)
+
+    "insert"  record is new at index
+    "move"    record moved from old_index to index (status or timestamp changed)
+    "update"  record changed but kept its place at index
+    "remove"  record at index is gone
+    "reset"   load() replaced everything; index and record are None
+
+Indexes are display positions at the time of the event, so an observer
+mirroring the list with pop()/insert() stays in step. Not thread-safe:
+use a store from one thread (the Tk thread, for the UI's).
+"""
+
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+
+# Mirrors db.PRIORITY_ORDER_SQL
+STATUS_PRIORITY = {"done": 0, "ongoing": 1, "addressed": 3}
+OTHER_PRIORITY = 2  # None or any other status
+
+
+def status_priority(status):
+    """Display priority of a status, lowest shown first"""
+    return STATUS_PRIORITY.get((status or "").lower(), OTHER_PRIORITY)
+
+
+def recency(timestamp):
+    """Sort value of an ISO timestamp, most recent lowest; missing or invalid sorts last"""
+    try:
+        moment = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return 1
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return -((moment - datetime.min) // timedelta(microseconds=1)) - 1
+
+
+class WindowRecord:
+    """One window as the store keeps it"""
+
+    __slots__ = ("window_name", "status", "timestamp", "key")
+
+    def __init__(self, window_name, status=None, timestamp=None):
+        self.window_name = window_name
+        self.status = status
+        self.timestamp = timestamp
+        self.key = self._key()
+
+    def _key(self):
+        return (status_priority(self.status), recency(self.timestamp), self.window_name)
+
+    def as_dict(self):
+        return {"window_name": self.window_name, "status": self.status, "timestamp": self.timestamp}
+
+    def __repr__(self):
+        return f"WindowRecord({self.window_name!r}, {self.status!r}, {self.timestamp!r})"
+
+
+class WindowStore:
+    """Windows in display order, updated incrementally with change events"""
+
+    def __init__(self, rows=()):
+        self._records = {}  # window_name -> WindowRecord
+        self._keys = []     # Record keys, sorted (display order)
+        self._observers = []
+        if rows:
+            self.load(rows)
+
+    def subscribe(self, observer):
+        """Call observer(event, index, record, old_index) on every change"""
+        self._observers.append(observer)
+
+    def unsubscribe(self, observer):
+        self._observers.remove(observer)
+
+    def _emit(self, event, index=None, record=None, old_index=None):
+        for observer in list(self._observers):
+            observer(event, index, record, old_index)
+
+    # ====== READING ======
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __iter__(self):
+        for key in self._keys:
+            yield self._records[key[2]]
+
+    def __getitem__(self, index):
+        """Record at a display position"""
+        return self._records[self._keys[index][2]]
+
+    def __contains__(self, window_name):
+        return window_name in self._records
+
+    def get(self, window_name):
+        """Record for a window, or None"""
+        return self._records.get(window_name)
+
+    def index_of(self, window_name):
+        """Display position of a window, or None"""
+        record = self._records.get(window_name)
+        if record is None:
+            return None
+        return bisect_left(self._keys, record.key)
+
+    def rows(self):
+        """All windows as dicts, in display order"""
+        return [record.as_dict() for record in self]
+
+    # ====== CHANGING ======
+
+    def load(self, rows):
+        """Replace the contents with rows (window dicts); emits "reset" """
+        self._records = {}
+        for row in rows:
+            record = WindowRecord(row.get("window_name"), row.get("status"), row.get("timestamp"))
+            self._records[record.window_name] = record
+        self._keys = sorted(record.key for record in self._records.values())
+        self._emit("reset")
+
+    def apply(self, rows=(), deleted=()):
+        """Remove the deleted window names, then upsert rows. Returns the number of events."""
+        events = 0
+        for window_name in deleted:
+            events += self.remove(window_name)
+        for row in rows:
+            events += self.upsert(row)
+        return events
+
+    def upsert(self, row):
+        """Insert or update one window dict; True if anything changed"""
+        window_name = row.get("window_name")
+        status, timestamp = row.get("status"), row.get("timestamp")
+        record = self._records.get(window_name)
+        if record is None:
+            record = WindowRecord(window_name, status, timestamp)
+            self._records[window_name] = record
+            self._emit("insert", self._insert_key(record.key), record)
+            return True
+
+        if (record.status, record.timestamp) == (status, timestamp):
+            return False
+        old_index = self._remove_key(record.key)
+        record.status, record.timestamp = status, timestamp
+        record.key = record._key()
+        index = self._insert_key(record.key)
+        if index == old_index:
+            self._emit("update", index, record)
+        else:
+            self._emit("move", index, record, old_index)
+        return True
+
+    def remove(self, window_name):
+        """Remove a window; True if it was there"""
+        record = self._records.pop(window_name, None)
+        if record is None:
+            return False
+        self._emit("remove", self._remove_key(record.key), record)
+        return True
+
+    def _insert_key(self, key):
+        """Add key to the ordered list; returns its display index"""
+        index = bisect_left(self._keys, key)
+        self._keys.insert(index, key)
+        return index
+
+    def _remove_key(self, key):
+        """Drop key from the ordered list; returns the display index it had"""
+        index = bisect_left(self._keys, key)
+        del self._keys[index]
+        return index
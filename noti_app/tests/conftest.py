@@ -0,0 +1,20 @@
+"""
+Test setup: scratch database, lock and socket paths, and the import paths the
+app uses (src as a package, and src/ itself for the listener-side modules,
+which import each other script-style).
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Before anything imports db, which creates its directory at import time
+os.environ.setdefault("NOTI_APP_DB_DIR", tempfile.mkdtemp(prefix="noti_test_db_"))
+os.environ.setdefault("NOTI_APP_LOCK_DIR", tempfile.mkdtemp(prefix="noti_test_lock_"))
+os.environ.setdefault("NOTI_APP_INGEST_SOCKET", os.path.join(tempfile.mkdtemp(prefix="noti_test_run_"), "ingest.sock"))
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+sys.path.insert(0, str(APP_DIR / "src"))
+
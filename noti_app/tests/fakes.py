@@ -0,0 +1,73 @@
+"""Test doubles shared by the tests"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class FakeClock:
+    """Monotonic clock the test moves by hand"""
+
+    def __init__(self, start=1000.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakeNtfyServer:
+    """
+    Local stand-in for ntfy's /<topic>/sse endpoint. Each connection gets
+    the messages after its ?since=<id> (all of them for an unknown id, as
+    ntfy does), closes after drop_after messages if set, and otherwise stays
+    open and silent until close(). replay resends that many messages from
+    before since, as a server whose cache overlaps the client's would.
+    requests holds each connection's since.
+    """
+
+    def __init__(self, messages, drop_after=None, replay=0):
+        self.messages = list(messages)  # [(id, "window - status"), ...]
+        self.drop_after = drop_after
+        self.replay = replay
+        self.requests = []
+        self._closing = threading.Event()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self._server.server_port}/topic"
+
+    def close(self):
+        self._closing.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                since = parse_qs(urlsplit(self.path).query).get("since", [None])[0]
+                fake.requests.append(since)
+                ids = [message_id for message_id, _ in fake.messages]
+                start = max(ids.index(since) + 1 - fake.replay, 0) if since in ids else 0
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                self.wfile.write(b'event: open\ndata: {"event":"open"}\n\n')
+                for sent, (message_id, text) in enumerate(fake.messages[start:]):
+                    if fake.drop_after is not None and sent == fake.drop_after:
+                        return  # Connection closed mid-stream
+                    data = json.dumps({"id": message_id, "time": 1700000000, "event": "message", "message": text})
+                    self.wfile.write(f"data: {data}\n\n".encode())
+                    self.wfile.flush()
+                fake._closing.wait()
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,104 @@
+"""AdaptivePoller cadence, latency and wakeups, on a fake clock"""
+
+from src.adaptive_poller import AdaptivePoller
+
+from .fakes import FakeClock
+
+
+def make_poller():
+    clock = FakeClock()
+    return AdaptivePoller(min_interval=0.05, max_interval=3.0, hidden_max_interval=15.0,
+                          backoff=1.5, clock=clock), clock
+
+
+def simulate(poller, clock, duration, changes=()):
+    """
+    Run the poll loop for duration seconds of fake time with changes
+    committed at the given offsets. Returns (polls, detection latencies).
+    """
+    start = clock()
+    pending = sorted(start + offset for offset in changes)
+    latencies = []
+    polls = 0
+    while clock() - start < duration:
+        clock.advance(poller.interval)  # sleep()
+        polls += 1
+        seen = [t for t in pending if t <= clock()]
+        pending = pending[len(seen):]
+        latencies.extend(clock() - t for t in seen)
+        poller.done(bool(seen))
+    return polls, latencies
+
+
+def test_backs_off_to_ceiling_when_idle():
+    poller, _ = make_poller()
+    intervals = [poller.done(False) for _ in range(20)]
+    assert intervals == sorted(intervals)
+    assert intervals[0] == 0.05 * 1.5
+    assert intervals[-1] == 3.0
+
+
+def test_activity_returns_to_fast_cadence():
+    poller, clock = make_poller()
+    for _ in range(20):
+        poller.done(False)
+    assert poller.done(True) == 0.05
+    assert poller.last_activity == clock()
+    assert poller.active_polls == 1
+
+
+def test_hidden_ceiling_and_show():
+    poller, _ = make_poller()
+    poller.set_hidden(True)
+    for _ in range(30):
+        poller.done(False)
+    assert poller.interval == 15.0
+
+    poller.set_hidden(False)
+    assert poller.interval == 0.05
+    assert poller._wake.is_set()  # The sleeping loop polls at once
+    for _ in range(30):
+        poller.done(False)
+    assert poller.interval == 3.0
+
+
+def test_wake_cuts_sleep_short():
+    poller, _ = make_poller()
+    poller.interval = 60
+    poller.wake()
+    poller.sleep()  # Returns at once instead of waiting 60 s
+    assert poller.interval == 0.05
+    assert not poller._wake.is_set()
+
+
+def test_burst_latency_stays_near_fast_interval():
+    poller, clock = make_poller()
+    _, latencies = simulate(poller, clock, 2.0, changes=[0.1 * i for i in range(20)])
+    assert len(latencies) == 20
+    assert max(latencies) <= 0.05 * 1.5 ** 3
+
+
+def test_idle_wakeups_and_latency_after_idle():
+    poller, clock = make_poller()
+    polls, _ = simulate(poller, clock, 60)
+    assert polls <= 30  # About 11 polls ramping up, then one per 3 s; a fixed 0.5 s poll makes 120
+    _, latencies = simulate(poller, clock, 5, changes=[0.01])
+    assert latencies and latencies[0] <= 3.0
+
+
+def test_hidden_idle_wakeups():
+    poller, clock = make_poller()
+    poller.set_hidden(True)
+    polls, _ = simulate(poller, clock, 300)
+    assert polls <= 35  # Ramp-up, then one per 15 s; a fixed 0.5 s poll makes 600
+    _, latencies = simulate(poller, clock, 30, changes=[0.01])
+    assert latencies and latencies[0] <= 15.0
+
+
+def test_diagnostics_use_clock():
+    poller, clock = make_poller()
+    poller.done(True)
+    clock.advance(12.34)
+    info = poller.diagnostics()
+    assert info["idle_for"] == 12.3
+    assert info["polls"] == 1 and info["active_polls"] == 1
@@ -0,0 +1,57 @@
+"""A full writer queue must not stall the asyncio listener's event loop"""
+
+import asyncio
+import json
+
+from async_listener import TopicSubscription
+from ntfy_listener import StatusWriter
+
+
+async def serve_messages(count):
+    """Local stand-in for ntfy that sends count messages, then keeps the stream open"""
+    async def handle(reader, writer):
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n\r\n")
+        for i in range(count):
+            data = json.dumps({"id": f"m{i}", "event": "message", "time": i, "message": f"win{i} - done"})
+            writer.write(f"event: message\ndata: {data}\n\n".encode())
+        await writer.drain()
+        await asyncio.sleep(3600)
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def test_full_writer_queue_does_not_block_loop():
+    async def scenario():
+        server, port = await serve_messages(2)
+        writer = StatusWriter(maxsize=1)  # Not started: nothing drains it
+        writer.queue.put({"window_name": "backlog"})
+        subscription = TopicSubscription({"topic": ""}, writer, server=f"http://127.0.0.1:{port}")
+        task = asyncio.ensure_future(subscription.run())
+
+        ticks = 0
+        for _ in range(20):  # The loop keeps running while the subscription waits for room
+            await asyncio.sleep(0.01)
+            ticks += 1
+        assert ticks == 20
+        assert subscription.messages == 0
+
+        received = []
+        loop = asyncio.get_running_loop()
+        while len(received) < 2:  # Drain, as the writer thread would
+            item = await loop.run_in_executor(None, writer.queue.get, True, 5)
+            if item["window_name"] != "backlog":
+                received.append(item["window_name"])
+        for _ in range(100):
+            if subscription.messages == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert received == ["win0", "win1"]
+        assert subscription.messages == 2 and subscription.since == "m1"
+
+        task.cancel()
+        server.close()
+
+    asyncio.run(asyncio.wait_for(scenario(), 10))
@@ -0,0 +1,189 @@
+"""Window upserts: which writes count as visible changes"""
+
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import db
+from src.window_store import WindowStore
+
+
+def name():
+    return f"win-{uuid.uuid4().hex[:8]}"
+
+
+def row(window_name):
+    return next(w for w in db.get_all_windows() if w["window_name"] == window_name)
+
+
+def test_unchanged_status_is_not_a_change():
+    window = name()
+    assert db.update_window_status(window, "ongoing") is True
+    version, before = db.get_db_version(), row(window)
+    assert db.update_window_status(window, "ongoing") is False
+    assert db.get_db_version() == version
+    assert row(window)["timestamp"] == before["timestamp"]
+
+
+def test_repeated_done_moves_window_up():
+    window = name()
+    db.update_window_status(window, "done")
+    version, before = db.get_db_version(), row(window)
+    time.sleep(0.01)
+    assert db.update_window_status(window, "done") is True
+    assert db.get_db_version() > version
+    assert row(window)["timestamp"] > before["timestamp"]
+
+
+def test_many_reports_only_visible_changes():
+    same, repeat, new = name(), name(), name()
+    db.update_window_status(same, "ongoing")
+    db.update_window_status(repeat, "done")
+    changed = db.update_window_statuses_many([
+        {"window_name": same, "status": "ongoing"},
+        {"window_name": repeat, "status": "Done"},
+        {"window_name": new, "status": "ongoing"},
+    ])
+    assert changed == {repeat, new}
+
+
+
+def test_failed_nested_block_rolled_back():
+    outer, inner = name(), name()
+    with db.db_transaction():
+        db.update_window_status(outer, "ongoing")
+        try:
+            with db.db_transaction() as conn:
+                conn.execute("INSERT INTO windows (window_name, status, timestamp) VALUES (?, 'x', 't')", (inner,))
+                raise RuntimeError("fails half way")
+        except RuntimeError:
+            pass
+    names = {w["window_name"] for w in db.get_all_windows()}
+    assert outer in names and inner not in names
+
+
+def test_nested_block_commits_with_outer_only():
+    first, second = name(), name()
+    try:
+        with db.db_transaction():
+            db.update_window_status(first, "ongoing")  # Nested, and succeeds
+            db.update_window_status(second, "ongoing")
+            raise RuntimeError("outer fails")
+    except RuntimeError:
+        pass
+    names = {w["window_name"] for w in db.get_all_windows()}
+    assert first not in names and second not in names
+
+    with db.db_transaction():
+        db.update_window_status(first, "ongoing")  # Opens the transaction itself
+    assert first in {w["window_name"] for w in db.get_all_windows()}
+
+
+def test_pages_break_ties_by_name_like_the_store():
+    stamp = "2999-01-01T00:00:00"  # Ahead of every other window, all tied
+    tied = sorted(name() for _ in range(7))
+    db.update_window_statuses_many([{"window_name": w, "status": "done", "timestamp": stamp}
+                                    for w in reversed(tied)])
+    pages = [db.get_windows_page(offset, 3) for offset in range(0, db.count_windows(), 3)]
+    listed = [w["window_name"] for page in pages for w in page]
+    assert listed[:7] == tied
+    assert len(listed) == len(set(listed)) == db.count_windows()
+    assert [record.window_name for record in WindowStore(db.get_all_windows())] == listed
+
+
+def test_init_replaces_priority_index_without_name():
+    with db.db_transaction() as conn:
+        conn.execute("DROP INDEX idx_priority")
+        conn.execute(f"CREATE INDEX idx_priority ON windows(({db.PRIORITY_ORDER_SQL}), timestamp DESC)")
+    db.init_db()
+    with db.db_transaction() as conn:
+        sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'idx_priority'").fetchone()["sql"]
+    assert "window_name" in sql
+
+
+def changed_names(result):
+    return {w["window_name"] for w in result["windows"]}
+
+
+def test_changes_since_cursor_include_tombstones():
+    kept, removed = name(), name()
+    db.update_window_status(kept, "ongoing")
+    db.update_window_status(removed, "ongoing")
+    cursor = db.get_windows_changed_since(0)["cursor"]
+
+    assert db.delete_window(removed)
+    db.update_window_status(kept, "done")
+    changes = db.get_windows_changed_since(cursor)
+    assert not changes["full"]
+    assert changed_names(changes) == {kept}
+    assert changes["deleted"] == [removed]
+
+    # Nothing new: an empty delta with the same cursor
+    again = db.get_windows_changed_since(changes["cursor"])
+    assert (again["windows"], again["deleted"], again["cursor"]) == ([], [], changes["cursor"])
+
+
+def test_reinsert_clears_tombstone():
+    window = name()
+    db.update_window_status(window, "ongoing")
+    cursor = db.get_windows_changed_since(0)["cursor"]
+    db.delete_window(window)
+    db.update_window_status(window, "done")
+    changes = db.get_windows_changed_since(cursor)
+    assert changed_names(changes) == {window}
+    assert window not in changes["deleted"]
+
+
+def test_cursor_zero_is_full_snapshot():
+    kept, removed = name(), name()
+    db.update_window_status(kept, "ongoing")
+    db.update_window_status(removed, "ongoing")
+    db.delete_window(removed)
+    snapshot = db.get_windows_changed_since(0)
+    assert snapshot["full"]
+    assert snapshot["deleted"] == []  # A snapshot replaces the caller's state
+    assert changed_names(snapshot) == {w["window_name"] for w in db.get_all_windows()}
+    assert kept in changed_names(snapshot) and removed not in changed_names(snapshot)
+
+
+def test_cursor_ahead_of_db_means_recreated():
+    db.update_window_status(name(), "ongoing")
+    current = db.get_windows_changed_since(0)
+    stale = db.get_windows_changed_since(current["cursor"] + 1000)  # Issued by a deleted database
+    assert stale["full"]
+    assert stale["cursor"] == current["cursor"]
+    assert changed_names(stale) == changed_names(current)
+
+
+def add_events(window_name, count, age_days=0):
+    stamp = (datetime.now() - timedelta(days=age_days)).isoformat()
+    db.update_window_statuses_many([], history=[
+        {"window_name": window_name, "status": f"step {n}", "timestamp": stamp} for n in range(count)])
+
+
+def test_compaction_drops_events_past_max_age():
+    old, recent = name(), name()
+    add_events(old, 3, age_days=40)
+    add_events(recent, 2, age_days=20)
+    assert db.compact_events(max_age_days=30, max_rows_per_window=None) == 3
+    assert db.get_events(window_name=old) == []
+    assert len(db.get_events(window_name=recent)) == 2
+
+
+def test_compaction_keeps_newest_rows_per_window():
+    busy, quiet = name(), name()
+    add_events(busy, 10)
+    add_events(quiet, 2)
+    db.compact_events(max_age_days=None, max_rows_per_window=4)
+    assert [e["status"] for e in db.get_events(window_name=busy)] == ["step 9", "step 8", "step 7", "step 6"]
+    assert len(db.get_events(window_name=quiet)) == 2
+
+
+def test_compaction_deletes_in_bounded_batches(monkeypatch):
+    pauses = []
+    monkeypatch.setattr(time, "sleep", pauses.append)
+    window = name()
+    add_events(window, 8, age_days=40)
+    assert db.compact_events(max_age_days=30, max_rows_per_window=None, batch_size=3, pause=0.25) == 8
+    assert pauses == [0.25, 0.25]  # Batches of 3, 3 and 2
+    assert db.get_events(window_name=window) == []
@@ -0,0 +1,101 @@
+"""DBChangeWatcher: filesystem events where available, polling otherwise"""
+
+import platform
+import threading
+import time
+import uuid
+
+import pytest
+
+from src import db, db_watcher
+from src.adaptive_poller import POLL_MIN_INTERVAL, AdaptivePoller
+from src.db_watcher import DBChangeWatcher
+
+# Commit-to-callback bounds. Right after a change the poller is at its
+# fastest, so a write is seen within about one POLL_MIN_INTERVAL
+POLLING_LATENCY_MAX = 3 * POLL_MIN_INTERVAL
+INOTIFY_LATENCY_MAX = 0.1
+
+
+class Changes:
+    """on_change callback that lets the test wait for the next call"""
+
+    def __init__(self):
+        self.versions = []
+        self.called_at = None
+        self._event = threading.Event()
+
+    def __call__(self, version):
+        self.versions.append(version)
+        self.called_at = time.monotonic()
+        self._event.set()
+
+    def wait(self, timeout=3.0):
+        fired = self._event.wait(timeout)
+        self._event.clear()
+        return fired
+
+
+def watch(**kwargs):
+    changes = Changes()
+    watcher = DBChangeWatcher(changes, poller=AdaptivePoller(), **kwargs)
+    watcher.start()
+    assert changes.wait()  # The first read always reports
+    return watcher, changes
+
+
+def write():
+    db.update_window_status(f"win-{uuid.uuid4().hex[:8]}", "ongoing")
+
+
+def check_sees_writes(watcher, changes, latency_max=POLLING_LATENCY_MAX):
+    for _ in range(3):
+        started = time.monotonic()
+        write()
+        assert changes.wait()
+        assert changes.called_at - started < latency_max
+    assert changes.versions == sorted(set(changes.versions))
+    watcher.stop()
+    watcher._thread.join(3)
+    assert not watcher._thread.is_alive()
+
+
+@pytest.mark.skipif(platform.system() != "Linux", reason="inotify is Linux-only")
+def test_inotify_mode():
+    watcher, changes = watch()
+    assert watcher.mode == "inotify"
+    check_sees_writes(watcher, changes, latency_max=INOTIFY_LATENCY_MAX)
+
+
+def test_polling_when_events_disabled():
+    watcher, changes = watch(use_events=False)
+    assert watcher.mode == "polling"
+    check_sees_writes(watcher, changes)
+
+
+def test_falls_back_to_polling_on_unknown_platform(monkeypatch):
+    monkeypatch.setattr(db_watcher.platform, "system", lambda: "Darwin")
+    watcher, changes = watch()
+    assert watcher.mode == "polling"
+    check_sees_writes(watcher, changes)
+
+
+def test_falls_back_to_polling_when_events_fail(monkeypatch, capsys):
+    class Broken(db_watcher._InotifySource):
+        def __init__(self, db_file):
+            raise OSError(24, "inotify_init1 failed")  # E.g. out of inotify instances
+
+    monkeypatch.setattr(db_watcher.platform, "system", lambda: "Linux")
+    monkeypatch.setattr(db_watcher, "_InotifySource", Broken)
+    watcher, changes = watch()
+    assert watcher.mode == "polling"
+    assert "falling back to polling" in capsys.readouterr().out
+    check_sees_writes(watcher, changes)
+
+
+def test_unreadable_version_backs_off_without_calling(monkeypatch):
+    changes = Changes()
+    watcher = DBChangeWatcher(changes, use_events=False)
+    monkeypatch.setattr(db, "get_db_version", lambda: None)
+    assert watcher._check() is None
+    assert changes.versions == []
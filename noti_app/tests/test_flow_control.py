@@ -0,0 +1,98 @@
+"""FlowController collapsing, deferral, history and eviction, on a fake clock"""
+
+from flow_control import FlowController
+
+from .fakes import FakeClock
+
+
+class StubWriter:
+    def __init__(self):
+        self.submitted = []
+        self.stopped = False
+
+    def submit(self, window_name, status, **kwargs):
+        self.submitted.append((window_name, status, kwargs))
+
+    def stop(self, timeout=5):
+        self.stopped = True
+
+    def get_stats(self):
+        return {}
+
+    def updates(self):
+        return [(name, status) for name, status, kwargs in self.submitted if kwargs.get("update_window", True)]
+
+    def history(self):
+        return [(name, status) for name, status, kwargs in self.submitted if kwargs.get("record_event", True)]
+
+
+def make_flow(**kwargs):
+    clock = FakeClock()
+    writer = StubWriter()
+    return FlowController(writer, clock=clock, **kwargs), writer, clock
+
+
+def test_repeat_collapsed_only_within_window():
+    flow, writer, clock = make_flow(collapse_window=5.0)
+    flow.submit("a", "ongoing")
+    clock.advance(1)
+    flow.submit("a", "ongoing")  # A repeat: no row update
+    assert writer.updates() == [("a", "ongoing")]
+    assert flow.stats["collapsed"] == 1
+
+    # E.g. the window was deleted in the UI: the next repeat brings it back
+    clock.advance(5)
+    flow.submit("a", "ongoing")
+    assert writer.updates() == [("a", "ongoing"), ("a", "ongoing")]
+
+
+def test_every_message_reaches_history():
+    flow, writer, clock = make_flow()
+    for i, status in enumerate(["ongoing", "ongoing", "step 1", "step 2", "step 3", "done"]):
+        flow.submit("a", status, message_id=f"m{i}")
+        clock.advance(0.1)
+    assert [status for _, status in writer.history()] == ["ongoing", "ongoing", "step 1", "step 2", "step 3", "done"]
+    ids = [kwargs.get("message_id") for _, _, kwargs in writer.submitted if kwargs.get("record_event", True)]
+    assert ids == [f"m{i}" for i in range(6)]
+    # Only the first and the terminal status updated the row; the rest were superseded
+    assert writer.updates() == [("a", "ongoing"), ("a", "done")]
+
+
+def test_deferred_update_forwarded_without_message_id():
+    flow, writer, clock = make_flow(min_interval=0.5)
+    flow.submit("a", "step 1", message_id="m1")
+    flow.submit("a", "step 2", message_id="m2")  # Too soon: deferred, recorded now
+    assert writer.updates() == [("a", "step 1")]
+    flow.stop()
+    name, status, kwargs = writer.submitted[-1]
+    assert (name, status) == ("a", "step 2")
+    assert kwargs == {"record_event": False}
+    assert writer.stopped
+
+
+def test_terminal_status_never_delayed():
+    flow, writer, clock = make_flow()
+    flow.submit("a", "step 1")
+    flow.submit("a", "step 2")
+    flow.submit("a", "done")
+    assert writer.updates() == [("a", "step 1"), ("a", "done")]
+    assert not flow._pending
+
+
+def test_idle_windows_evicted():
+    flow, writer, clock = make_flow(idle_evict=60)
+    for i in range(100):
+        flow.submit(f"w{i}", "ongoing")
+    clock.advance(61)
+    flow.submit("fresh", "ongoing")
+    assert list(flow._windows) == ["fresh"]
+    assert flow.stats["evicted"] == 100
+
+
+def test_pending_windows_not_evicted():
+    flow, writer, clock = make_flow(idle_evict=60)
+    flow.submit("a", "step 1")
+    flow.submit("a", "step 2")  # Pending
+    clock.advance(61)
+    flow.submit("b", "ongoing")
+    assert "a" in flow._windows
@@ -0,0 +1,51 @@
+"""InstanceLock: one holder, commands over the control port, pid reuse"""
+
+import os
+import socket
+import time
+import uuid
+
+from instance_lock import InstanceLock, process_start_time
+
+
+def make_lock():
+    return f"test-{uuid.uuid4().hex[:8]}"
+
+
+def test_second_instance_sends_command_to_holder():
+    name = make_lock()
+    commands = []
+    holder = InstanceLock(name)
+    assert holder.acquire(commands.append)
+    second = InstanceLock(name)
+    assert not second.acquire()
+    assert second.send("show") == "ok"
+    assert commands == ["show"]
+    holder.release()
+    assert second.acquire()
+    second.release()
+
+
+def test_bad_token_denied():
+    name = make_lock()
+    commands = []
+    holder = InstanceLock(name)
+    holder.acquire(commands.append)
+    port = holder.holder()["port"]
+    with socket.create_connection(("127.0.0.1", port), timeout=1) as conn:
+        conn.sendall("ébad show\n".encode("utf-8"))
+        assert conn.makefile("rb").readline() == b"denied\n"
+    assert commands == []
+    holder.release()
+
+
+def test_process_start_time_matches_record():
+    started = process_start_time(os.getpid())
+    if started is None:
+        return  # Not readable on this platform
+    assert started <= time.time()
+    name = make_lock()
+    holder = InstanceLock(name)
+    holder.acquire()
+    assert abs(holder.holder()["started"] - started) < 1
+    holder.release()
@@ -0,0 +1,59 @@
+"""In-process listener: stopping it (as the UI's on_closing does) flushes what it accepted"""
+
+import os
+import socket
+import time
+import uuid
+
+import db
+import ntfy_listener
+from listener_thread import ListenerThread
+
+from .fakes import FakeNtfyServer
+
+
+def status_of(window_name):
+    return next((w["status"] for w in db.get_all_windows() if w["window_name"] == window_name), None)
+
+
+def ingest_lines(*lines):
+    """Hand statuses to the listener's local ingest socket, as a local agent would"""
+    path = os.environ["NOTI_APP_INGEST_SOCKET"]
+    for _ in range(200):
+        if os.path.exists(path):
+            break
+        time.sleep(0.01)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(5)
+        sock.connect(path)
+        replies = sock.makefile("rb")
+        for line in lines:
+            sock.sendall(line.encode() + b"\n")
+            assert replies.readline() == b"1\n"
+
+
+def test_stop_drains_writer_and_thread_exits(monkeypatch):
+    monkeypatch.setattr(ntfy_listener, "FLOW_CONTROL", True)
+    window = f"win-{uuid.uuid4().hex[:8]}"
+    server = FakeNtfyServer([])  # Connected, and silent: no keepalives for 45 s
+    listener = ListenerThread(topic_url=server.url).start()
+    try:
+        # The second status comes too soon after the first, so flow control holds it back
+        ingest_lines(f"{window} - step 1", f"{window} - step 2")
+        for _ in range(200):
+            if status_of(window) == "step 1":
+                break
+            time.sleep(0.01)
+        assert status_of(window) == "step 1"
+
+        started = time.monotonic()
+        listener.stop()
+        assert time.monotonic() - started < 2  # Did not wait for the stream
+        assert status_of(window) == "step 2"
+        assert not os.path.exists(os.environ["NOTI_APP_INGEST_SOCKET"])  # Ingest closed
+    finally:
+        server.close()
+
+    # Once the stream ends, the engine returns and the thread exits
+    listener._thread.join(5)
+    assert not listener.is_alive()
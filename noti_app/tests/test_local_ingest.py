@@ -0,0 +1,130 @@
+"""Local ingest: payload parsing, the HTTP endpoint's checks and the Unix socket"""
+
+import http.client
+import os
+import socket
+import stat
+import tempfile
+
+import pytest
+
+from focus_message import FOCUS_NAME_PATTERN, parse_focus_message
+from local_ingest import LOCAL_INGEST_TOKEN_HEADER, LocalIngestServer, parse_ingest_payload
+
+
+class ListWriter:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, window_name, status, **kwargs):
+        self.submitted.append((window_name, status))
+
+
+@pytest.mark.parametrize("body, expected", [
+    (b"claude:win - task completed", [("claude:win", "task completed")]),
+    (b"  app  \n", [("app", None)]),
+    (b'"app - done"', [("app", "done")]),
+    (b'{"message": "app - done", "topic": "t"}', [("app", "done")]),
+    (b'{"window_name": "app", "status": "ongoing"}', [("app", "ongoing")]),
+    (b'[{"window_name": "a"}, "b - x", 5, {"message": ""}]', [("a", None), ("b", "x")]),
+    (b"[not json - still text", [("[not json", "still text")]),
+    (b"", []),
+])
+def test_parse_ingest_payload(body, expected):
+    assert [(e["window_name"], e["status"]) for e in parse_ingest_payload(body)] == expected
+
+
+def test_focus_name_pattern():
+    assert parse_focus_message("a - b - c") == {"window_name": "a", "status": "b - c"}
+    assert FOCUS_NAME_PATTERN.fullmatch("claude:team-a/win #2")
+    for name in ["x'; Remove-Item C:\\", "a`b", "$(calc)", "", "a" * 201]:
+        assert not FOCUS_NAME_PATTERN.fullmatch(name)
+
+
+def post(port, body=b'"app - done"', headers=None, token=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    sent = {"Content-Type": "application/json"}
+    if token:
+        sent[LOCAL_INGEST_TOKEN_HEADER] = token
+    sent.update(headers or {})
+    conn.request("POST", "/", body=body, headers=sent)
+    response = conn.getresponse()
+    return response.status, response.read()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def http_endpoint():
+    writer = ListWriter()
+    token_file = os.path.join(tempfile.mkdtemp(prefix="noti_test_token_"), "ingest.token")
+    server = LocalIngestServer(writer, port=free_port(), socket_path="", token_file=token_file).start()
+    yield server, writer, token_file
+    server.stop()
+
+
+def test_http_accepts_with_token(http_endpoint):
+    server, writer, token_file = http_endpoint
+    with open(token_file) as f:
+        token = f.read()
+    assert token == server.token
+    assert stat.S_IMODE(os.stat(token_file).st_mode) == 0o600
+    assert post(server.port, token=token) == (202, b'{"accepted": 1}')
+    assert writer.submitted == [("app", "done")]
+
+
+@pytest.mark.parametrize("headers, token, code", [
+    ({}, None, 401),
+    ({}, "0" * 32, 401),
+    ({"Origin": "https://example.com"}, "server", 403),  # A web page posting with the token
+    ({"Content-Type": "text/plain"}, "server", 415),
+])
+def test_http_refusals(http_endpoint, headers, token, code):
+    server, writer, _ = http_endpoint
+    status, _ = post(server.port, headers=headers, token=server.token if token == "server" else token)
+    assert status == code
+    assert writer.submitted == []
+
+
+def test_http_length_checks(http_endpoint):
+    server, writer, _ = http_endpoint
+    for length, code in (("-1", 411), (str(10 * 1024 * 1024), 413)):
+        conn = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+        conn.putrequest("POST", "/")
+        conn.putheader("Content-Type", "application/json")
+        conn.putheader(LOCAL_INGEST_TOKEN_HEADER, server.token)
+        conn.putheader("Content-Length", length)
+        conn.endheaders()
+        assert conn.getresponse().status == code
+    assert post(server.port, body=b"[]", token=server.token)[0] == 400
+    assert writer.submitted == []
+
+
+def test_stop_removes_token_file(http_endpoint):
+    server, _, token_file = http_endpoint
+    server.stop()
+    assert not os.path.exists(token_file)
+
+
+def test_unix_socket_one_reply_per_line():
+    writer = ListWriter()
+    path = os.path.join(tempfile.mkdtemp(prefix="noti_test_sock_"), "ingest.sock")
+    server = LocalIngestServer(writer, port=0, socket_path=path).start()
+    try:
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(5)
+            sock.connect(path)
+            # Lines may arrive split across writes
+            sock.sendall(b'a - one\n[{"window_name": "b"}, "c - two"]\n\nd - th')
+            sock.sendall(b"ree\n")
+            replies = sock.makefile("rb")
+            assert [replies.readline() for _ in range(4)] == [b"1\n", b"2\n", b"0\n", b"1\n"]
+        assert writer.submitted == [("a", "one"), ("b", None), ("c", "two"), ("d", "three")]
+    finally:
+        server.stop()
+    assert not os.path.exists(path)
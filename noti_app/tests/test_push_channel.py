@@ -0,0 +1,65 @@
+"""PushServer authentication and connection limits"""
+
+import socket
+import time
+
+import push_channel
+from push_channel import PushClient, PushServer
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def make_server():
+    received = []
+    server = PushServer(received.extend)
+    return server, received
+
+
+def test_push_delivered_with_token():
+    server, received = make_server()
+    client = PushClient(server.port, server.token)
+    assert client.send([{"window_name": "a", "status": "done", "timestamp": "t", "extra": 1}])
+    assert wait_for(lambda: received)
+    assert received == [{"window_name": "a", "status": "done", "timestamp": "t"}]
+    client.close()
+    server.close()
+
+
+def test_bad_token_rejected():
+    server, received = make_server()
+    client = PushClient(server.port, "0" * 32)
+    client.send([{"window_name": "a", "status": "done"}])
+    assert wait_for(lambda: server.rejected == 1)
+    assert received == []
+    client.close()
+    server.close()
+
+
+def test_silent_connection_times_out(monkeypatch):
+    monkeypatch.setattr(push_channel, "PUSH_AUTH_TIMEOUT", 0.1)
+    server, _ = make_server()
+    with socket.create_connection(("127.0.0.1", server.port)) as sock:
+        assert wait_for(lambda: server.rejected == 1)
+        sock.settimeout(1)
+        assert sock.recv(1) == b""  # Closed by the server
+    server.close()
+
+
+def test_connections_capped(monkeypatch):
+    monkeypatch.setattr(push_channel, "PUSH_MAX_CONNECTIONS", 2)
+    server, received = make_server()
+    idle = [socket.create_connection(("127.0.0.1", server.port)) for _ in range(3)]
+    assert wait_for(lambda: server.rejected == 1)  # The third one
+    for sock in idle:
+        sock.close()
+
+    # Closed connections free their slots
+    client = PushClient(server.port, server.token)
+    assert wait_for(lambda: client.send([{"window_name": "b", "status": "ongoing"}]) and received)
+    client.close()
+    server.close()
@@ -0,0 +1,79 @@
+"""ReconnectBackoff and KeepaliveWatchdog, on a fake clock"""
+
+from ntfy_listener import KeepaliveWatchdog, ReconnectBackoff
+
+from .fakes import FakeClock
+
+
+def make_backoff(**kwargs):
+    clock = FakeClock()
+    return ReconnectBackoff(first=0.5, minimum=5, maximum=60, jitter=0, reset_after=30,
+                            clock=clock, **kwargs), clock
+
+
+def test_delays_back_off_to_maximum():
+    backoff, _ = make_backoff()
+    delays = [backoff.next_delay() for _ in range(8)]
+    assert delays == [0.5, 5, 10, 20, 40, 60, 60, 60]
+
+
+def test_jitter_only_shortens():
+    backoff = ReconnectBackoff(first=0.5, minimum=5, maximum=60, jitter=0.5)
+    for expected in [0.5, 5, 10, 20]:
+        assert expected * 0.5 <= backoff.next_delay() <= expected
+
+
+def test_connection_dropped_at_once_keeps_backing_off():
+    backoff, clock = make_backoff()
+    delays = []
+    for _ in range(4):
+        backoff.connected()
+        clock.advance(1)  # Accepted, then dropped before any message
+        delays.append(backoff.next_delay())
+    assert delays == [0.5, 5, 10, 20]
+
+
+def test_message_resets_backoff():
+    backoff, clock = make_backoff()
+    for _ in range(3):
+        backoff.next_delay()
+    backoff.connected()
+    backoff.reset()  # First message
+    clock.advance(1)
+    assert backoff.next_delay() == 0.5
+
+
+def test_long_connection_resets_backoff():
+    backoff, clock = make_backoff()
+    for _ in range(3):
+        backoff.next_delay()
+    backoff.connected()
+    clock.advance(30)  # Only keepalives, but up long enough
+    assert backoff.next_delay() == 0.5
+    assert backoff.next_delay() == 5  # Failing to connect again backs off as usual
+
+
+def test_watchdog_expiry_and_remaining():
+    clock = FakeClock()
+    watchdog = KeepaliveWatchdog(interval=45, missed=2, clock=clock)
+    assert watchdog.limit == 90
+    clock.advance(60)
+    assert watchdog.remaining() == 30
+    assert not watchdog.expired()
+    watchdog.feed()
+    clock.advance(89)
+    assert not watchdog.expired()
+    clock.advance(1)
+    assert watchdog.expired()
+    assert watchdog.remaining() == 0
+
+
+def test_watchdog_counts_missed_keepalives():
+    clock = FakeClock()
+    watchdog = KeepaliveWatchdog(interval=45, missed=2, clock=clock)
+    clock.advance(44)
+    assert watchdog.missed_count() == 0
+    clock.advance(1)
+    assert watchdog.missed_count() == 1
+    clock.advance(150)  # 195 s silent, e.g. after a laptop sleep
+    assert watchdog.missed_count() == 4
@@ -0,0 +1,110 @@
+"""RenderScheduler coalescing on a fake Tk after() and clock"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src import render_scheduler
+from src.render_scheduler import RenderScheduler
+
+from .fakes import FakeClock
+
+
+class FakeRoot:
+    """Records root.after() calls; run() plays them back like the Tk loop would"""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append((ms, callback))
+
+    def run(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for _, callback in scheduled:
+            callback()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(render_scheduler, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def make_scheduler(**kwargs):
+    root, renders = FakeRoot(), []
+    return RenderScheduler(root, render=renders.append, frame_ms=50, **kwargs), root, renders
+
+
+def row(window_name, status):
+    return {"window_name": window_name, "status": status}
+
+
+def test_burst_renders_once_with_latest_rows(clock):
+    scheduler, root, renders = make_scheduler()
+    scheduler.request([row("a", "ongoing")])
+    scheduler.request([row("b", "done")])
+    scheduler.request([row("a", "done")])
+    assert [ms for ms, _ in root.scheduled] == [0]  # One repaint, drawn right away
+    root.run()
+    assert renders == [[row("a", "done"), row("b", "done")]]
+    assert scheduler.get_stats() == {"requested": 3, "coalesced": 2, "executed": 1, "deferred": 0}
+
+
+def test_next_repaint_waits_for_end_of_frame(clock):
+    scheduler, root, renders = make_scheduler()
+    scheduler.request([row("a", "ongoing")])
+    root.run()
+    clock.advance(0.02)
+    scheduler.request([row("a", "done")])
+    assert [ms for ms, _ in root.scheduled] == [pytest.approx(30, abs=1)]
+    root.run()
+    clock.advance(0.2)  # A quiet spell: drawn right away again
+    scheduler.request()  # E.g. only a deletion
+    assert [ms for ms, _ in root.scheduled] == [0]
+    root.run()
+    assert renders == [[row("a", "ongoing")], [row("a", "done")], []]
+
+
+def test_deferred_changes_render_once_on_resume(clock):
+    scheduler, root, renders = make_scheduler()
+    scheduler.defer()
+    scheduler.request([row("a", "ongoing")])
+    scheduler.request([row("a", "done"), row("b", "ongoing")])
+    scheduler.request()
+    assert root.scheduled == [] and renders == []
+    scheduler.resume()  # Drawn at once, on the calling (Tk) thread
+    assert renders == [[row("a", "done"), row("b", "ongoing")]]
+    assert root.scheduled == []
+    assert scheduler.get_stats()["deferred"] == 3
+
+    scheduler.defer()
+    scheduler.resume()  # Nothing held back
+    assert len(renders) == 1
+
+
+def test_resume_does_not_repeat_a_scheduled_repaint(clock):
+    scheduler, root, renders = make_scheduler()
+    scheduler.request([row("a", "ongoing")])  # Scheduled just before hiding
+    scheduler.defer()
+    scheduler.request([row("b", "ongoing")])
+    scheduler.resume()
+    assert renders == []
+    root.run()
+    assert renders == [[row("a", "ongoing"), row("b", "ongoing")]]
+
+
+def test_waking_change_renders_while_hidden(clock):
+    scheduler, root, renders = make_scheduler(
+        should_wake=lambda rows: any(r["status"] == "done" for r in rows))
+    scheduler.defer()
+    scheduler.request([row("a", "ongoing")])
+    assert root.scheduled == []
+    scheduler.request([row("b", "done")])
+    assert len(root.scheduled) == 1
+    root.run()
+    assert renders == [[row("a", "ongoing"), row("b", "done")]]  # With what accumulated before it
+
+    scheduler.request([row("c", "ongoing")])  # Still hidden: held back again
+    assert root.scheduled == []
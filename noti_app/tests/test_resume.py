@@ -0,0 +1,65 @@
+"""Resuming the ntfy stream: after a dropped connection and after a restart, each message is applied once"""
+
+import threading
+import time
+import uuid
+from collections import Counter
+
+import db
+import ntfy_listener
+from ntfy_listener import StatusWriter, listen_for_notifications, load_cursor
+
+from .fakes import FakeNtfyServer
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def listen(server, cursor_key, last_id):
+    """Run the listener against server until message last_id is committed, then stop it"""
+    writer = StatusWriter(cursor_key=cursor_key)
+    writer.start()
+    stop_event = threading.Event()
+    thread = threading.Thread(target=listen_for_notifications, daemon=True, kwargs={
+        "writer": writer, "topic_url": server.url, "cursor_key": cursor_key, "stop_event": stop_event})
+    thread.start()
+    try:
+        assert wait_for(lambda: (load_cursor(cursor_key) or {}).get("id") == last_id)
+    finally:
+        stop_event.set()
+        server.close()  # Ends the silent stream the listener is blocked on
+        thread.join(5)
+        writer.stop()
+    assert not thread.is_alive()
+    return writer.get_stats()
+
+
+def test_each_message_applied_once_across_reconnects_and_restart(monkeypatch):
+    monkeypatch.setattr(ntfy_listener, "RECONNECT_FIRST_DELAY", 0.01)
+    window = f"win-{uuid.uuid4().hex[:8]}"
+    cursor_key = f"ntfy_cursor:test-{window}"
+    messages = [(f"{window}-{n}", f"{window} - step {n}") for n in range(1, 9)]
+    ids = [message_id for message_id, _ in messages]
+
+    # Dropped after every 3 messages, and each reconnect replays the last one read
+    server = FakeNtfyServer(messages[:6], drop_after=3, replay=1)
+    stats = listen(server, cursor_key, ids[5])
+    assert server.requests == [None, ids[2], ids[4]]  # Each reconnect resumes after the last id read
+    assert stats["duplicates"] == 0  # Replays were dropped by id before reaching the writer
+
+    # A restart resumes from the cursor committed in listener_state
+    assert db.get_listener_state(cursor_key) is not None
+    server = FakeNtfyServer(messages, replay=3)
+    stats = listen(server, cursor_key, ids[7])
+    assert server.requests == [ids[5]]
+    assert stats["duplicates"] == 3  # Replayed into a fresh process; dropped as already applied
+
+    applied = Counter(event["status"] for event in db.get_events(window_name=window))
+    assert applied == {f"step {n}": 1 for n in range(1, 9)}
+    assert next(w for w in db.get_all_windows() if w["window_name"] == window)["status"] == "step 8"
@@ -0,0 +1,39 @@
+"""run_listener's stop path: accepted statuses are flushed even while the stream is blocked"""
+
+import threading
+import uuid
+
+import db
+import ntfy_listener
+
+from .fakes import FakeNtfyServer
+
+
+def status_of(window_name):
+    return next((w["status"] for w in db.get_all_windows() if w["window_name"] == window_name), None)
+
+
+def test_stop_flushes_deferred_update_while_stream_blocked(monkeypatch):
+    monkeypatch.setattr(ntfy_listener, "FLOW_CONTROL", True)
+    window = f"win-{uuid.uuid4().hex[:8]}"
+    server = FakeNtfyServer([(f"{window}-1", f"{window} - step 1"), (f"{window}-2", f"{window} - step 2")])
+    stop_event, drained = threading.Event(), threading.Event()
+    thread = threading.Thread(target=ntfy_listener.run_listener, daemon=True,
+                              kwargs={"stop_event": stop_event, "topic_url": server.url, "drained": drained})
+    thread.start()
+    try:
+        # "step 2" came too soon after "step 1": it waits as the window's pending update
+        for _ in range(200):
+            if status_of(window) == "step 1":
+                break
+            stop_event.wait(0.01)
+        assert status_of(window) == "step 1"
+
+        # The stream is silent (no keepalive for 45 s), yet stopping flushes at once
+        stop_event.set()
+        assert drained.wait(5)
+        assert status_of(window) == "step 2"
+    finally:
+        stop_event.set()
+        server.close()
+        thread.join(5)
@@ -0,0 +1,71 @@
+"""SSEParser, the stdlib JSON fallback, and reading the threaded listener's stream"""
+
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from ntfy_listener import decode_ntfy_events, iter_response_chunks
+from sse import SSEParser, stdlib_json_loads
+
+STREAM = (
+    b'event: open\r\ndata: {"event":"open"}\r\n\r\n'
+    b'data: {"id":"m1","event":"message","message":"win - done"}\n\n'
+    b': comment\nevent: keepalive\ndata: {"event":"keepalive"}\n\n'
+    b'id: 7\ndata: {"id":"m2",\ndata: "event":"message"}\n\n'
+)
+
+
+def test_events_survive_any_split():
+    for size in (1, 3, 7, 64):
+        parser = SSEParser()
+        events = []
+        for i in range(0, len(STREAM), size):
+            events.extend(parser.feed(STREAM[i:i + size]))
+        assert [event.event for event in events] == ["open", "message", "keepalive", "message"]
+        assert [data["id"] for data in decode_ntfy_events(events)] == ["m1", "m2"]
+        assert parser.last_event_id == "7"
+
+
+@pytest.mark.parametrize("text", ['{"a": [1, 2.5, "é"]}', ' {"a": 1} ', '"x"', "null", "[]"])
+def test_stdlib_json_loads_matches_json(text):
+    assert stdlib_json_loads(text.encode()) == json.loads(text)
+
+
+@pytest.mark.parametrize("text", ["", '{"a": 1} x', "{", " "])
+def test_stdlib_json_loads_rejects_like_json(text):
+    with pytest.raises(json.JSONDecodeError):
+        stdlib_json_loads(text.encode())
+
+
+class GzipSSEHandler(BaseHTTPRequestHandler):
+    """Compresses the stream whatever the client asked for"""
+
+    def do_GET(self):
+        body = gzip.compress(STREAM)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_compressed_stream_is_decoded():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GzipSSEHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        response = requests.get(f"http://127.0.0.1:{server.server_port}/sse", stream=True, timeout=5)
+        parser = SSEParser()
+        with response:
+            events = [event for chunk in iter_response_chunks(response) for event in parser.feed(chunk)]
+        assert [data["id"] for data in decode_ntfy_events(events)] == ["m1", "m2"]
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,128 @@
+"""StatusWriter batching, bounded queue, retries and stats"""
+
+import threading
+import time
+import uuid
+from collections import Counter
+
+import db
+import ntfy_listener
+from ntfy_listener import StatusWriter, load_cursor
+
+
+def name():
+    return f"win-{uuid.uuid4().hex[:8]}"
+
+
+def status_of(window_name):
+    return next((w["status"] for w in db.get_all_windows() if w["window_name"] == window_name), None)
+
+
+def write_queued(writer):
+    """Commit what is queued as one batch, on the calling thread"""
+    batch = writer._next_batch()
+    writer._write(batch)
+    return batch
+
+
+def test_batch_keeps_latest_status_and_every_message():
+    a, b = name(), name()
+    cursor_key = f"ntfy_cursor:test-{a}"
+    committed = []
+    writer = StatusWriter(cursor_key=cursor_key, on_commit=committed.append)
+    for n, window in enumerate([a, b, a, a, b], 1):
+        writer.submit(window, f"step {n}", message_id=f"{a}-{n}", message_time=1700000000 + n)
+
+    assert len(write_queued(writer)) == 5
+    assert (status_of(a), status_of(b)) == ("step 4", "step 5")
+    history = Counter(event["status"] for event in db.get_events(window_name=a) + db.get_events(window_name=b))
+    assert history == {f"step {n}": 1 for n in range(1, 6)}
+    assert load_cursor(cursor_key) == {"id": f"{a}-5", "time": 1700000005}
+    # Rows in the order of each window's latest message
+    assert [[(row["window_name"], row["status"]) for row in rows] for rows in committed] == [
+        [(a, "step 4"), (b, "step 5")]]
+
+    stats = writer.get_stats()
+    assert (stats["batches"], stats["written"], stats["coalesced"], stats["max_batch"]) == (1, 2, 3, 5)
+    assert stats["avg_batch"] == 5.0
+
+
+def test_applied_and_repeated_ids_skipped():
+    window = name()
+    writer = StatusWriter()
+    writer.submit(window, "done", message_id=f"{window}-1")
+    write_queued(writer)
+    writer.submit(window, "ongoing", message_id=f"{window}-1")  # Replayed after a reconnect
+    writer.submit(window, "ongoing", message_id=f"{window}-2")
+    writer.submit(window, "ongoing", message_id=f"{window}-2")  # Repeated within the batch
+    write_queued(writer)
+    assert [event["status"] for event in db.get_events(window_name=window)] == ["ongoing", "done"]
+    assert writer.get_stats()["duplicates"] == 2
+
+
+def test_update_window_and_record_event_flags():
+    window = name()
+    writer = StatusWriter()
+    writer.submit(window, "done", record_event=False)
+    writer.submit(window, "noise", update_window=False)
+    write_queued(writer)
+    assert status_of(window) == "done"
+    assert [event["status"] for event in db.get_events(window_name=window)] == ["noise"]
+
+
+def test_queue_bounded_and_backlogged(monkeypatch):
+    monkeypatch.setattr(ntfy_listener, "WRITE_QUEUE_RESERVE", 1)
+    window = name()
+    writer = StatusWriter(maxsize=3)
+    writer.submit(window, "1")
+    assert not writer.backlogged()
+    writer.submit(window, "2")
+    assert writer.backlogged()
+    writer.submit(window, "3")
+
+    blocked = threading.Thread(target=writer.submit, args=(window, "4"), daemon=True)
+    blocked.start()
+    blocked.join(0.2)
+    assert blocked.is_alive()  # Full: the reader waits for the writer
+    assert writer.get_stats()["queue_depth"] == 3
+
+    writer.start()
+    blocked.join(5)
+    writer.stop()
+    assert not blocked.is_alive()
+    assert status_of(window) == "4"
+    stats = writer.get_stats()
+    assert (stats["received"], stats["max_queue_depth"], stats["queue_depth"]) == (4, 3, 0)
+
+
+def test_failed_commits_retried(monkeypatch):
+    sleeps = []
+    results = [None, None, {"w"}]  # Fails twice, then commits
+    monkeypatch.setattr(ntfy_listener.time, "sleep", sleeps.append)
+    monkeypatch.setattr(ntfy_listener, "update_window_statuses_many", lambda *args, **kwargs: results.pop(0))
+    writer = StatusWriter()
+    writer.submit("w", "done")
+    write_queued(writer)
+    assert sleeps == [0.5, 1.0]
+    assert (writer.get_stats()["batches"], writer.get_stats()["failed"]) == (1, 0)
+
+
+def test_batch_dropped_without_sleeping_after_last_attempt(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(ntfy_listener.time, "sleep", sleeps.append)
+    monkeypatch.setattr(ntfy_listener, "update_window_statuses_many", lambda *args, **kwargs: None)
+    writer = StatusWriter()
+    writer.submit("w", "done")
+    writer.submit("w", "ongoing")
+    write_queued(writer)
+    assert sleeps == [0.5, 1.0]  # WRITE_RETRIES attempts, no sleep after the last
+    stats = writer.get_stats()
+    assert (stats["batches"], stats["failed"], stats["avg_batch"]) == (0, 2, 0.0)
+
+
+def test_lone_message_not_lingered():
+    writer = StatusWriter(linger=1.0)
+    writer.submit(name(), "done")
+    started = time.monotonic()
+    assert len(writer._next_batch()) == 1
+    assert time.monotonic() - started < 0.5
@@ -0,0 +1,49 @@
+"""The rounded bar image cache stays bounded and evicts least recently used first"""
+
+import pytest
+
+from src import ui_utils
+
+
+class FakePhoto:
+    """Stands in for ImageTk.PhotoImage, which needs a Tk root"""
+
+    def __init__(self, image):
+        self.size = image.size
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(ui_utils.ImageTk, "PhotoImage", FakePhoto)
+    monkeypatch.setattr(ui_utils, "ROUNDED_PHOTO_CACHE_SIZE", 4)
+    ui_utils._rounded_photo_cache.clear()
+    yield
+    ui_utils._rounded_photo_cache.clear()
+
+
+def photo(width, color="#336699"):
+    return ui_utils.get_rounded_rectangle_photo(width, 36, 8, color)
+
+
+def test_same_geometry_shares_one_image():
+    first = photo(280)
+    assert photo(280) is first
+    assert photo(280, "#ffffff") is not first
+    assert first.size == (280, 36)
+    assert ui_utils.rounded_photo_cache_size() == 2
+
+
+def test_cache_bounded_across_many_geometries():
+    for width in range(100, 400):
+        photo(width)
+    assert ui_utils.rounded_photo_cache_size() == 4
+
+
+def test_least_recently_used_evicted_first():
+    a, b = photo(100), photo(101)
+    photo(102)
+    photo(103)
+    assert photo(100) is a  # A hit makes it the most recent
+    photo(104)  # Evicts 101, the least recently used
+    assert photo(100) is a
+    assert photo(101) is not b
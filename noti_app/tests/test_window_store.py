@@ -0,0 +1,132 @@
+"""WindowStore: display order and the change events an observer mirrors the list with"""
+
+import random
+
+from src.window_store import WindowRecord, WindowStore
+
+
+class Events:
+    """Observer recording each event, and a mirror list kept with pop()/insert() like the UI's"""
+
+    def __init__(self, store):
+        self.events = []
+        self.mirror = list(store)
+        store.subscribe(self)
+        self.store = store
+
+    def __call__(self, event, index, record, old_index):
+        self.events.append((event, index, record.window_name if record else None, old_index))
+        if event == "insert":
+            self.mirror.insert(index, record)
+        elif event == "move":
+            self.mirror.pop(old_index)
+            self.mirror.insert(index, record)
+        elif event == "update":
+            assert self.mirror[index] is record
+        elif event == "remove":
+            assert self.mirror.pop(index) is record
+        elif event == "reset":
+            self.mirror = list(self.store)
+
+
+def names(store):
+    return [record.window_name for record in store]
+
+
+def row(window_name, status=None, timestamp=None):
+    return {"window_name": window_name, "status": status, "timestamp": timestamp}
+
+
+def test_display_order():
+    store = WindowStore([
+        row("addressed", "addressed", "2024-01-01T12:00:00"),
+        row("other", "waiting", "2024-01-01T12:00:00"),
+        row("none", None, "2024-01-01T12:00:00"),
+        row("ongoing", "ongoing", "2024-01-01T12:00:00"),
+        row("done-old", "done", "2024-01-01T10:00:00"),
+        row("done-new", "DONE", "2024-01-01T11:00:00"),
+        row("done-no-time", "done", None),
+        row("done-bad-time", "done", "yesterday"),
+    ])
+    assert names(store) == ["done-new", "done-old", "done-bad-time", "done-no-time",
+                            "ongoing", "none", "other", "addressed"]
+    assert [store.index_of(name) for name in names(store)] == list(range(len(store)))
+    assert store.index_of("missing") is None
+
+
+def test_ties_on_priority_and_timestamp_order_by_name():
+    stamp = "2024-01-01T12:00:00"
+    store = WindowStore([row(name, "ongoing", stamp) for name in ("c", "a", "b")])
+    assert names(store) == ["a", "b", "c"]
+    events = Events(store)
+    store.upsert(row("bb", "ongoing", stamp))
+    assert events.events == [("insert", 2, "bb", None)]
+    assert names(store) == ["a", "b", "bb", "c"]
+
+
+def test_aware_timestamps_compare_in_utc():
+    store = WindowStore([
+        row("utc", "done", "2024-01-01T12:00:00+00:00"),
+        row("plus-two", "done", "2024-01-01T13:00:00+02:00"),  # 11:00 UTC, older
+    ])
+    assert names(store) == ["utc", "plus-two"]
+
+
+def test_event_indexes():
+    store = WindowStore([
+        row("a", "done", "2024-01-01T12:00:00"),
+        row("b", "ongoing", "2024-01-01T12:00:00"),
+        row("c", None, "2024-01-01T12:00:00"),
+    ])
+    events = Events(store)
+
+    assert store.upsert(row("d", "done", "2024-01-01T11:00:00"))
+    assert store.upsert(row("c", "done", "2024-01-01T13:00:00"))      # To the top
+    assert store.upsert(row("b", "ongoing", "2024-01-01T13:00:00"))   # Newer, still last ongoing
+    assert not store.upsert(row("b", "ongoing", "2024-01-01T13:00:00"))  # Unchanged
+    assert store.remove("a")
+    assert not store.remove("a")
+    assert events.events == [
+        ("insert", 1, "d", None),
+        ("move", 0, "c", 3),
+        ("update", 3, "b", None),
+        ("remove", 1, "a", None),
+    ]
+    assert names(store) == ["c", "d", "b"]
+    assert events.mirror == list(store)
+
+    store.load([row("x")])
+    assert events.events[-1] == ("reset", None, None, None)
+    assert events.mirror == list(store) and names(store) == ["x"]
+
+
+def test_apply_removes_then_upserts():
+    store = WindowStore([row("a", "done"), row("b", "done")])
+    events = Events(store)
+    assert store.apply(rows=[row("a", "ongoing"), row("c")], deleted=["b", "missing"]) == 3
+    assert [event[0] for event in events.events] == ["remove", "update", "insert"]
+    assert store.rows() == [row("a", "ongoing"), row("c")]
+
+
+def test_random_changes_match_resorted_mirror():
+    rng = random.Random(1234)
+    statuses = ["done", "ongoing", "addressed", "waiting", None]
+    stamps = [None, "bad"] + [f"2024-01-01T12:00:{second:02d}" for second in range(5)]
+    store = WindowStore()
+    events = Events(store)
+    expected = {}  # window_name -> row
+    for _ in range(2000):
+        name = f"w{rng.randrange(30)}"
+        if rng.random() < 0.25:
+            assert store.remove(name) == (name in expected)
+            expected.pop(name, None)
+        else:
+            new = row(name, rng.choice(statuses), rng.choice(stamps))
+            changed = name not in expected or expected[name] != new
+            assert store.upsert(new) == changed
+            expected[name] = new
+
+        resorted = sorted(expected.values(), key=lambda r: WindowRecord(**r).key)
+        assert store.rows() == resorted
+        assert [record.as_dict() for record in events.mirror] == resorted
+        assert len(store) == len(expected)